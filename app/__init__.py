@@ -1,7 +1,11 @@
 """Initialize API."""
 
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import SQLAlchemyError
 
 from app import (
     accounts,
@@ -10,15 +14,47 @@ from app import (
     donations,
     github,
     images,
+    metrics,
     newsletter,
+    notifications,
     posts,
     tags,
 )
+from app.analytics.refresh import refresh_site_analytics_periodically
+from app.idempotency import DuplicateDeliveryError, replay_duplicate_delivery
+from app.notifications.outbox import run_sender
+from clients import mailgun
 from config import settings
-from database import Base, engine
+from database import Base, engine, ghost_db
+from database.models import GHOST_INDEXES
 from log import LOGGER
 
 Base.metadata.create_all(bind=engine)
+# `create_all` only creates indexes along with new tables, so indexes on Ghost's existing tables are created directly
+for index in GHOST_INDEXES:
+    try:
+        index.create(bind=ghost_db.db, checkfirst=True)
+    except SQLAlchemyError as e:
+        LOGGER.error(f"SQLAlchemyError while creating index `{index.name}` on Ghost table `{index.table.name}`: {e}")
+
+
+@asynccontextmanager
+async def lifespan(api: FastAPI):
+    """
+    Run background tasks for the lifetime of the application.
+
+    :param FastAPI api: API application.
+    """
+    tasks = []
+    if settings.PLAUSIBLE_REFRESH_INTERVAL:
+        tasks.append(asyncio.create_task(refresh_site_analytics_periodically(settings.PLAUSIBLE_REFRESH_INTERVAL)))
+    tasks.extend(asyncio.create_task(run_sender(worker)) for worker in range(settings.NOTIFICATION_WORKERS))
+    yield
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await mailgun.close()
 
 
 def create_app() -> FastAPI:
@@ -34,6 +70,7 @@ def create_app() -> FastAPI:
         debug=True,
         docs_url="/",
         openapi_url="/api.json",
+        lifespan=lifespan,
     )
 
     # Define Middleware
@@ -43,8 +80,12 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "Last-Modified"],
     )
 
+    # Replay results of webhook deliveries which were already processed
+    api.add_exception_handler(DuplicateDeliveryError, replay_duplicate_delivery)
+
     # Include routers
     api.include_router(analytics.router)
     api.include_router(newsletter.router)
@@ -55,6 +96,8 @@ def create_app() -> FastAPI:
     api.include_router(images.router)
     api.include_router(tags.router)
     api.include_router(github.router)
+    api.include_router(metrics.router)
+    api.include_router(notifications.router)
     LOGGER.success("API successfully started.")
 
     return api
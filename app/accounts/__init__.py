@@ -1,33 +1,121 @@
 """User account management & functionality."""
 
-from fastapi import APIRouter, HTTPException
+from typing import AsyncIterator, List, Optional
 
+import orjson
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.cache import results
+from app.pagination import decode_cursor, encode_cursor
 from config import settings
 from database import ghost_db
 from log import LOGGER
 
 router = APIRouter(prefix="/account", tags=["accounts"])
 
+COMMENTS_SQL_DIR = f"{settings.BASE_DIR}/database/queries/posts/selects"
+
+# MySQL's documented idiom for "no limit", used when streaming every remaining comment.
+ALL_ROWS = 18446744073709551615
+
+
+def comments_page_sql(params: dict) -> List[str]:
+    """
+    Pick queries for the comments after a cursor, ordered by `(edited_at, id)` descending, to run in turn.
+
+    Each query is a plain range over `(status, edited_at, id)` so it can be served by an index without an `OR`
+    across null & non-null `edited_at`; comments which were never edited have a null `edited_at` & come after
+    every edited comment, so a page following an edited comment continues with unedited ones once those run out.
+
+    :param dict params: Bound parameters of comments query.
+
+    :returns: List[str]
+    """
+    if params.get("cursor_id") is None:
+        return [f"{COMMENTS_SQL_DIR}/get_comments_first_page.sql"]
+    if params.get("cursor_at") is None:
+        return [f"{COMMENTS_SQL_DIR}/get_comments_unedited_page.sql"]
+    return [
+        f"{COMMENTS_SQL_DIR}/get_comments_next_page.sql",
+        f"{COMMENTS_SQL_DIR}/get_comments_unedited_first_page.sql",
+    ]
+
+
+async def fetch_comments_page(params: dict) -> dict:
+    """
+    Fetch a page of comments along with the cursor of the following page.
+
+    :param dict params: Bound parameters of comments query.
+
+    :returns: dict
+    """
+    comments = []
+    for sql_file in comments_page_sql(params):
+        comments += await ghost_db.fetch_records_from_file_async(
+            sql_file, {**params, "limit": params["limit"] - len(comments)}
+        )
+        if len(comments) == params["limit"]:
+            break
+    next_cursor = (
+        encode_cursor(comments[-1]["edited_at"], comments[-1]["id"]) if len(comments) == params["limit"] else None
+    )
+    LOGGER.success(f"Successfully fetched {len(comments)} Ghost comments.")
+    return {"comments": comments, "next_cursor": next_cursor}
+
+
+async def stream_comments_ndjson(params: dict) -> AsyncIterator[bytes]:
+    """
+    Serialize comments as newline-delimited JSON while they are read from a server-side cursor.
+
+    :param dict params: Bound parameters of comments query.
+
+    :returns: AsyncIterator[bytes]
+    """
+    count = 0
+    for sql_file in comments_page_sql(params):
+        async for comment in ghost_db.stream_records_from_file_async(sql_file, params):
+            count += 1
+            yield orjson.dumps(comment) + b"\n"
+    LOGGER.success(f"Successfully streamed {count} Ghost comments.")
+
 
 @router.get(
     "/comments/",
     summary="Get all user comments.",
-    description="Fetch all user-created comments on Ghost posts.",
+    description="Fetch user-created comments on Ghost posts, most recently edited first. \
+            Results are paginated; pass the `X-Next-Cursor` header of a response as `?cursor=` to fetch the next page, \
+            or pass `?stream=true` to stream all remaining comments as newline-delimited JSON.",
 )
-async def get_comments():
+async def get_comments(
+    cursor: Optional[str] = Query(default=None, description="Cursor from `X-Next-Cursor` of the previous page."),
+    limit: int = Query(default=100, ge=1, le=1000, description="Maximum number of comments per page."),
+    stream: bool = Query(default=False, description="Stream all remaining comments as NDJSON."),
+):
     """
-    Fetch all user-created comments on Ghost posts.
+    Fetch user-created comments on Ghost posts.
+
+    :param Optional[str] cursor: Position after the last comment of the previous page.
+    :param int limit: Maximum number of comments per page.
+    :param bool stream: Stream every remaining comment as NDJSON instead of returning a page.
 
     :returns: List[Comment]
     """
+    cursor_at, cursor_id = decode_cursor(cursor)
+    params = {"limit": limit}
+    if cursor_id is not None:
+        params["cursor_id"] = cursor_id
+    if cursor_at is not None:
+        params["cursor_at"] = cursor_at
+    if stream:
+        return StreamingResponse(
+            stream_comments_ndjson({**params, "limit": ALL_ROWS}),
+            media_type="application/x-ndjson",
+        )
     try:
-        sql_query = ""
-        with open(f"{settings.BASE_DIR}/database/queries/posts/selects/get_comments.sql", "r", encoding="utf-8") as f:
-            sql_query = f.read()
-        comments = ghost_db.execute_query(sql_query)
-        comments = [dict(r._mapping) for r in comments]
-        LOGGER.success(f"Successfully fetched {len(comments)} Ghost comments.")
-        return comments
+        page = await results.get_or_set("comments", params, lambda: fetch_comments_page(params))
+        headers = {"X-Next-Cursor": page["next_cursor"]} if page["next_cursor"] else {}
+        return JSONResponse(page["comments"], headers=headers)
     except HTTPException as e:
         LOGGER.error(f"HTTPException while fetching Ghost comments: {e}")
         return {"errors": f"Failed to fetch Ghost comments: {e}"}
@@ -1,8 +1,25 @@
 """Fetch site traffic & search query analytics."""
 
-from fastapi import APIRouter
+import math
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime
 
-from app.analytics.plausible import top_visited_pages_by_timeframe
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+
+from app.analytics.algolia import persist_algolia_searches
+from app.analytics.plausible import PLAUSIBLE_TIMEFRAMES
+from app.analytics.refresh import (
+    REFRESH_LOCK_WAIT,
+    STATS_SQL_DIR,
+    refresh_site_analytics,
+)
+from app.analytics.rollups import fetch_daily_page_views, rollup_page_views
+from app.analytics.suggest import suggestions
+from app.cache import results
+from config import settings
+from database import feature_db
 from database.schemas import AnalyticsResponse
 from log import LOGGER
 
@@ -11,31 +28,77 @@ router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 @router.get(
     "/",
-    summary="Import site analytics.",
-    description="Import site performance analytics from a data warehouse to a SQL database.",
+    summary="Get top visited pages.",
+    description="Serve weekly & monthly top pages stored by the Plausible refresher; `Last-Modified` reports freshness.",
     response_model=AnalyticsResponse,
     status_code=200,
 )
-async def migrate_site_analytics():
-    """Fetch top searches for weekly & monthly time periods."""
-    weekly_traffic = top_visited_pages_by_timeframe("7d", limit=50)
-    monthly_traffic = top_visited_pages_by_timeframe("30d", limit=100)
-    LOGGER.success(
-        f"Inserted {len(weekly_traffic)} rows into `weekly_stats`,  {len(monthly_traffic)}  into `monthly_stats`."
-    )
-    return {
-        "weekly_stats": {
-            "count": len(weekly_traffic),
-            "rows": weekly_traffic,
-        },
-        "monthly_stats": {
-            "count": len(monthly_traffic),
-            "rows": monthly_traffic,
-        },
-    }
-
-
-'''@router.get(
+async def get_site_analytics() -> JSONResponse:
+    """
+    Fetch stored top pages for weekly & monthly time periods, importing them first if nothing is stored yet.
+
+    :returns: JSONResponse
+    """
+    params = {f"{timeframe}_limit": limit for timeframe, (_, limit) in PLAUSIBLE_TIMEFRAMES.items()}
+    rows = await feature_db.fetch_records_from_file_async(f"{STATS_SQL_DIR}/top_pages.sql", params)
+    if not rows:
+        # Wait out a refresh already in progress on another worker rather than racing it
+        await refresh_site_analytics(stale_after=math.inf, lock_timeout=REFRESH_LOCK_WAIT)
+        rows = await feature_db.fetch_records_from_file_async(f"{STATS_SQL_DIR}/top_pages.sql", params)
+    ages = [row.pop("age") for row in rows]
+    stats = {f"{timeframe}_stats": {"count": 0, "rows": []} for timeframe in PLAUSIBLE_TIMEFRAMES}
+    for row in rows:
+        timeframe_stats = stats[f"{row.pop('timeframe')}_stats"]
+        timeframe_stats["rows"].append(row)
+        timeframe_stats["count"] += 1
+    headers = {}
+    if ages and None not in ages:
+        refreshed_at = datetime.now(timezone.utc) - timedelta(seconds=max(ages))
+        headers["Last-Modified"] = format_datetime(refreshed_at, usegmt=True)
+    return JSONResponse(stats, headers=headers)
+
+
+@router.post(
+    "/",
+    summary="Refresh site analytics.",
+    description="Import weekly & monthly top pages from Plausible into a SQL database.",
+    status_code=200,
+)
+async def migrate_site_analytics() -> JSONResponse:
+    """
+    Refresh stored top pages for weekly & monthly time periods.
+
+    :returns: JSONResponse
+    """
+    imported = await refresh_site_analytics()
+    if imported is None:
+        raise HTTPException(status_code=409, detail="Stored top pages are already being refreshed.")
+    return JSONResponse({f"{timeframe}_stats": inserted for timeframe, inserted in imported.items()})
+
+
+@router.get(
+    "/rollups/",
+    summary="Roll up stored page views.",
+    description="Top pages, trends & bounce rates over 7, 30, 90 & 365 days, computed from stored daily page views.",
+    status_code=200,
+)
+async def get_page_view_rollups(limit: int = 50) -> dict:
+    """
+    Roll up daily page views into every trailing window at once.
+
+    :param int limit: Maximum number of pages returned per window.
+
+    :returns: dict
+    """
+
+    async def rollup_windows():
+        daily = await fetch_daily_page_views()
+        return await run_in_threadpool(rollup_page_views, daily, date.today(), limit=limit)
+
+    return await results.get_or_set("analytics", {"limit": limit, "day": date.today()}, rollup_windows)
+
+
+@router.get(
     "/searches/",
     summary="Import user search queries.",
     description="Store user search queries to a SQL database for analysis and suggestive search.",
@@ -43,27 +106,41 @@ async def migrate_site_analytics():
 )
 async def save_user_search_queries() -> JSONResponse:
     """
-    Save top search analytics for the current week.
+    Save search analytics for the past week & month.
 
     :returns: JSONResponse
     """
-    weekly_searches = persist_algolia_searches(settings.ALGOLIA_TABLE_WEEKLY, "7d")
-    monthly_searches = persist_algolia_searches(settings.ALGOLIA_TABLE_MONTHLY, "month")
+    weekly_searches = await run_in_threadpool(persist_algolia_searches, settings.ALGOLIA_TABLE_WEEKLY, 7)
+    monthly_searches = await run_in_threadpool(persist_algolia_searches, settings.ALGOLIA_TABLE_MONTHLY, 30)
     if weekly_searches is None or monthly_searches is None:
-        HTTPException(500, "Unexpected error when saving search query data.")
+        raise HTTPException(500, "Unexpected error when saving search query data.")
+    await suggestions.rebuild()
     LOGGER.success(
-        f"Inserted {len(weekly_searches)} rows into `{settings.ALGOLIA_TABLE_WEEKLY}`, \
-            {len(monthly_searches)} into `{settings.ALGOLIA_TABLE_MONTHLY}`"
+        f"Inserted {weekly_searches} rows into `{settings.ALGOLIA_TABLE_WEEKLY}`, "
+        f"{monthly_searches} into `{settings.ALGOLIA_TABLE_MONTHLY}`"
     )
     return JSONResponse(
         {
-            "7-Day": {
-                "count": len(weekly_searches),
-                "rows": weekly_searches,
-            },
-            "90-Day": {
-                "count": len(monthly_searches),
-                "rows": monthly_searches,
-            },
+            "7-Day": {"count": weekly_searches, "table": settings.ALGOLIA_TABLE_WEEKLY},
+            "30-Day": {"count": monthly_searches, "table": settings.ALGOLIA_TABLE_MONTHLY},
         }
-    )'''
+    )
+
+
+@router.get(
+    "/suggest/",
+    summary="Suggest search queries.",
+    description="Most searched queries starting with a prefix, from the stored history of Algolia searches.",
+    status_code=200,
+)
+async def suggest_search_queries(q: str, limit: int = 10) -> JSONResponse:
+    """
+    Suggest completions of a partial search query, most searched first.
+
+    :param str q: Partial search query.
+    :param int limit: Maximum number of suggestions.
+
+    :returns: JSONResponse
+    """
+    index = await suggestions.get()
+    return JSONResponse(index.suggest(q, limit=min(limit, 50)))
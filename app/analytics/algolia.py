@@ -1,106 +1,85 @@
 """Helper functions to fetch search query activity from Algolia."""
 
-from typing import Any, Dict, List, Optional
-
-import requests
-from fastapi import HTTPException
-from requests.exceptions import HTTPError
+from typing import Any, Dict, Iterable, Iterator, Optional
 
 from app.moment import get_start_date_range
+from clients.http import http
 from config import settings
 from database import feature_db
 from log import LOGGER
 
+# Largest page of searches returned by Algolia's analytics API
+ALGOLIA_PAGE_SIZE = 1000
+
 
-def persist_algolia_searches(time_period: str) -> List[Optional[dict]]:
+def persist_algolia_searches(table_name: str, days: int) -> Optional[int]:
     """
-    Fetch single week of searches from Algolia API.
+    Replace a table with searches of the past `days`, streamed page by page from Algolia into chunked inserts.
 
-    :param str time_period: Period of time for which to fetch search queries (7d, 30d, month, 12mo).
-    :param str db_table: DB table name
+    :param str table_name: DB table name.
+    :param int days: Number of days for which to fetch search queries.
 
-    :returns: List[Optional[dict]]
+    :returns: Optional[int]
     """
-    try:
-        headers = {
-            "x-algolia-application-id": settings.ALGOLIA_APP_ID,
-            "x-algolia-api-key": settings.ALGOLIA_API_KEY,
-        }
-        params = {
-            "index": "hackers_posts",
-            "limit": 999999,
-            "orderBy": "searchCount",
-            "direction": "desc",
-            "startDate": get_start_date_range(time_period),
-        }
-        resp = requests.get(settings.ALGOLIA_SEARCHES_ENDPOINT, headers=headers, params=params, timeout=30)
-        if resp.status_code == 200 and resp.json().get("searches") is not None:
-            search_queries = resp.json().get("searches")
-            search_queries = filter_search_queries(search_queries)
-            if search_queries is not None:
-                import_algolia_search_queries(search_queries, time_period)
-                return search_queries
-            return []
-        return []
-    except HTTPError as e:
-        LOGGER.error(f"HTTPError while fetching Algolia searches for `{time_period}`: {e}")
-    except Exception as e:
-        LOGGER.error(f"Unexpected error while fetching Algolia searches for `{time_period}`: {e}")
-
-
-def fetch_algolia_searches(time_period: str) -> List[Optional[dict]]:
+    search_queries = filter_search_queries(fetch_algolia_searches(days))
+    inserted = import_algolia_search_queries(search_queries, table_name)
+    if inserted is None:
+        LOGGER.error(f"Failed to import Algolia searches of the past {days} days into `{table_name}`.")
+    return inserted
+
+
+def fetch_algolia_searches(days: int, page_size: int = ALGOLIA_PAGE_SIZE) -> Iterator[Dict[str, Any]]:
     """
-    Fetch analytics from Algolia API for a given time period.
+    Fetch searches from Algolia API one page at a time, most frequent first.
 
-    :param str time_period: Period of time for which to fetch search queries (7d, 30d, month, 12mo).
+    :param int days: Number of days for which to fetch search queries.
+    :param int page_size: Number of searches per request.
 
-    :returns: List[Optional[dict]]
+    :returns: Iterator[Dict[str, Any]]
     """
-    try:
-        headers = {
-            "x-algolia-application-id": settings.ALGOLIA_APP_ID,
-            "x-algolia-api-key": settings.ALGOLIA_API_KEY,
-        }
-        params = {
-            "index": "hackers_posts",
-            "limit": 999999,
-            "orderBy": "searchCount",
-            "direction": "desc",
-            "startDate": get_start_date_range(time_period),
-        }
-        resp = requests.get(settings.ALGOLIA_SEARCHES_ENDPOINT, headers=headers, params=params, timeout=20)
-        if resp.status_code != 200:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Failed to fetch Algolia results for `{time_period}` time period: {resp.text}.",
-            )
-        resp.json().get("searches")
-    except HTTPError as e:
-        LOGGER.error(f"HTTPError while fetching Algolia searches for `{time_period}`: {e}")
-    except Exception as e:
-        LOGGER.error(f"Unexpected error while fetching Algolia searches for `{time_period}`: {e}")
-
-
-def filter_search_queries(search_queries: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+    headers = {
+        "x-algolia-application-id": settings.ALGOLIA_APP_ID,
+        "x-algolia-api-key": settings.ALGOLIA_API_KEY,
+    }
+    params = {
+        "index": "hackers_posts",
+        "limit": page_size,
+        "offset": 0,
+        "orderBy": "searchCount",
+        "direction": "desc",
+        "startDate": get_start_date_range(days),
+    }
+    while True:
+        resp = http.get(settings.ALGOLIA_SEARCHES_ENDPOINT, headers=headers, params=params)
+        resp.raise_for_status()
+        searches = resp.json().get("searches") or []
+        for search in searches:
+            yield {"search": search["search"], "count": search["count"], "nbHits": search.get("nbHits")}
+        if len(searches) < page_size:
+            return
+        params["offset"] += page_size
+
+
+def filter_search_queries(search_queries: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
     """
     Filter noisy or irrelevant search analytics from results (ie: too short).
 
     :param search_queries: JSON of search queries submitted by users.
-    :type search_queries: List[Optional[Dict[str, Any]]]
+    :type search_queries: Iterable[Dict[str, Any]]
 
-    :returns: List[Dict[str, Any]]
+    :returns: Iterator[Dict[str, Any]]
     """
-    return [query for query in search_queries if len(query["search"]) > 3]
+    return (query for query in search_queries if len(query["search"]) > 3)
 
 
-def import_algolia_search_queries(records: List[dict], table_name: str) -> Optional[List[dict]]:
+def import_algolia_search_queries(records: Iterable[dict], table_name: str) -> Optional[int]:
     """
     Save history of search queries executed on the site.
 
-    :param List[dict] records: JSON of search queries submitted by users.
+    :param Iterable[dict] records: JSON of search queries submitted by users; may be a generator.
     :param str table_name: Name of SQL table to save data to.
 
-    :returns: Optional[List[dict]]
+    :returns: Optional[int]
     """
     return feature_db.insert_records(
         records,
@@ -1,24 +1,272 @@
 """Import site analytics from data warehouse to application."""
 
-from typing import Any, Dict, List
+import heapq
+from datetime import date, timedelta
+from functools import lru_cache
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+from google.cloud import bigquery
+from google.cloud.bigquery.table import RowIterator
+
+from app.analytics.plausible import fetch_top_visited_pages
 from clients import gbq
 from config import settings
 from database import feature_db
+from log import LOGGER
+
+ANALYTICS_SQL_DIR = f"{settings.BASE_DIR}/database/queries/analytics"
+ROLLUP_SQL_DIR = f"{ANALYTICS_SQL_DIR}/rollups"
+
+# Days covered & number of top pages kept per timeframe, matching the full-window warehouse queries.
+ANALYTICS_WINDOWS = {"weekly": (7, 100), "monthly": (30, 2000), "yearly": (365, 10000)}
+
+
+class ArrowTransfer:
+    """
+    Stream query results as Arrow record batches, converting a single batch at a time to rows
+    so the full result is never materialized in memory; only the `top` most viewed pages are kept.
+    """
+
+    def __init__(self, result: RowIterator, bqstorage_client=None, top: int = 0):
+        """
+        :param RowIterator result: Rows of a finished BigQuery query job.
+        :param bqstorage_client: Optional `BigQueryReadClient` to read results via the Storage Read API.
+        :param int top: Number of most viewed pages to keep while streaming.
+        """
+        self.result = result
+        self.bqstorage_client = bqstorage_client
+        self.batches = 0
+        self.rows_read = 0
+        self.fetch_seconds = 0.0
+        self.decode_seconds = 0.0
+        self.top = top
+        self._top_pages: List[Tuple[int, int, str]] = []
+
+    def rows(self) -> Iterator[dict]:
+        """
+        Yield result rows batch by batch, timing time spent waiting on BigQuery apart from time spent decoding.
+
+        :returns: Iterator[dict]
+        """
+        batches = iter(self.result.to_arrow_iterable(bqstorage_client=self.bqstorage_client))
+        while True:
+            start = perf_counter()
+            batch = next(batches, None)
+            self.fetch_seconds += perf_counter() - start
+            if batch is None:
+                return
+            start = perf_counter()
+            rows = batch.to_pylist()
+            self.decode_seconds += perf_counter() - start
+            self.batches += 1
+            if self.top:
+                self._track_top_pages(rows)
+            self.rows_read += len(rows)
+            yield from rows
+
+    def _track_top_pages(self, rows: List[dict]) -> None:
+        """
+        Keep the most viewed pages seen so far in a min-heap bounded to `top` entries.
 
+        :param List[dict] rows: Decoded rows of a single record batch.
+        """
+        for i, row in enumerate(rows, self.rows_read):
+            # Negated row number breaks ties in favour of earlier rows, keeping the query's own ordering.
+            page = (row.get("views") or 0, -i, row.get("slug"))
+            if len(self._top_pages) < self.top:
+                heapq.heappush(self._top_pages, page)
+            elif page > self._top_pages[0]:
+                heapq.heapreplace(self._top_pages, page)
 
-def import_site_analytics(timeframe: str) -> Dict[str, List[Any]]:
+    def top_pages(self) -> Tuple[List[str], List[int]]:
+        """
+        Slugs & views of the most viewed pages streamed, in descending order of views.
+
+        :returns: Tuple[List[str], List[int]]
+        """
+        pages = sorted(self._top_pages, reverse=True)
+        return [slug for _, _, slug in pages], [views for views, _, _ in pages]
+
+
+@lru_cache(maxsize=1)
+def bigquery_storage_client():
+    """
+    Create BigQuery Storage Read API client, if enabled & `google-cloud-bigquery-storage` is installed.
+
+    :returns: Optional[BigQueryReadClient]
+    """
+    if not settings.GCP_BIGQUERY_STORAGE_API:
+        return None
+    try:
+        from google.cloud import bigquery_storage
+    except ImportError:
+        LOGGER.warning("`google-cloud-bigquery-storage` is not installed; reading BigQuery results via REST.")
+        return None
+    return bigquery_storage.BigQueryReadClient(credentials=settings.GCP_CREDENTIALS)
+
+
+def import_site_analytics(
+    timeframe: str, chunk_size: Optional[int] = None, incremental: Optional[bool] = None
+) -> Dict[str, Any]:
     """
     Migrate raw analytics data from Google BigQuery to application db.
 
+    In incremental mode only days missing from `daily_page_views` are read from the warehouse, & the window is
+    rolled up locally; otherwise the whole window is queried & streamed into `{timeframe}_stats`.
+
     :param str timeframe: Time frame to fetch data for (weekly, monthly, yearly).
+    :param Optional[int] chunk_size: Number of rows per INSERT statement.
+    :param Optional[bool] incremental: Append new days & roll up locally; defaults to setting.
 
-    :returns: Dict[str, List[Any]]
+    :returns: Dict[str, Any]
     """
-    sql_query = open(f"{settings.BASE_DIR}/database/queries/analytics/{timeframe}.sql", encoding="utf-8").read()
+    if incremental is None:
+        incremental = settings.ANALYTICS_INCREMENTAL
+    if incremental:
+        imported = import_daily_page_views(chunk_size)
+        rollup = rollup_site_analytics(timeframe)
+        return {**rollup, "timings": {**imported["timings"], **rollup["timings"]}}
+    with open(f"{ANALYTICS_SQL_DIR}/{timeframe}.sql", encoding="utf-8") as f:
+        sql_query = f.read()
     sql_table = f"{timeframe}_stats"
-    query_job = gbq.query(sql_query)
-    result = query_job.result()
-    df = result.to_dataframe()
-    result = feature_db.insert_dataframe(df, sql_table, action="replace")
-    return {"posts": result["slug"].to_list(), "views": result["views"].to_list()}
+    _, limit = ANALYTICS_WINDOWS[timeframe]
+    inserted, transfer, timings = transfer_query_results(
+        sql_query, sql_table, replace=True, chunk_size=chunk_size, top=limit
+    )
+    if inserted is None:
+        return {"posts": [], "views": [], "timings": timings}
+    posts, views = transfer.top_pages()
+    return {"posts": posts, "views": views, "timings": timings}
+
+
+def import_daily_page_views(chunk_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Append views per page for each complete day not yet stored in `daily_page_views`, then drop expired days.
+
+    :param Optional[int] chunk_size: Number of rows per INSERT statement.
+
+    :returns: Dict[str, Any]
+    """
+    last_imported = feature_db.fetch_records_from_file(f"{ROLLUP_SQL_DIR}/last_imported_day.sql")
+    if not last_imported:
+        LOGGER.error("Failed to determine last day of imported page views; skipping import.")
+        return {"rows": 0, "since": None, "timings": {}}
+    today = date.today()
+    last_day = last_imported[0]["day"]
+    since = last_day + timedelta(days=1) if last_day else today - timedelta(days=settings.ANALYTICS_RETENTION_DAYS)
+    if since >= today:
+        LOGGER.info(f"Page views are up to date through {last_day}.")
+        return {"rows": 0, "since": since.isoformat(), "timings": {}}
+    with open(f"{ANALYTICS_SQL_DIR}/daily.sql", encoding="utf-8") as f:
+        sql_query = f.read()
+    job_config = bigquery.QueryJobConfig(query_parameters=[bigquery.ScalarQueryParameter("since", "DATE", since)])
+    inserted, transfer, timings = transfer_query_results(
+        sql_query, "daily_page_views", replace=False, chunk_size=chunk_size, job_config=job_config
+    )
+    feature_db.execute_query_from_file(
+        f"{ROLLUP_SQL_DIR}/prune_daily_page_views.sql",
+        {"before": today - timedelta(days=settings.ANALYTICS_RETENTION_DAYS)},
+    )
+    if inserted:
+        days = (today - since).days
+        import_daily_bounces(
+            [today - timedelta(days=i) for i in range(1, min(days, settings.ANALYTICS_BOUNCE_DAYS) + 1)]
+        )
+    return {"rows": inserted or 0, "since": since.isoformat(), "timings": timings}
+
+
+def import_daily_bounces(days: List[date]) -> int:
+    """
+    Record visits & bounces per page for each of the given days from Plausible, so rollups can report bounce rates.
+
+    :param List[date] days: Days of `daily_page_views` to fill in.
+
+    :returns: int
+    """
+    updated = 0
+    for day in days:
+        results = fetch_top_visited_pages("day", limit=1000, day=day)
+        if not results:
+            LOGGER.warning(f"No Plausible results for {day}; bounce rates will not include this day.")
+            continue
+        params = [
+            {
+                "day": day,
+                "slug": result["page"].replace("/", ""),
+                "visits": result["visits"],
+                "bounces": round(result["visits"] * (result.get("bounce_rate") or 0) / 100),
+            }
+            for result in results
+            if result.get("page") and result.get("visits") is not None
+        ]
+        if not params:
+            continue
+        executed = feature_db.execute_query_from_file(f"{ROLLUP_SQL_DIR}/update_daily_bounces.sql", params)
+        if not isinstance(executed, str):
+            updated += len(params)
+    LOGGER.info(f"Recorded Plausible visits & bounces for {updated} pages over {len(days)} days.")
+    return updated
+
+
+def rollup_site_analytics(timeframe: str) -> Dict[str, Any]:
+    """
+    Replace `{timeframe}_stats` with top pages summed from `daily_page_views` over the timeframe's window.
+
+    :param str timeframe: Time frame to roll up (weekly, monthly, yearly).
+
+    :returns: Dict[str, Any]
+    """
+    days, limit = ANALYTICS_WINDOWS[timeframe]
+    start = perf_counter()
+    rows = feature_db.fetch_records_from_file(
+        f"{ROLLUP_SQL_DIR}/top_pages.sql", {"since": date.today() - timedelta(days=days), "limit": limit}
+    )
+    inserted = feature_db.insert_records(rows, f"{timeframe}_stats", replace=True)
+    timings = {"rollup": round(perf_counter() - start, 3)}
+    if inserted is None:
+        return {"posts": [], "views": [], "timings": timings}
+    LOGGER.success(f"Rolled up {inserted} pages viewed over the past {days} days into `{timeframe}_stats`.")
+    return {"posts": [row["slug"] for row in rows], "views": [row["views"] for row in rows], "timings": timings}
+
+
+def transfer_query_results(
+    sql_query: str,
+    sql_table: str,
+    replace: bool,
+    chunk_size: Optional[int] = None,
+    job_config: Optional[bigquery.QueryJobConfig] = None,
+    top: int = 0,
+) -> Tuple[Optional[int], ArrowTransfer, Dict[str, float]]:
+    """
+    Run BigQuery query & stream its results as Arrow record batches into chunked INSERTs of a SQL table.
+
+    :param str sql_query: BigQuery SQL query.
+    :param str sql_table: Name of table in features database to insert into.
+    :param bool replace: Replace table contents via a staging table swap rather than appending.
+    :param Optional[int] chunk_size: Number of rows per INSERT statement.
+    :param Optional[bigquery.QueryJobConfig] job_config: Query parameters & options of query job.
+    :param int top: Number of most viewed pages to keep from the streamed rows.
+
+    :returns: Tuple[Optional[int], ArrowTransfer, Dict[str, float]]
+    """
+    start = perf_counter()
+    result = gbq.query(sql_query, job_config=job_config).result()
+    query_seconds = perf_counter() - start
+    transfer = ArrowTransfer(result, bigquery_storage_client(), top=top)
+    start = perf_counter()
+    inserted = feature_db.insert_records(transfer.rows(), sql_table, replace=replace, chunk_size=chunk_size)
+    transfer_seconds = perf_counter() - start
+    timings = {
+        "query": round(query_seconds, 3),
+        "fetch": round(transfer.fetch_seconds, 3),
+        "decode": round(transfer.decode_seconds, 3),
+        "insert": round(transfer_seconds - transfer.fetch_seconds - transfer.decode_seconds, 3),
+    }
+    if inserted is None:
+        LOGGER.error(f"Failed to import query results into `{sql_table}` after {transfer.rows_read} rows.")
+    else:
+        LOGGER.success(
+            f"Imported {inserted} rows into `{sql_table}` from {transfer.batches} Arrow batches; timings (s): {timings}"
+        )
+    return inserted, transfer, timings
@@ -1,15 +1,50 @@
 """Fetch site analytics via Plausible API."""
 
+from datetime import date
 from typing import List, Optional
 
-import requests
 from fastapi import HTTPException
 from requests.exceptions import RequestException
 
 from clients import ghost
+from clients.http import http
 from config import settings
+from database import feature_db
 from log import LOGGER
 
+# Plausible period & number of top pages stored per timeframe
+PLAUSIBLE_TIMEFRAMES = {"weekly": ("7d", 50), "monthly": ("30d", 100)}
+
+
+def import_top_visited_pages(timeframe: str) -> Optional[int]:
+    """
+    Replace `{timeframe}_stats` with top visited pages from Plausible, enriched with post metadata.
+
+    :param str timeframe: Time frame to import (weekly or monthly).
+
+    :returns: Optional[int]
+    """
+    time_period, limit = PLAUSIBLE_TIMEFRAMES[timeframe]
+    results = top_visited_pages_by_timeframe(time_period, limit=limit)
+    if not results:
+        LOGGER.warning(f"No Plausible results for `{time_period}`; keeping existing `{timeframe}_stats`.")
+        return None
+    rows = [
+        {
+            "title": result["title"],
+            "url": result["url"],
+            "slug": result["slug"],
+            "views": result["pageviews"],
+            "visitors": result.get("visitors"),
+            "visits": result.get("visits"),
+            "bounce_rate": result.get("bounce_rate"),
+            "visit_duration": result.get("visit_duration"),
+        }
+        for result in results
+        if result is not None
+    ]
+    return feature_db.insert_records(rows, f"{timeframe}_stats", replace=True)
+
 
 def top_visited_pages_by_timeframe(time_period: str, limit=100) -> Optional[List[dict]]:
     """
@@ -28,12 +63,13 @@ def top_visited_pages_by_timeframe(time_period: str, limit=100) -> Optional[List
     return []
 
 
-def fetch_top_visited_pages(time_period: str, limit=30) -> List[Optional[dict]]:
+def fetch_top_visited_pages(time_period: str, limit=30, day: Optional[date] = None) -> List[Optional[dict]]:
     """
     Fetch top visited URLs from Plausible.
 
     :param str time_period: Period of time to fetch results for (12mo, 6mo, month, 30d, 7d, or day).
     :param int limit: Maximum number of results to be returned.
+    :param Optional[date] day: Date the period ends on; defaults to today.
 
     :returns: Optional[List[dict]]
     """
@@ -49,11 +85,12 @@ def fetch_top_visited_pages(time_period: str, limit=30) -> List[Optional[dict]]:
             "limit": limit,
             "metrics": "visitors,visits,bounce_rate,pageviews,visit_duration",
         }
-        resp = requests.get(
+        if day:
+            params["date"] = day.isoformat()
+        resp = http.get(
             settings.PLAUSIBLE_STATS_ENDPOINT,
             params=params,
             headers=headers,
-            timeout=20,
         )
         if resp.status_code != 200:
             raise HTTPException(
@@ -0,0 +1,84 @@
+"""Keep stored top pages fresh with Plausible results."""
+
+import asyncio
+from typing import Dict, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.analytics.plausible import PLAUSIBLE_TIMEFRAMES, import_top_visited_pages
+from app.cache import results
+from config import settings
+from database import feature_db
+from log import LOGGER
+
+STATS_SQL_DIR = f"{settings.BASE_DIR}/database/queries/analytics/stats"
+
+# Named lock held while refreshing, so a single worker across all processes refreshes at a time
+REFRESH_LOCK = "refresh_site_analytics"
+# Seconds a request finding no stored top pages waits for another worker's refresh to finish
+REFRESH_LOCK_WAIT = 30
+
+
+async def refresh_site_analytics(
+    stale_after: Optional[float] = None, lock_timeout: float = 0
+) -> Optional[Dict[str, Optional[int]]]:
+    """
+    Import top visited pages of each timeframe from Plausible into `{timeframe}_stats`.
+
+    Skipped (returning None) when another worker holds the refresh lock for longer than `lock_timeout`, or when
+    stored rows turn out to be younger than `stale_after` seconds once the lock is acquired.
+
+    :param Optional[float] stale_after: Only refresh stored rows at least this old (or missing).
+    :param float lock_timeout: Seconds to wait for a refresh in progress on another worker to finish.
+
+    :returns: Optional[Dict[str, Optional[int]]]
+    """
+    async with feature_db.named_lock_async(REFRESH_LOCK, lock_timeout) as acquired:
+        if not acquired:
+            LOGGER.info("Skipped refreshing stored top pages; another worker is refreshing them.")
+            return None
+        if stale_after is not None:
+            age = await stats_age()
+            if age is not None and age < stale_after:
+                return None
+        imported = {}
+        for timeframe in PLAUSIBLE_TIMEFRAMES:
+            imported[timeframe] = await run_in_threadpool(import_top_visited_pages, timeframe)
+    await results.invalidate("analytics")
+    LOGGER.success(f"Refreshed stored top pages from Plausible: {imported}")
+    return imported
+
+
+async def stats_age() -> Optional[int]:
+    """
+    Seconds since the least recently refreshed timeframe was stored, or None if any timeframe is empty.
+
+    :returns: Optional[int]
+    """
+    rows = await feature_db.fetch_records_from_file_async(f"{STATS_SQL_DIR}/stats_age.sql")
+    if not rows or None in rows[0].values():
+        return None
+    return max(rows[0].values())
+
+
+async def refresh_site_analytics_periodically(interval: int) -> None:
+    """
+    Refresh stored top pages whenever they are older than `interval`; runs until cancelled.
+
+    Each worker runs its own refresher, so the age of stored rows (rather than a local timer) decides whether
+    a refresh is due; the refresh lock & a re-check of that age under it leave a single worker to refresh per interval.
+
+    :param int interval: Seconds between refreshes.
+    """
+    while True:
+        try:
+            age = await stats_age()
+            if age is None or age >= interval:
+                await refresh_site_analytics(stale_after=interval)
+                age = 0
+            await asyncio.sleep(interval - age)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            LOGGER.error(f"Unexpected error while refreshing stored top pages: {e}")
+            await asyncio.sleep(interval)
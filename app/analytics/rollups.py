@@ -0,0 +1,136 @@
+"""Roll stored daily page views up into top pages, trends & bounce rates for any number of windows."""
+
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from config import settings
+from database import feature_db
+
+ROLLUP_SQL_DIR = f"{settings.BASE_DIR}/database/queries/analytics/rollups"
+
+# Trailing windows (in days) served by `/analytics/rollups/`; adding one costs no additional warehouse query.
+ROLLUP_WINDOWS = (7, 30, 90, 365)
+
+ROLLUP_METRICS = ["views", "visits", "bounces"]
+
+
+async def fetch_daily_page_views(windows: Iterable[int] = ROLLUP_WINDOWS) -> pd.DataFrame:
+    """
+    Load daily page views covering the longest window & the window preceding it.
+
+    :param Iterable[int] windows: Trailing windows to be rolled up, in days.
+
+    :returns: pd.DataFrame
+    """
+    since = date.today() - timedelta(days=2 * max(windows))
+    rows = await feature_db.fetch_records_from_file_async(f"{ROLLUP_SQL_DIR}/daily_page_views.sql", {"since": since})
+    return pd.DataFrame.from_records(rows, columns=["day", "url", "slug", "title", *ROLLUP_METRICS])
+
+
+def rollup_page_views(
+    daily: pd.DataFrame, today: date, windows: Iterable[int] = ROLLUP_WINDOWS, limit: int = 50
+) -> Dict[str, dict]:
+    """
+    Compute top pages, trend against the preceding window & bounce rate for each trailing window.
+
+    Rows are grouped once into buckets bounded by every window & its preceding window; cumulative sums over
+    those buckets then yield each window's totals without re-scanning rows per window.
+
+    :param pd.DataFrame daily: Views, visits & bounces per page per day.
+    :param date today: First day excluded from windows; windows end with the previous (complete) day.
+    :param Iterable[int] windows: Trailing windows to roll up, in days.
+    :param int limit: Maximum number of pages returned per window.
+
+    :returns: Dict[str, dict]
+    """
+    windows = sorted(set(windows))
+    boundaries = np.unique([bound for window in windows for bound in (window, 2 * window)])
+    ages = (np.datetime64(today, "D") - pd.to_datetime(daily["day"]).to_numpy().astype("datetime64[D]")).astype(int)
+    buckets = np.searchsorted(boundaries, ages, side="left")
+    in_range = (ages >= 1) & (buckets < len(boundaries))
+    daily = daily.loc[in_range].assign(bucket=buckets[in_range])
+    daily[ROLLUP_METRICS] = daily[ROLLUP_METRICS].fillna(0).astype(np.int64)
+    sums = daily.groupby(["url", "bucket"])[ROLLUP_METRICS].sum().unstack("bucket", fill_value=0)
+    sums = sums.reindex(columns=pd.MultiIndex.from_product([ROLLUP_METRICS, range(len(boundaries))]), fill_value=0)
+    cumulative = {metric: sums[metric].to_numpy().cumsum(axis=1) for metric in ROLLUP_METRICS}
+    pages = daily.sort_values("day").groupby("url")[["slug", "title"]].last().reindex(sums.index)
+    history = (today - min(daily["day"])).days if len(daily) else 0
+    return {
+        f"{window}d": rollup_window(
+            pages,
+            cumulative,
+            current=int(np.searchsorted(boundaries, window)),
+            preceding=int(np.searchsorted(boundaries, 2 * window)) if history >= 2 * window else None,
+            limit=limit,
+        )
+        for window in windows
+    }
+
+
+def rollup_window(
+    pages: pd.DataFrame, cumulative: Dict[str, np.ndarray], current: int, preceding: Optional[int], limit: int
+) -> dict:
+    """
+    Rank pages of a single window from cumulative per-bucket sums.
+
+    :param pd.DataFrame pages: Slug & title of each page, in the row order of `cumulative`.
+    :param Dict[str, np.ndarray] cumulative: Running totals per page (rows) across age buckets (columns) per metric.
+    :param int current: Index of the bucket ending the window.
+    :param Optional[int] preceding: Index of the bucket ending the preceding window, if stored history covers it.
+    :param int limit: Maximum number of pages returned.
+
+    :returns: dict
+    """
+    views = cumulative["views"][:, current]
+    visits = cumulative["visits"][:, current]
+    bounces = cumulative["bounces"][:, current]
+    previous = cumulative["views"][:, preceding] - views if preceding is not None else None
+    ranked = np.argsort(-views, kind="stable")[:limit]
+    ranked = ranked[views[ranked] > 0]
+    rows: List[dict] = []
+    for i in ranked:
+        rows.append(
+            {
+                "title": pages["title"].iat[i],
+                "url": pages.index[i],
+                "slug": pages["slug"].iat[i],
+                "views": int(views[i]),
+                "previous_views": int(previous[i]) if previous is not None else None,
+                "trend": percent_change(views[i], previous[i]) if previous is not None else None,
+                "bounce_rate": percent(bounces[i], visits[i]),
+            }
+        )
+    return {
+        "count": len(rows),
+        "views": int(views.sum()),
+        "previous_views": int(previous.sum()) if previous is not None else None,
+        "bounce_rate": percent(bounces.sum(), visits.sum()),
+        "rows": rows,
+    }
+
+
+def percent(part: int, whole: int) -> Optional[float]:
+    """
+    Express `part` as a percentage of `whole`, or None when `whole` is zero.
+
+    :param int part: Numerator.
+    :param int whole: Denominator.
+
+    :returns: Optional[float]
+    """
+    return round(100 * float(part) / float(whole), 1) if whole else None
+
+
+def percent_change(current: int, previous: int) -> Optional[float]:
+    """
+    Percentage change from `previous` to `current`, or None when there is nothing to compare against.
+
+    :param int current: Value in the current window.
+    :param int previous: Value in the preceding window.
+
+    :returns: Optional[float]
+    """
+    return round(100 * (float(current) - float(previous)) / float(previous), 1) if previous else None
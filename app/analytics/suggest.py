@@ -0,0 +1,165 @@
+"""Suggest search queries by prefix from the history of searches imported from Algolia."""
+
+import asyncio
+from bisect import bisect_left
+from time import monotonic
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+
+from config import settings
+from database import feature_db
+from log import LOGGER
+
+SEARCHES_SQL_DIR = f"{settings.BASE_DIR}/database/queries/analytics/searches"
+
+# Prefix ranges up to this size are ranked directly; wider ranges are scanned in order of overall popularity
+DIRECT_RANK_LIMIT = 4096
+
+
+def normalize_query(query: str) -> str:
+    """
+    Lowercase a search query & collapse its whitespace, so variants of a query share an entry.
+
+    :param str query: Search query.
+
+    :returns: str
+    """
+    return " ".join(query.lower().split())
+
+
+class SuggestionIndex:
+    """
+    Sorted array of distinct queries with their search counts, answering prefix lookups with binary search.
+
+    Queries are ranked by their count over the past month, with searches of the past week (already included in
+    that count) weighted by `recency_weight`. Queries sharing a prefix occupy a contiguous range of the array.
+    The highest ranked queries of a narrow range are picked with a partial sort of its scores; for a wide range,
+    queries are visited in order of overall score until enough fall within the range, which takes few steps
+    precisely because the range is wide.
+    """
+
+    def __init__(self, searches: Iterable[dict] = (), recency_weight: float = 1.0):
+        """
+        :param Iterable[dict] searches: Rows with a `search` query, its monthly `count` & optional `recent` count.
+        :param float recency_weight: Weight of recent searches relative to older ones; 1 ranks by count alone.
+        """
+        counts: Dict[str, int] = {}
+        recent: Dict[str, int] = {}
+        for row in searches:
+            query = normalize_query(row["search"] or "")
+            if query:
+                counts[query] = counts.get(query, 0) + int(row["count"] or 0)
+                recent[query] = recent.get(query, 0) + int(row.get("recent") or 0)
+        self.queries: List[str] = sorted(counts)
+        self.counts = np.fromiter((counts[query] for query in self.queries), dtype=np.int64, count=len(self.queries))
+        recent_counts = np.fromiter((recent[query] for query in self.queries), dtype=np.int64, count=len(self.queries))
+        self.scores = self.counts + (recency_weight - 1) * recent_counts
+        self.by_popularity = np.argsort(-self.scores, kind="stable")
+        self.built_at = monotonic()
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[dict]:
+        """
+        Highest ranked queries starting with `prefix`.
+
+        :param str prefix: Partial search query.
+        :param int limit: Maximum number of suggestions.
+
+        :returns: List[dict]
+        """
+        prefix = normalize_query(prefix)
+        if not prefix or limit < 1:
+            return []
+        lo = bisect_left(self.queries, prefix)
+        hi = bisect_left(self.queries, prefix + chr(0x10FFFF), lo)
+        if hi - lo <= DIRECT_RANK_LIMIT:
+            matches = lo + self._top(self.scores[lo:hi], limit)
+        else:
+            matches = self._top_in_range(lo, hi, limit)
+        return [{"search": self.queries[i], "count": int(self.counts[i])} for i in matches]
+
+    @staticmethod
+    def _top(scores: np.ndarray, limit: int) -> np.ndarray:
+        """
+        Positions of the largest `limit` scores, largest first.
+
+        :param np.ndarray scores: Ranking scores of a range of queries.
+        :param int limit: Maximum number of positions.
+
+        :returns: np.ndarray
+        """
+        if len(scores) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(len(scores))
+        return top[np.lexsort((top, -scores[top]))]
+
+    def _top_in_range(self, lo: int, hi: int, limit: int) -> np.ndarray:
+        """
+        Indices of the highest ranked queries within [lo, hi), scanning all queries by score in blocks.
+
+        :param int lo: First index of range.
+        :param int hi: Index past the end of range.
+        :param int limit: Maximum number of indices.
+
+        :returns: np.ndarray
+        """
+        found, start, block = [], 0, DIRECT_RANK_LIMIT
+        while start < len(self.by_popularity):
+            candidates = self.by_popularity[start : start + block]
+            found.extend(candidates[(candidates >= lo) & (candidates < hi)][: limit - len(found)])
+            if len(found) >= limit:
+                break
+            start += block
+            block *= 2
+        return np.asarray(found, dtype=np.int64)
+
+
+class Suggestions:
+    """Suggestion index shared by requests, rebuilt from stored searches once it is older than `ttl`."""
+
+    def __init__(self, ttl: int, recency_weight: float = 1.0):
+        """
+        :param int ttl: Seconds before the index is rebuilt from stored searches.
+        :param float recency_weight: Weight of the past week's searches when ranking suggestions.
+        """
+        self.ttl = ttl
+        self.recency_weight = recency_weight
+        self.index: Optional[SuggestionIndex] = None
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> SuggestionIndex:
+        """
+        Current index, building it first if missing or expired.
+
+        :returns: SuggestionIndex
+        """
+        if self.index is None or monotonic() - self.index.built_at > self.ttl:
+            async with self._lock:
+                if self.index is None or monotonic() - self.index.built_at > self.ttl:
+                    await self.rebuild()
+        return self.index
+
+    async def rebuild(self) -> SuggestionIndex:
+        """
+        Build index from monthly searches stored from Algolia, along with the weekly searches among them.
+
+        :returns: SuggestionIndex
+        """
+        searches = await feature_db.fetch_records_from_file_async(f"{SEARCHES_SQL_DIR}/search_counts.sql")
+        if not searches and self.index:
+            LOGGER.warning("No stored searches found; keeping previous search suggestion index.")
+            self.index.built_at = monotonic()
+            return self.index
+        self.index = await run_in_threadpool(SuggestionIndex, searches, self.recency_weight)
+        LOGGER.info(f"Built search suggestion index of {len(self.index)} queries.")
+        return self.index
+
+
+suggestions = Suggestions(
+    ttl=settings.SEARCH_SUGGESTIONS_TTL, recency_weight=settings.SEARCH_SUGGESTIONS_RECENCY_WEIGHT
+)
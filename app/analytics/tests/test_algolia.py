@@ -0,0 +1,42 @@
+"""Test streaming Algolia search analytics page by page."""
+
+from app.analytics import algolia
+
+
+class StubResponse:
+    """Page of Algolia search analytics."""
+
+    def __init__(self, searches: list):
+        self.searches = searches
+
+    def raise_for_status(self):
+        pass
+
+    def json(self) -> dict:
+        return {"searches": self.searches}
+
+
+def test_persist_algolia_searches_pages_through_results(monkeypatch):
+    """Request pages by offset until a short page, filtering & inserting rows as they stream in."""
+    searches = [{"search": f"query {i}", "count": 100 - i, "nbHits": i, "trackedSearchCount": i} for i in range(5)]
+    searches[2]["search"] = "abc"
+    offsets = []
+
+    def stub_get(url, headers=None, params=None):
+        offsets.append(params["offset"])
+        return StubResponse(searches[params["offset"] : params["offset"] + params["limit"]])
+
+    def stub_insert_records(rows, table_name, replace=False, chunk_size=None):
+        assert table_name == "algolia_searches_week"
+        assert replace is True
+        inserted.extend(rows)
+        return len(inserted)
+
+    inserted = []
+    monkeypatch.setattr(algolia.http, "get", stub_get)
+    monkeypatch.setattr(algolia.feature_db, "insert_records", stub_insert_records)
+    rows = algolia.filter_search_queries(algolia.fetch_algolia_searches(7, page_size=2))
+    assert algolia.import_algolia_search_queries(rows, "algolia_searches_week") == 4
+    assert offsets == [0, 2, 4]
+    assert [row["search"] for row in inserted] == ["query 0", "query 1", "query 3", "query 4"]
+    assert inserted[0] == {"search": "query 0", "count": 100, "nbHits": 0}
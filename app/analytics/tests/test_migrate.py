@@ -0,0 +1,44 @@
+"""Test streaming BigQuery results as Arrow record batches."""
+
+import pyarrow as pa
+
+from app.analytics.migrate import ArrowTransfer
+
+
+class StubRowIterator:
+    """Finished query job yielding fixed record batches."""
+
+    def __init__(self, batches):
+        self.batches = batches
+
+    def to_arrow_iterable(self, bqstorage_client=None):
+        return iter(self.batches)
+
+
+def test_arrow_transfer_streams_batches():
+    """Yield rows of every batch in order while tracking batch counts & the most viewed pages."""
+    batches = [
+        pa.RecordBatch.from_pydict({"title": ["A", "B"], "slug": ["a", "b"], "views": [9, 5]}),
+        pa.RecordBatch.from_pydict({"title": ["C"], "slug": ["c"], "views": [2]}),
+    ]
+    transfer = ArrowTransfer(StubRowIterator(batches), top=10)
+    rows = transfer.rows()
+    assert next(rows) == {"title": "A", "slug": "a", "views": 9}
+    assert transfer.batches == 1
+    assert [row["slug"] for row in rows] == ["b", "c"]
+    assert transfer.batches == 2
+    assert transfer.rows_read == 3
+    assert transfer.top_pages() == (["a", "b", "c"], [9, 5, 2])
+
+
+def test_arrow_transfer_keeps_only_top_pages():
+    """Bound pages kept while streaming to the most viewed, breaking ties by row order."""
+    batches = [
+        pa.RecordBatch.from_pydict({"slug": ["a", "b", "c"], "views": [3, 8, 5]}),
+        pa.RecordBatch.from_pydict({"slug": ["d", "e"], "views": [8, 1]}),
+    ]
+    transfer = ArrowTransfer(StubRowIterator(batches), top=3)
+    assert len(list(transfer.rows())) == 5
+    assert len(transfer._top_pages) == 3
+    assert transfer.top_pages() == (["b", "d", "c"], [8, 8, 5])
+    assert ArrowTransfer(StubRowIterator(batches)).top_pages() == ([], [])
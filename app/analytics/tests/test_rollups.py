@@ -0,0 +1,66 @@
+"""Test rolling daily page views up into trailing windows."""
+
+from datetime import date, timedelta
+
+import pandas as pd
+
+from app.analytics.rollups import rollup_page_views
+
+TODAY = date(2024, 7, 1)
+
+
+def daily_rows(url: str, views: int, days: range, visits=None, bounces=None) -> list:
+    """Stored rows for a single page, with the same views on each of the given days ago."""
+    return [
+        {
+            "day": TODAY - timedelta(days=ago),
+            "url": url,
+            "slug": url.strip("/"),
+            "title": url.strip("/").upper(),
+            "views": views,
+            "visits": visits,
+            "bounces": bounces,
+        }
+        for ago in days
+    ]
+
+
+def test_rollup_page_views_ranks_windows_with_trends_and_bounces():
+    """Rank each window by views, compare against the preceding window & weight bounce rate by visits."""
+    daily = pd.DataFrame(
+        daily_rows("/a/", 10, range(1, 15), visits=4, bounces=1)
+        + daily_rows("/b/", 30, range(1, 4), visits=10, bounces=5)
+        + daily_rows("/c/", 1, range(8, 61))
+        + daily_rows("/today/", 99, range(0, 1))
+    )
+    rollups = rollup_page_views(daily, TODAY, windows=(7, 30), limit=2)
+
+    weekly = rollups["7d"]
+    assert [row["slug"] for row in weekly["rows"]] == ["b", "a"]
+    assert weekly["views"] == 3 * 30 + 7 * 10
+    assert weekly["rows"][0]["previous_views"] == 0
+    assert weekly["rows"][0]["trend"] is None
+    assert weekly["rows"][1]["previous_views"] == 70
+    assert weekly["rows"][1]["trend"] == 0.0
+    assert weekly["rows"][1]["bounce_rate"] == 25.0
+    assert weekly["bounce_rate"] == round(100 * (3 * 5 + 7 * 1) / (3 * 10 + 7 * 4), 1)
+
+    monthly = rollups["30d"]
+    assert [row["slug"] for row in monthly["rows"]] == ["a", "b"]
+    assert monthly["rows"][0]["views"] == 140
+    assert monthly["previous_views"] == 30
+    assert monthly["views"] == 140 + 90 + 23
+
+
+def test_rollup_page_views_without_history():
+    """Omit trends when stored history doesn't cover the preceding window, & handle no rows at all."""
+    daily = pd.DataFrame(daily_rows("/a/", 5, range(1, 8)))
+    rollups = rollup_page_views(daily, TODAY, windows=(7, 30))
+    assert rollups["30d"]["previous_views"] is None
+    assert rollups["30d"]["rows"][0]["trend"] is None
+    assert rollups["30d"]["rows"][0]["bounce_rate"] is None
+
+    empty = pd.DataFrame(columns=["day", "url", "slug", "title", "views", "visits", "bounces"])
+    assert rollup_page_views(empty, TODAY, windows=(7,)) == {
+        "7d": {"count": 0, "views": 0, "previous_views": None, "bounce_rate": None, "rows": []}
+    }
@@ -0,0 +1,61 @@
+"""Test serving top pages stored by the Plausible refresher."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.analytics as analytics
+from app.analytics import refresh
+
+
+def test_get_site_analytics_serves_stored_rows(monkeypatch):
+    """Group stored rows by timeframe & report when the oldest of them was refreshed."""
+    stored = [
+        {"timeframe": "weekly", "slug": "a", "views": 9, "age": 60},
+        {"timeframe": "monthly", "slug": "a", "views": 30, "age": 120},
+        {"timeframe": "monthly", "slug": "b", "views": 12, "age": 120},
+    ]
+    refreshed = []
+
+    async def stub_fetch_records(sql_file, params=None):
+        assert params == {"weekly_limit": 50, "monthly_limit": 100}
+        return [dict(row) for row in stored]
+
+    async def stub_refresh(**kwargs):
+        refreshed.append(True)
+
+    monkeypatch.setattr(analytics.feature_db, "fetch_records_from_file_async", stub_fetch_records)
+    monkeypatch.setattr(analytics, "refresh_site_analytics", stub_refresh)
+    api = FastAPI()
+    api.include_router(analytics.router)
+    response = TestClient(api).get("/analytics/")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "weekly_stats": {"count": 1, "rows": [{"slug": "a", "views": 9}]},
+        "monthly_stats": {"count": 2, "rows": [{"slug": "a", "views": 30}, {"slug": "b", "views": 12}]},
+    }
+    assert parsedate_to_datetime(response.headers["Last-Modified"]).tzinfo is not None
+    assert not refreshed
+
+
+def test_refresh_skipped_while_another_worker_refreshes(monkeypatch):
+    """Leave refreshing to the worker holding the refresh lock, rather than racing it to replace the same tables."""
+    imported = []
+
+    @asynccontextmanager
+    async def held_elsewhere(name, timeout=0):
+        assert name == refresh.REFRESH_LOCK
+        yield False
+
+    monkeypatch.setattr(refresh.feature_db, "named_lock_async", held_elsewhere)
+    monkeypatch.setattr(refresh, "import_top_visited_pages", imported.append)
+    assert asyncio.run(refresh.refresh_site_analytics()) is None
+    assert not imported
+
+    api = FastAPI()
+    api.include_router(analytics.router)
+    assert TestClient(api).post("/analytics/").status_code == 409
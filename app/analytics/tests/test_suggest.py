@@ -0,0 +1,68 @@
+"""Test suggesting search queries by prefix."""
+
+from app.analytics import suggest
+from app.analytics.suggest import SuggestionIndex
+
+
+def test_suggest_ranks_prefix_matches_by_count():
+    """Merge variants of a query, then rank queries sharing a prefix by count."""
+    index = SuggestionIndex(
+        [
+            {"search": "Pandas DataFrame", "count": 5},
+            {"search": "pandas  dataframe", "count": 4},
+            {"search": "pandas groupby", "count": 7},
+            {"search": "pandas", "count": 2},
+            {"search": "python", "count": 50},
+            {"search": "flask", "count": 1},
+        ]
+    )
+    assert len(index) == 5
+    assert index.suggest("PAN") == [
+        {"search": "pandas dataframe", "count": 9},
+        {"search": "pandas groupby", "count": 7},
+        {"search": "pandas", "count": 2},
+    ]
+    assert index.suggest("p", limit=2) == [
+        {"search": "python", "count": 50},
+        {"search": "pandas dataframe", "count": 9},
+    ]
+    assert index.suggest("django") == []
+    assert index.suggest("  ") == []
+
+
+def test_suggest_weights_recent_searches():
+    """Rank by monthly count unless recent searches are weighted, while reporting the monthly count."""
+    searches = [
+        {"search": "pandas groupby", "count": 10, "recent": 0},
+        {"search": "pandas dataframe", "count": 8, "recent": 6},
+    ]
+    assert [row["search"] for row in SuggestionIndex(searches).suggest("pandas")] == [
+        "pandas groupby",
+        "pandas dataframe",
+    ]
+    assert SuggestionIndex(searches, recency_weight=2).suggest("pandas") == [
+        {"search": "pandas dataframe", "count": 8},
+        {"search": "pandas groupby", "count": 10},
+    ]
+
+
+def test_suggest_matches_queries_beyond_basic_multilingual_plane():
+    """Include queries continuing a prefix with characters above U+FFFF."""
+    index = SuggestionIndex([{"search": "python🐍", "count": 3}, {"search": "python\uffff", "count": 1}])
+    assert index.suggest("python") == [
+        {"search": "python🐍", "count": 3},
+        {"search": "python\uffff", "count": 1},
+    ]
+
+
+def test_suggest_scans_wide_ranges_by_popularity(monkeypatch):
+    """Rank ranges too wide to partially sort by scanning queries in order of overall popularity."""
+    monkeypatch.setattr(suggest, "DIRECT_RANK_LIMIT", 2)
+    searches = [{"search": f"query {i:03}", "count": i % 17} for i in range(300)]
+    searches.append({"search": "other", "count": 100})
+    index = SuggestionIndex(searches)
+    expected = sorted(
+        ({"search": row["search"], "count": row["count"]} for row in searches if row["search"].startswith("query 1")),
+        key=lambda row: (-row["count"], row["search"]),
+    )[:5]
+    assert index.suggest("query 1", limit=5) == expected
@@ -1,13 +1,14 @@
 """Author management."""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import JSONResponse
 
-from clients import sms
+from app.idempotency import WebhookDelivery, webhook_delivery
+from app.notifications.outbox import enqueue_notification
+from app.payloads import POST_UPDATE_OPENAPI, LeanPostUpdate, post_update_payload
 from config import settings
 from database import ghost_db
 from database.read_sql import collect_sql_queries
-from database.schemas import PostUpdate
 from log import LOGGER
 
 router = APIRouter(prefix="/authors", tags=["authors"])
@@ -18,29 +19,42 @@ router = APIRouter(prefix="/authors", tags=["authors"])
     summary="Sanitize author profile metadata.",
     description="Update all authors to have correct CDN urls & sanitized metadata.",
 )
-async def authors_bulk_update_metadata() -> JSONResponse:
+async def authors_bulk_update_metadata(
+    dry_run: bool = Query(default=False, description="Preview rows each update would match & its query plan.")
+) -> JSONResponse:
     """
     Bulk update author images to use CDN URLs.
 
+    :param bool dry_run: Report rows & query plan of each update statement without executing them.
+
     :returns: JSONResponse
     """
     update_author_queries = collect_sql_queries("users")
-    update_author_results = ghost_db.execute_queries(update_author_queries)
+    update_author_results = await ghost_db.execute_queries_async(update_author_queries, dry_run=dry_run)
     if update_author_results is None:
         raise HTTPException(status_code=204, detail="Post update ignored as post was just updated.")
-    LOGGER.success(f"Updated author metadata for {len(update_author_results)} authors.")
+    if dry_run:
+        LOGGER.info(
+            f"Dry run: would update author metadata with {len(update_author_results)} queries; nothing written."
+        )
+    else:
+        LOGGER.success(f"Updated author metadata for {len(update_author_results)} authors.")
     return JSONResponse(
         content={"authors": update_author_results},
         status_code=200,
     )
 
 
-@router.post("/post/created/")
-async def author_post_created(post_update: PostUpdate) -> JSONResponse:
+@router.post("/post/created/", openapi_extra=POST_UPDATE_OPENAPI)
+async def author_post_created(
+    post_update: LeanPostUpdate = Depends(post_update_payload),
+    delivery: WebhookDelivery = Depends(webhook_delivery),
+) -> JSONResponse:
     """
     Notify admin when new authors create a new post.
 
-    :param PostUpdate post_update: Post object generated upon update.
+    :param LeanPostUpdate post_update: Post object generated upon update.
+    :param WebhookDelivery delivery: Webhook delivery, recorded to ignore retries.
 
     :returns: JSONResponse
     """
@@ -54,21 +68,25 @@ async def author_post_created(post_update: PostUpdate) -> JSONResponse:
         settings.GHOST_ADMIN_USER_ID,
     ):
         msg = f"{author_name} just created a post: `{title}`."
-        sms.send_message(msg)
-        return JSONResponse(content=msg, status_code=200)
+        await enqueue_notification("authors", msg)
+        return await delivery.save(JSONResponse(content=msg, status_code=200))
     if primary_author_id == settings.GHOST_ADMIN_USER_ID and len(authors) > 1:
         msg = f"{author_name} just updated one of your posts: `{title}`."
-        sms.send_message(msg)
-        return JSONResponse(content=msg, status_code=200)
-    return JSONResponse(content=f"Author is {author_name}, carry on.", status_code=204)
+        await enqueue_notification("authors", msg)
+        return await delivery.save(JSONResponse(content=msg, status_code=200))
+    return await delivery.save(JSONResponse(content=f"Author is {author_name}, carry on.", status_code=204))
 
 
-@router.post("/post/updated/")
-async def author_post_tampered(post_update: PostUpdate) -> JSONResponse:
+@router.post("/post/updated/", openapi_extra=POST_UPDATE_OPENAPI)
+async def author_post_tampered(
+    post_update: LeanPostUpdate = Depends(post_update_payload),
+    delivery: WebhookDelivery = Depends(webhook_delivery),
+) -> JSONResponse:
     """
     Notify admin when new authors edit an admin post.
 
-    :param PostUpdate post_update: Post object generated upon update.
+    :param LeanPostUpdate post_update: Post object generated upon update.
+    :param WebhookDelivery delivery: Webhook delivery, recorded to ignore retries.
 
     :returns: JSONResponse
     """
@@ -79,9 +97,11 @@ async def author_post_tampered(post_update: PostUpdate) -> JSONResponse:
     if primary_author_id == settings.GHOST_ADMIN_USER_ID and len(authors) > 1:
         other_authors = [author.name for author in authors if author.id != settings.GHOST_ADMIN_USER_ID]
         msg = f"{', '.join(other_authors)} updated you post: `{title}`."
-        sms.send_message(msg)
-        return JSONResponse(content=msg, status_code=200)
-    return JSONResponse(
-        content=f"{data.primary_author.name} edited one of their own posts, carry on.",
-        status_code=200,
+        await enqueue_notification("authors", msg)
+        return await delivery.save(JSONResponse(content=msg, status_code=200))
+    return await delivery.save(
+        JSONResponse(
+            content=f"{data.primary_author.name} edited one of their own posts, carry on.",
+            status_code=200,
+        )
     )
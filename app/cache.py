@@ -0,0 +1,264 @@
+"""In-process caches shared across API routes."""
+
+import json
+from collections import OrderedDict, defaultdict
+from hashlib import sha256
+from threading import Lock
+from time import monotonic, time_ns
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.exc import SQLAlchemyError
+
+from config import settings
+from database import AsyncSessionLocal
+from database.crud import get_cached_result, get_cached_results, set_cached_result
+from log import LOGGER
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a fixed time-to-live."""
+
+    def __init__(self, max_size: int, ttl: float):
+        """
+        :param int max_size: Maximum number of entries to hold before evicting the least recently used.
+        :param float ttl: Number of seconds an entry remains valid.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Fetch unexpired value by key.
+
+        :param Hashable key: Cache key.
+        :param Any default: Value returned when key is missing or expired.
+
+        :returns: Any
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store value, evicting least recently used entries when full.
+
+        :param Hashable key: Cache key.
+        :param Any value: Value to cache.
+        :param Optional[float] ttl: Override of the cache's default time-to-live.
+        """
+        with self._lock:
+            self._entries[key] = (monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def add(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> bool:
+        """
+        Store value only if key is not already cached.
+
+        :param Hashable key: Cache key.
+        :param Any value: Value to cache.
+        :param Optional[float] ttl: Override of the cache's default time-to-live.
+
+        :returns: bool
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > monotonic():
+                return False
+            self._entries[key] = (monotonic() + (self.ttl if ttl is None else ttl), value)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            return True
+
+    def delete(self, key: Hashable) -> None:
+        """
+        Remove key from cache if present.
+
+        :param Hashable key: Cache key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LocalCacheBackend:
+    """Result cache backend held in this worker's memory."""
+
+    def __init__(self, max_size: int, ttl: float):
+        """
+        :param int max_size: Maximum number of results to hold.
+        :param float ttl: Default number of seconds a result remains valid.
+        """
+        self._cache = TTLCache(max_size=max_size, ttl=ttl)
+
+    async def get(self, key: str) -> Any:
+        return self._cache.get(key)
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        values = {key: self._cache.get(key) for key in keys}
+        return {key: value for key, value in values.items() if value is not None}
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._cache.set(key, value, ttl=ttl)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+class SqlCacheBackend:
+    """Result cache backend stored in the features database, shared by all API workers."""
+
+    def __init__(self, ttl: float):
+        """
+        :param float ttl: Default number of seconds a result remains valid.
+        """
+        self.ttl = ttl
+
+    async def get(self, key: str) -> Any:
+        try:
+            async with AsyncSessionLocal() as db:
+                value = await get_cached_result(db, key)
+        except SQLAlchemyError as e:
+            LOGGER.error(f"Failed to read cached result `{key}`: {e}")
+            return None
+        return None if value is None else json.loads(value)
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        try:
+            async with AsyncSessionLocal() as db:
+                values = await get_cached_results(db, keys)
+        except SQLAlchemyError as e:
+            LOGGER.error(f"Failed to read cached results {keys}: {e}")
+            return {}
+        return {key: json.loads(value) for key, value in values.items()}
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        try:
+            async with AsyncSessionLocal() as db:
+                await set_cached_result(db, key, json.dumps(value), self.ttl if ttl is None else ttl)
+        except SQLAlchemyError as e:
+            LOGGER.error(f"Failed to cache result `{key}`: {e}")
+
+
+class ResultCache:
+    """
+    Read-through cache of JSON-serializable endpoint results, grouped into namespaces.
+
+    Invalidating a namespace bumps its generation. Results are stored with the generation they were computed in,
+    & read in the same round trip as the namespace's current generation, so stale results are never served again
+    and simply expire from the backend.
+    """
+
+    # Generations outlive the results they version.
+    GENERATION_TTL = 30 * 24 * 60 * 60
+
+    def __init__(self, backend, ttl: float):
+        """
+        :param backend: Storage of cached results (`LocalCacheBackend` or `SqlCacheBackend`).
+        :param float ttl: Default number of seconds a result remains valid.
+        """
+        self.backend = backend
+        self.ttl = ttl
+        self._hits: Dict[str, int] = defaultdict(int)
+        self._misses: Dict[str, int] = defaultdict(int)
+
+    async def get_or_set(
+        self, namespace: str, params: dict, loader: Callable[[], Awaitable[Any]], ttl: Optional[float] = None
+    ) -> Any:
+        """
+        Fetch cached result, or compute & cache it on a miss.
+
+        :param str namespace: Group of results invalidated together (ie: `donations`).
+        :param dict params: Parameters which distinguish results within the namespace.
+        :param Callable[[], Awaitable[Any]] loader: Coroutine function computing the result on a miss.
+        :param Optional[float] ttl: Override of the default time-to-live.
+
+        :returns: Any
+        """
+        generation_key, key = f"{namespace}:generation", self._key(namespace, params)
+        cached = await self.backend.get_many([generation_key, key])
+        generation = cached.get(generation_key) or "0"
+        entry = cached.get(key)
+        if entry is not None and entry["generation"] == generation:
+            self._hits[namespace] += 1
+            return entry["value"]
+        self._misses[namespace] += 1
+        value = jsonable_encoder(await loader())
+        if value is not None:
+            await self.backend.set(
+                key, {"generation": generation, "value": value}, ttl=self.ttl if ttl is None else ttl
+            )
+        return value
+
+    async def invalidate(self, namespace: str) -> None:
+        """
+        Discard all cached results of a namespace.
+
+        :param str namespace: Group of results to invalidate.
+        """
+        await self.backend.set(f"{namespace}:generation", str(time_ns()), ttl=self.GENERATION_TTL)
+        LOGGER.info(f"Invalidated cached `{namespace}` results.")
+
+    def stats(self) -> Dict[str, dict]:
+        """
+        Report hits, misses & hit rate per namespace.
+
+        :returns: Dict[str, dict]
+        """
+        return {
+            namespace: {
+                "hits": self._hits[namespace],
+                "misses": self._misses[namespace],
+                "hit_rate": round(self._hits[namespace] / (self._hits[namespace] + self._misses[namespace]), 3),
+            }
+            for namespace in sorted(set(self._hits) | set(self._misses))
+        }
+
+    @staticmethod
+    def _key(namespace: str, params: dict) -> str:
+        """
+        Build cache key from namespace & a digest of params.
+
+        :param str namespace: Group of results.
+        :param dict params: Parameters which distinguish results within the namespace.
+
+        :returns: str
+        """
+        digest = sha256(json.dumps(jsonable_encoder(params), sort_keys=True).encode()).hexdigest()
+        return f"{namespace}:{digest}"
+
+
+def result_cache_ttl() -> int:
+    """
+    Time-to-live of cached results; per-worker local caches are kept short-lived when several workers serve the API,
+    since invalidation only reaches the worker which handled the write.
+
+    :returns: int
+    """
+    if settings.RESULT_CACHE_BACKEND != "sql" and settings.WEB_CONCURRENCY > 1:
+        return min(settings.RESULT_CACHE_TTL, settings.RESULT_CACHE_LOCAL_TTL)
+    return settings.RESULT_CACHE_TTL
+
+
+results = ResultCache(
+    backend=(
+        SqlCacheBackend(ttl=result_cache_ttl())
+        if settings.RESULT_CACHE_BACKEND == "sql"
+        else LocalCacheBackend(max_size=settings.RESULT_CACHE_SIZE, ttl=result_cache_ttl())
+    ),
+    ttl=result_cache_ttl(),
+)
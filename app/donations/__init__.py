@@ -1,13 +1,27 @@
 """Accept and persist `BuyMeACoffee` donations."""
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import List, Optional
 
-from app.donations.parse import parse_donation_json
-from database import get_db
-from database.crud import create_donation, get_donation
-from database.models import Donation
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import results
+from app.idempotency import WebhookDelivery, webhook_delivery
+from app.pagination import decode_cursor, encode_cursor
+from config import settings
+from database import get_async_db
+from database.crud import (
+    delete_donation,
+    get_donation_stats,
+    get_donations_page,
+    import_donations,
+    insert_donation,
+    rebuild_donation_aggregates,
+)
 from database.schemas import NewDonation
+from log import LOGGER
 
 router = APIRouter(prefix="/donation", tags=["donations"])
 
@@ -18,22 +32,56 @@ router = APIRouter(prefix="/donation", tags=["donations"])
     description="Save record of new donation to persistent ledger.",
     response_model=NewDonation,
 )
-async def accept_donation(donation: NewDonation, db: Session = Depends(get_db)) -> NewDonation:
+async def accept_donation(
+    donation: NewDonation,
+    db: AsyncSession = Depends(get_async_db),
+    delivery: WebhookDelivery = Depends(webhook_delivery),
+) -> NewDonation:
     """
     Save BuyMeACoffee donation to database.
 
     :param NewDonation donation: Incoming new donation.
-    :param Session db: ORM Database session.
+    :param AsyncSession db: ORM Database session.
+    :param WebhookDelivery delivery: Webhook delivery, recorded to ignore retries.
 
     :returns: NewDonation
     """
-    existing_donation = get_donation(db, donation)
-    if existing_donation:
+    created = await insert_donation(db, donation)
+    if created is None:
+        raise HTTPException(status_code=500, detail=f"Failed to save donation `{donation.coffee_id}`.")
+    if not created:
         raise HTTPException(
             status_code=400,
             detail=f"Donation `{donation.coffee_id}` from `{donation.email}` already exists; skipping.",
         )
-    return create_donation(db, donation)
+    await results.invalidate("donations")
+    return await delivery.save(donation)
+
+
+@router.post(
+    "/import/",
+    summary="Import BuyMeACoffee donation history",
+    description="Backfill ledger with historical donations in chunks, skipping donations already recorded.",
+)
+async def import_donation_history(donations: List[NewDonation], db: AsyncSession = Depends(get_async_db)) -> dict:
+    """
+    Bulk insert historical BuyMeACoffee donations.
+
+    :param List[NewDonation] donations: Historical donations exported from BuyMeACoffee.
+    :param AsyncSession db: ORM Database session.
+
+    :returns: dict
+    """
+    try:
+        inserted = await import_donations(db, donations, chunk_size=settings.SQLALCHEMY_INSERT_CHUNK_SIZE)
+    except SQLAlchemyError as e:
+        await db.rollback()
+        LOGGER.error(f"SQLAlchemyError while importing donations: {e}")
+        # Chunks committed before the failure are already served by the rebuilt aggregates.
+        await results.invalidate("donations")
+        raise HTTPException(status_code=500, detail="Failed to import donations.") from e
+    await results.invalidate("donations")
+    return {"received": len(donations), "inserted": inserted, "skipped": len(donations) - inserted}
 
 
 @router.delete(
@@ -42,36 +90,99 @@ async def accept_donation(donation: NewDonation, db: Session = Depends(get_db))
     description="Delete BuyMeACoffee donation transaction by ID.",
     response_model=NewDonation,
 )
-async def delete_donation(donation: NewDonation, db: Session = Depends(get_db)) -> NewDonation:
+async def remove_donation(donation: NewDonation, db: AsyncSession = Depends(get_async_db)) -> NewDonation:
     """
     Delete BuyMeACoffee donation from database.
 
-    :param NewDonation donation: Incoming new donation.
-    :param Session db: ORM Database session.
+    :param NewDonation donation: Donation to delete, matched by `coffee_id`.
+    :param AsyncSession db: ORM Database session.
 
     :returns: NewDonation
     """
-    existing_donation = get_donation(db, donation)
-    if existing_donation:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Donation `{donation.coffee_id}` from `{donation.email}` already exists; skipping.",
-        )
-    return create_donation(db, donation)
+    try:
+        deleted = await delete_donation(db, donation.coffee_id)
+    except SQLAlchemyError as e:
+        await db.rollback()
+        LOGGER.error(f"SQLAlchemyError while deleting donation `{donation.coffee_id}`: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to delete donation `{donation.coffee_id}`.") from e
+    if not deleted:
+        raise HTTPException(status_code=404, detail=f"Donation `{donation.coffee_id}` does not exist.")
+    await results.invalidate("donations")
+    return donation
 
 
 @router.get(
     "/",
-    summary="Get all existing donations.",
+    summary="Get existing donations.",
+    description="List donations in the order they were received. \
+            Results are paginated; pass the `X-Next-Cursor` header of a response as `?cursor=` to fetch the next page. \
+            Pages are cached per worker & may lag new donations by up to `RESULT_CACHE_LOCAL_TTL` seconds.",
+)
+async def get_donations(
+    cursor: Optional[str] = Query(default=None, description="Cursor from `X-Next-Cursor` of the previous page."),
+    limit: int = Query(default=100, ge=1, le=1000, description="Maximum number of donations per page."),
+    db: AsyncSession = Depends(get_async_db),
+) -> JSONResponse:
+    """
+    Fetch page of donations ordered by date received.
+
+    :param Optional[str] cursor: Position after the last donation of the previous page.
+    :param int limit: Maximum number of donations per page.
+    :param AsyncSession db: ORM Database session.
+
+    :returns: JSONResponse
+    """
+    after_at, after_id = decode_cursor(cursor)
+    if after_id is not None and (after_at is None or not after_id.isdigit()):
+        raise HTTPException(status_code=400, detail=f"Invalid cursor `{cursor}`.")
+
+    async def fetch_donations_page() -> dict:
+        donations = await get_donations_page(db, after_at, int(after_id) if after_id else None, limit)
+        last = donations[-1] if len(donations) == limit else None
+        return {"donations": donations, "next_cursor": encode_cursor(last["created_at"], last["id"]) if last else None}
+
+    page = await results.get_or_set("donations", {"cursor": cursor, "limit": limit}, fetch_donations_page)
+    headers = {"X-Next-Cursor": page["next_cursor"]} if page["next_cursor"] else {}
+    return JSONResponse(page["donations"], headers=headers)
+
+
+@router.get(
+    "/stats/",
+    summary="Donation totals.",
+    description="Precomputed donation totals per day & month, along with top supporters.",
 )
-async def get_donations(db: Session = Depends(get_db)):
+async def get_donations_stats(
+    days: int = Query(default=90, ge=1, le=366, description="Number of most recent days to include daily totals for."),
+    top: int = Query(default=10, ge=1, le=100, description="Number of top supporters to include."),
+    db: AsyncSession = Depends(get_async_db),
+) -> dict:
     """
-    Test endpoint for fetching comments joined with user info.
+    Fetch donation totals maintained as donations are received.
+
+    :param int days: Number of most recent days to include daily totals for.
+    :param int top: Number of top supporters to include.
+    :param AsyncSession db: ORM Database session.
+
+    :returns: dict
+    """
+    return await results.get_or_set(
+        "donations", {"stats": True, "days": days, "top": top}, lambda: get_donation_stats(db, days, top)
+    )
+
+
+@router.post(
+    "/stats/rebuild/",
+    summary="Rebuild donation totals.",
+    description="Recompute donation totals per day & supporter from the full donation ledger.",
+)
+async def rebuild_donations_stats(db: AsyncSession = Depends(get_async_db)) -> dict:
+    """
+    Recompute donation aggregates, ie: after backfilling donations recorded before aggregates existed.
+
+    :param AsyncSession db: ORM Database session.
 
-    :param Session db: ORM Database session.
+    :returns: dict
     """
-    response = []
-    all_donations = db.query(Donation).order_by(Donation.created_at).all()
-    for donation in all_donations:
-        response.append(parse_donation_json(donation))
-    return response
+    await rebuild_donation_aggregates(db)
+    await results.invalidate("donations")
+    return await get_donation_stats(db, days=90, top=10)
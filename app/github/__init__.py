@@ -1,10 +1,11 @@
 """Notify upon Github activity."""
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Depends, Request
 from fastapi.responses import JSONResponse
 
+from app.idempotency import WebhookDelivery, webhook_delivery
 from app.moment import get_current_time
-from clients import sms
+from app.notifications.outbox import enqueue_notification, notification_status
 from config import settings
 from log import LOGGER
 
@@ -16,11 +17,12 @@ router = APIRouter(prefix="/github", tags=["github"])
     summary="Notify upon Github PR creation.",
     description="Send SMS and Discord notifications upon PR creation in HackersAndSlackers Github projects.",
 )
-async def github_pr(request: Request) -> JSONResponse:
+async def github_pr(request: Request, delivery: WebhookDelivery = Depends(webhook_delivery)) -> JSONResponse:
     """
     Send SMS and Discord notifications upon PR creation in HackersAndSlackers Github projects.
 
     :param Request request: Incoming Github payload for newly opened PR.
+    :param WebhookDelivery delivery: Webhook delivery, recorded to ignore retries.
 
     :returns: JSONResponse
     """
@@ -30,12 +32,37 @@ async def github_pr(request: Request) -> JSONResponse:
     pull_request = payload["pull_request"]
     repo = payload["repository"]
     if user in (settings.GH_USERNAME, "dependabot-preview[bot]", "renovate[bot]"):
-        return JSONResponse(
+        return await delivery.save(
+            JSONResponse(
+                {
+                    "pr": {
+                        "id": pull_request["number"],
+                        "time": get_current_time(),
+                        "status": "ignored",
+                        "trigger": {
+                            "type": "github",
+                            "repo": repo["full_name"],
+                            "title": pull_request["title"],
+                            "user": user,
+                            "action": action,
+                        },
+                    }
+                }
+            )
+        )
+    message = f'PR {action} for `{repo["name"]}`: \n \
+     {pull_request["title"]}  \
+     {pull_request["body"]} \
+     {pull_request["url"]}'
+    notification = await enqueue_notification("github", message)
+    LOGGER.info(f"Github PR {action} for {repo['name']} queued SMS message")
+    return await delivery.save(
+        JSONResponse(
             {
                 "pr": {
                     "id": pull_request["number"],
                     "time": get_current_time(),
-                    "status": "ignored",
+                    "status": notification.status,
                     "trigger": {
                         "type": "github",
                         "repo": repo["full_name"],
@@ -43,36 +70,10 @@ async def github_pr(request: Request) -> JSONResponse:
                         "user": user,
                         "action": action,
                     },
-                }
+                },
+                "sms": notification_status(notification),
             }
         )
-    message = f'PR {action} for `{repo["name"]}`: \n \
-     {pull_request["title"]}  \
-     {pull_request["body"]} \
-     {pull_request["url"]}'
-    sms_message = sms.send_message(message)
-    LOGGER.info(f"Github PR {action} for {repo['name']} generated SMS message")
-    return JSONResponse(
-        {
-            "pr": {
-                "id": pull_request["number"],
-                "time": get_current_time(),
-                "status": sms_message.status,
-                "trigger": {
-                    "type": "github",
-                    "repo": repo["full_name"],
-                    "title": pull_request["title"],
-                    "user": user,
-                    "action": action,
-                },
-            },
-            "sms": {
-                "phone_recipient": sms_message.to,
-                "phone_sender": sms_message.from_,
-                "date_sent": sms_message.date_sent,
-                "message": sms_message.body,
-            },
-        }
     )
 
 
@@ -81,11 +82,12 @@ async def github_pr(request: Request) -> JSONResponse:
     summary="Notify upon Github Issue creation.",
     description="Send SMS and Discord notifications upon Issue creation in HackersAndSlackers Github projects.",
 )
-async def github_issue(request: Request) -> JSONResponse:
+async def github_issue(request: Request, delivery: WebhookDelivery = Depends(webhook_delivery)) -> JSONResponse:
     """
     Send SMS and Discord notifications upon issue creation for HackersAndSlackers Github projects.
 
     :param Request request: Incoming Github payload for newly opened issue.
+    :param WebhookDelivery delivery: Webhook delivery, recorded to ignore retries.
 
     :returns: JSONResponse
     """
@@ -95,12 +97,34 @@ async def github_issue(request: Request) -> JSONResponse:
     issue = payload["issue"]
     repo = payload["repository"]
     if user in (settings.GH_USERNAME, "dependabot-preview[bot]", "renovate[bot]"):
-        return JSONResponse(
+        return await delivery.save(
+            JSONResponse(
+                {
+                    "issue": {
+                        "id": issue["id"],
+                        "time": get_current_time(),
+                        "status": "ignored",
+                        "trigger": {
+                            "type": "github",
+                            "repo": repo["full_name"],
+                            "title": issue["title"],
+                            "user": user,
+                            "action": action,
+                        },
+                    }
+                }
+            )
+        )
+    message = f'Issue {action} for repository {repo["name"]}: `{issue["title"]}` \n\n {issue["url"]}'
+    notification = await enqueue_notification("github", message, priority=action == "opened")
+    LOGGER.info(f"Github issue {action} for {repo['name']} queued SMS message")
+    return await delivery.save(
+        JSONResponse(
             {
                 "issue": {
                     "id": issue["id"],
                     "time": get_current_time(),
-                    "status": "ignored",
+                    "status": notification.status,
                     "trigger": {
                         "type": "github",
                         "repo": repo["full_name"],
@@ -108,31 +132,8 @@ async def github_issue(request: Request) -> JSONResponse:
                         "user": user,
                         "action": action,
                     },
-                }
+                },
+                "sms": notification_status(notification),
             }
         )
-    message = f'Issue {action} for repository {repo["name"]}: `{issue["title"]}` \n\n {issue["url"]}'
-    sms_message = sms.send_message(message)
-    LOGGER.info(f"Github issue {action} for {repo['name']} generated SMS message")
-    return JSONResponse(
-        {
-            "issue": {
-                "id": issue["id"],
-                "time": get_current_time(),
-                "status": sms_message.status,
-                "trigger": {
-                    "type": "github",
-                    "repo": repo["full_name"],
-                    "title": issue["title"],
-                    "user": user,
-                    "action": action,
-                },
-            },
-            "sms": {
-                "phone_recipient": sms_message.to,
-                "phone_sender": sms_message.from_,
-                "date_sent": sms_message.date_sent,
-                "message": sms_message.body,
-            },
-        }
     )
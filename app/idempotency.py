@@ -0,0 +1,149 @@
+"""Suppress duplicate webhook deliveries retried by Ghost, Github, and BuyMeACoffee."""
+
+import json
+from hashlib import sha256
+from typing import Any, AsyncIterator, Optional, Tuple
+
+from fastapi import HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.cache import TTLCache
+from config import settings
+from database import AsyncSessionLocal
+from database.crud import create_webhook_delivery, get_webhook_delivery
+from log import LOGGER
+
+# Headers carrying a unique ID per delivery, checked before falling back to a fingerprint of the payload.
+DELIVERY_ID_HEADERS = ("idempotency-key", "x-github-delivery")
+
+# Marker for deliveries currently being processed; expires in case the worker handling it dies.
+PENDING = object()
+PENDING_TTL = 300
+
+deliveries = TTLCache(max_size=settings.WEBHOOK_IDEMPOTENCY_CACHE_SIZE, ttl=settings.WEBHOOK_IDEMPOTENCY_TTL)
+
+
+class DuplicateDeliveryError(Exception):
+    """Raised when a webhook delivery has already been processed."""
+
+    def __init__(self, key: str, status_code: int, content: Any):
+        super().__init__(f"Duplicate webhook delivery `{key}`.")
+        self.key = key
+        self.status_code = status_code
+        self.content = content
+
+
+class WebhookDelivery:
+    """Webhook delivery being processed for the first time."""
+
+    def __init__(self, key: str, route: str):
+        self.key = key
+        self.route = route
+        self.saved = False
+
+    async def save(self, result: Any) -> Any:
+        """
+        Record a route's result so retries of this delivery are answered without reprocessing it.
+
+        :param Any result: Response or JSON-serializable object returned by the route.
+
+        :returns: Any
+        """
+        if isinstance(result, Response):
+            status_code = result.status_code
+            content = json.loads(result.body) if result.body else None
+        else:
+            status_code = 200
+            content = jsonable_encoder(result)
+        deliveries.set(self.key, (status_code, content))
+        try:
+            async with AsyncSessionLocal() as db:
+                await create_webhook_delivery(
+                    db,
+                    key=self.key,
+                    route=self.route,
+                    status_code=status_code,
+                    response=json.dumps(content),
+                    ttl=settings.WEBHOOK_IDEMPOTENCY_TTL,
+                )
+        except SQLAlchemyError as e:
+            LOGGER.error(f"Failed to persist webhook delivery `{self.key}`: {e}")
+        self.saved = True
+        return result
+
+
+async def delivery_key(request: Request) -> str:
+    """
+    Identify a webhook delivery by its delivery ID header, or else by a fingerprint of its payload.
+
+    :param Request request: Incoming webhook request.
+
+    :returns: str
+    """
+    for header in DELIVERY_ID_HEADERS:
+        delivery_id = request.headers.get(header)
+        if delivery_id:
+            return f"{request.url.path}:{delivery_id}"
+    body = await request.body()
+    return f"{request.url.path}:{sha256(body).hexdigest()}"
+
+
+async def processed_delivery(key: str) -> Optional[Tuple[int, Any]]:
+    """
+    Look up status code & content returned for a processed delivery.
+
+    :param str key: Delivery ID or fingerprint of webhook request.
+
+    :returns: Optional[Tuple[int, Any]]
+    """
+    processed = deliveries.get(key)
+    if processed is not None:
+        return processed
+    try:
+        async with AsyncSessionLocal() as db:
+            record = await get_webhook_delivery(db, key)
+            if record is None:
+                return None
+            processed = (record.status_code, json.loads(record.response))
+    except SQLAlchemyError as e:
+        LOGGER.error(f"Failed to look up webhook delivery `{key}`: {e}")
+        return None
+    deliveries.set(key, processed)
+    return processed
+
+
+async def webhook_delivery(request: Request) -> AsyncIterator[WebhookDelivery]:
+    """
+    Route dependency which short-circuits webhook deliveries that were already processed.
+
+    :param Request request: Incoming webhook request.
+
+    :returns: AsyncIterator[WebhookDelivery]
+    """
+    key = await delivery_key(request)
+    processed = await processed_delivery(key)
+    if processed is PENDING or (processed is None and not deliveries.add(key, PENDING, ttl=PENDING_TTL)):
+        raise HTTPException(status_code=409, detail="Webhook delivery is already being processed.")
+    if processed is not None:
+        raise DuplicateDeliveryError(key, *processed)
+    delivery = WebhookDelivery(key, request.url.path)
+    try:
+        yield delivery
+    finally:
+        if not delivery.saved:
+            deliveries.delete(key)
+
+
+async def replay_duplicate_delivery(request: Request, exc: DuplicateDeliveryError) -> JSONResponse:
+    """
+    Answer a duplicate webhook delivery with the result of its original delivery.
+
+    :param Request request: Incoming webhook request.
+    :param DuplicateDeliveryError exc: Duplicate delivery with its cached result.
+
+    :returns: JSONResponse
+    """
+    LOGGER.info(f"Ignored duplicate webhook delivery `{exc.key}`; replaying original response.")
+    return JSONResponse(exc.content, status_code=exc.status_code, headers={"Idempotent-Replayed": "true"})
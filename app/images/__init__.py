@@ -2,12 +2,13 @@
 
 from typing import Optional
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, Query
 from fastapi.responses import JSONResponse
 
+from app.idempotency import WebhookDelivery, webhook_delivery
+from app.payloads import POST_UPDATE_OPENAPI, LeanPostUpdate, post_update_payload
 from clients import images
 from config import settings
-from database.schemas import PostUpdate
 from log import LOGGER
 
 router = APIRouter(prefix="/images", tags=["images"])
@@ -17,12 +18,17 @@ router = APIRouter(prefix="/images", tags=["images"])
     "/",
     summary="Optimize single post image.",
     description="Generate retina and mobile feature_image for a single post upon update.",
+    openapi_extra=POST_UPDATE_OPENAPI,
 )
-async def optimize_post_image(post_update: PostUpdate) -> JSONResponse:
+async def optimize_post_image(
+    post_update: LeanPostUpdate = Depends(post_update_payload),
+    delivery: WebhookDelivery = Depends(webhook_delivery),
+) -> JSONResponse:
     """
     Generate retina version of a post's feature image if one doesn't exist.
 
-    :param PostUpdate post_update: Incoming payload for an updated Ghost post.
+    :param LeanPostUpdate post_update: Incoming payload for an updated Ghost post.
+    :param WebhookDelivery delivery: Webhook delivery, recorded to ignore retries.
 
     :returns: JSONResponse
     """
@@ -36,9 +42,9 @@ async def optimize_post_image(post_update: PostUpdate) -> JSONResponse:
         new_images = [image for image in new_images if image is not None]
         if bool(new_images):
             LOGGER.info(f"Generated {len(new_images)} images for post `{title}`: {new_images}")
-            return JSONResponse(new_images)
-        return JSONResponse({post.title: "Retina & mobile images already exist"})
-    return JSONResponse({post.title: "No images exist for optimization"})
+            return await delivery.save(JSONResponse(new_images))
+        return await delivery.save(JSONResponse({post.title: "Retina & mobile images already exist"}))
+    return await delivery.save(JSONResponse({post.title: "No images exist for optimization"}))
 
 
 @router.get(
@@ -0,0 +1,104 @@
+"""Runtime metrics of API internals."""
+
+from typing import List
+
+from fastapi import APIRouter, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.cache import results
+from clients.http import http
+from database.engines import find_engine, pool_status
+from database.instrumentation import explain, query_stats
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get(
+    "/pool/",
+    summary="Database connection pool metrics.",
+    description="Connection usage, checkout wait times, and stale connection invalidations per database engine.",
+)
+async def get_pool_metrics() -> dict:
+    """
+    Report connection pool metrics for this worker.
+
+    :returns: dict
+    """
+    return pool_status()
+
+
+@router.get(
+    "/cache/",
+    summary="Result cache metrics.",
+    description="Hits, misses, and hit rate of cached read endpoint results per namespace, for this worker. \
+            The default `local` backend is per worker, so other workers may serve results cached before a write \
+            for up to `RESULT_CACHE_LOCAL_TTL` seconds when running several workers.",
+)
+async def get_cache_metrics() -> dict:
+    """
+    Report result cache hit rates for this worker.
+
+    :returns: dict
+    """
+    return results.stats()
+
+
+@router.get(
+    "/http/",
+    summary="Outbound HTTP metrics.",
+    description="Circuit breaker state, consecutive failures & requests in flight per third-party host, for this worker.",
+)
+async def get_http_metrics() -> dict:
+    """
+    Report health of third-party hosts as seen by this worker's outbound HTTP client.
+
+    :returns: dict
+    """
+    return http.stats()
+
+
+@router.get(
+    "/queries/",
+    summary="SQL query timings.",
+    description="Duration histogram, total & max time, and rows touched per query file, heaviest first.",
+)
+async def get_query_metrics() -> List[dict]:
+    """
+    Report SQL query timings for this worker.
+
+    :returns: List[dict]
+    """
+    return query_stats.summary()
+
+
+@router.get(
+    "/queries/slow/",
+    summary="Recent slow SQL queries.",
+    description="Most recent statements exceeding the slow query threshold; \
+            pass `?explain=true` to capture each statement's `EXPLAIN` plan.",
+)
+async def get_slow_queries(
+    explain_plans: bool = Query(default=False, alias="explain", description="Run `EXPLAIN` for each slow statement.")
+) -> List[dict]:
+    """
+    Report recent slow SQL queries for this worker, optionally with their query plans.
+
+    :param bool explain_plans: Whether to run `EXPLAIN` for each slow statement.
+
+    :returns: List[dict]
+    """
+    slow_queries = query_stats.slow_queries(include_parameters=explain_plans)
+    if not explain_plans:
+        return slow_queries
+    for query in slow_queries:
+        parameters = query.pop("parameters")
+        engine = find_engine(query["database"])
+        try:
+            query["explain"] = (
+                await run_in_threadpool(explain, engine, query["statement"], parameters) if engine else None
+            )
+        except SQLAlchemyError as e:
+            query["explain"] = f"Failed to explain query: {e}"
+    return jsonable_encoder(slow_queries)
@@ -25,7 +25,7 @@ async def new_ghost_member(subscriber: GhostSubscriber) -> GhostSubscriber:
     """
     try:
         current_member = subscriber.current
-        welcome_newsletter_subscriber(current_member)
+        await welcome_newsletter_subscriber(current_member)
         return subscriber
     except Exception as e:
         raise HTTPException(
@@ -1,34 +1,94 @@
 """Welcome newsletter subscribers ."""
 
-from typing import Optional
+import asyncio
+import json
+from typing import List, Optional, Tuple
 
 from clients import mailgun
+from clients.mail import MAILGUN_BATCH_LIMIT, Mailgun
 from config import settings
 from database.schemas import GhostMember, SubscriptionWelcomeEmail
 from log import LOGGER
 
 
-def welcome_newsletter_subscriber(
+class WelcomeEmails:
+    """Coalesce welcome emails to subscribers who sign up within a short window into a single batch send."""
+
+    def __init__(self, mail: Mailgun, window: float, max_batch: int):
+        """
+        :param Mailgun mail: Mailgun client.
+        :param float window: Seconds to wait for more subscribers before sending a batch.
+        :param int max_batch: Subscribers which trigger sending a batch without waiting out the window.
+        """
+        self.mail = mail
+        self.window = window
+        self.max_batch = min(max_batch, MAILGUN_BATCH_LIMIT)
+        self.pending: List[Tuple[GhostMember, asyncio.Future]] = []
+        self._timer: Optional[asyncio.Task] = None
+
+    async def send(self, subscriber: GhostMember) -> bool:
+        """
+        Queue welcome email to subscriber & wait until the batch including it has been sent.
+
+        :param GhostMember subscriber: New Ghost member with newsletter subscription.
+
+        :returns: bool
+        """
+        sent = asyncio.get_running_loop().create_future()
+        self.pending.append((subscriber, sent))
+        if self.window <= 0 or len(self.pending) >= self.max_batch:
+            await self.flush()
+        elif len(self.pending) == 1:
+            self._timer = asyncio.create_task(self._flush_after_window())
+        return await sent
+
+    async def _flush_after_window(self) -> None:
+        """Send pending welcome emails once the batching window has passed."""
+        await asyncio.sleep(self.window)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Send pending welcome emails in a single batch, resolving whether each was sent."""
+        batch, self.pending = self.pending, []
+        if not batch:
+            return
+        body = {
+            "from": self.mail.from_address,
+            "subject": settings.MAILGUN_SUBJECT_LINE,
+            "template": settings.MAILGUN_NEWSLETTER_TEMPLATE,
+            "h:X-Mailgun-Variables": json.dumps({"name": "%recipient.name%"}),
+            "o:tracking": True,
+        }
+        recipients = {subscriber.email: {"name": subscriber.name} for subscriber, _ in batch}
+        try:
+            responses = await self.mail.send_batch(body, recipients)
+            sent = all(resp is not None and resp.status_code == 200 for resp in responses)
+        except Exception as e:
+            LOGGER.error(f"Unexpected error while sending welcome emails to {list(recipients)}: {e}")
+            sent = False
+        if sent:
+            LOGGER.success(f"Sent welcome email to {len(recipients)} newsletter subscriber(s).")
+        else:
+            LOGGER.error(f"Mailgun failed to send welcome email to {list(recipients)}: {body}")
+        for _, future in batch:
+            if not future.done():
+                future.set_result(sent)
+
+
+welcome_emails = WelcomeEmails(mailgun, settings.MAILGUN_BATCH_WINDOW, settings.MAILGUN_BATCH_SIZE)
+
+
+async def welcome_newsletter_subscriber(
     subscriber: GhostMember,
 ) -> Optional[SubscriptionWelcomeEmail]:
     """
-    Send welcome email to newsletter subscriber.
+    Send welcome email to newsletter subscriber, batched with those of other subscribers signing up at once.
 
     :param Member subscriber: New Ghost member with newsletter subscription.
 
     :returns: Optional[SubscriptionWelcomeEmail]
     """
-    body = {
-        "from": settings.MAILGUN_FROM_SENDER,
-        "to": [subscriber.email],
-        "subject": settings.MAILGUN_SUBJECT_LINE,
-        "template": settings.MAILGUN_NEWSLETTER_TEMPLATE,
-        "h:X-Mailgun-Variables": {"name": subscriber.name},
-        "o:tracking": True,
-    }
-    response = mailgun.send_email(body)
-    if response.status_code != 200:
-        LOGGER.error(f"Mailgun failed to send welcome email: {body}")
+    if not await welcome_emails.send(subscriber):
         return None
     return SubscriptionWelcomeEmail(
         from_email=settings.MAILGUN_PERSONAL_EMAIL,
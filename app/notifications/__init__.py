@@ -0,0 +1,37 @@
+"""Delivery status of queued notifications."""
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import get_async_db
+from database.crud import get_notification
+
+router = APIRouter(prefix="/notifications", tags=["notifications"])
+
+
+@router.get(
+    "/{notification_id}/",
+    summary="Get notification delivery status.",
+    description="Status, attempts & last error of an SMS notification queued by a webhook.",
+)
+async def get_notification_status(notification_id: int, db: AsyncSession = Depends(get_async_db)) -> dict:
+    """
+    Fetch delivery status of a queued notification.
+
+    :param int notification_id: ID of queued notification.
+    :param AsyncSession db: ORM database session.
+
+    :returns: dict
+    """
+    notification = await get_notification(db, notification_id)
+    if notification is None:
+        raise HTTPException(status_code=404, detail=f"Notification `{notification_id}` not found.")
+    return {
+        "id": notification.id,
+        "channel": notification.channel,
+        "status": notification.status,
+        "attempts": notification.attempts,
+        "last_error": notification.last_error,
+        "created_at": notification.created_at,
+        "sent_at": notification.sent_at,
+    }
@@ -0,0 +1,177 @@
+"""
+Queue SMS notifications in a persisted outbox, delivered by background sender workers with retries.
+
+Non-priority notifications are held for a digest window & sent as one combined SMS per channel.
+"""
+
+import asyncio
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from clients import sms
+from config import settings
+from database import AsyncSessionLocal
+from database.crud import (
+    claim_notifications,
+    complete_notification,
+    create_notification,
+)
+from database.models import Notification
+from log import LOGGER
+
+# Set whenever a notification is queued, so an idle worker sends it without waiting for its next poll
+queued = asyncio.Event()
+
+
+async def enqueue_notification(channel: str, body: str, priority: bool = False) -> Notification:
+    """
+    Persist a notification to be sent by a sender worker, returning without waiting for it to be sent.
+
+    :param str channel: Source of notification (ie: `github`, `authors`).
+    :param str body: Content of SMS message to send.
+    :param bool priority: Send on its own right away, rather than in the channel's next digest.
+
+    :returns: Notification
+    """
+    send_at = datetime.now()
+    if not priority:
+        send_at += timedelta(seconds=settings.NOTIFICATION_DIGEST_WINDOW)
+    async with AsyncSessionLocal() as db:
+        notification = await create_notification(db, channel, body, priority=priority, send_at=send_at)
+    if notification is None:
+        raise HTTPException(status_code=503, detail=f"Failed to queue `{channel}` notification.")
+    queued.set()
+    LOGGER.info(f"Queued `{channel}` notification {notification.id}.")
+    return notification
+
+
+def notification_status(notification: Notification) -> dict:
+    """
+    Summarize a queued notification for a webhook's response.
+
+    :param Notification notification: Queued notification.
+
+    :returns: dict
+    """
+    return {
+        "notification_id": notification.id,
+        "status": notification.status,
+        "status_url": f"/notifications/{notification.id}/",
+        "message": notification.body,
+    }
+
+
+def retry_delay(attempts: int) -> float:
+    """
+    Seconds before retrying a notification, backing off exponentially with jitter.
+
+    :param int attempts: Number of attempts made so far.
+
+    :returns: float
+    """
+    delay = min(settings.NOTIFICATION_MAX_BACKOFF, settings.NOTIFICATION_BACKOFF * 2 ** (attempts - 1))
+    return random.uniform(delay / 2, delay)
+
+
+def group_digests(notifications: List[Notification]) -> List[List[Notification]]:
+    """
+    Group claimed notifications into SMS messages: one per priority notification & one per channel otherwise.
+
+    :param List[Notification] notifications: Notifications claimed by a worker.
+
+    :returns: List[List[Notification]]
+    """
+    digests: Dict[str, List[Notification]] = {}
+    groups = []
+    for notification in notifications:
+        if notification.priority:
+            groups.append([notification])
+        elif notification.channel in digests:
+            digests[notification.channel].append(notification)
+        else:
+            digests[notification.channel] = [notification]
+            groups.append(digests[notification.channel])
+    return groups
+
+
+def digest_body(notifications: List[Notification], max_length: int) -> str:
+    """
+    Combine notifications of a channel into a single message, summarizing those which don't fit in `max_length`.
+
+    :param List[Notification] notifications: Notifications of a single channel.
+    :param int max_length: Maximum characters of message.
+
+    :returns: str
+    """
+    if len(notifications) == 1:
+        return notifications[0].body[:max_length]
+    lines = [f"{len(notifications)} {notifications[0].channel} notifications:"]
+    for i, notification in enumerate(notifications):
+        line = f"- {' '.join(notification.body.split())}"
+        # Leave room to summarize the notifications after this one, should the next not fit
+        rest = len(notifications) - i - 1
+        reserved = len(f"\n…and {rest} more") if rest else 0
+        if len("\n".join(lines)) + 1 + len(line) + reserved > max_length:
+            lines.append(f"…and {rest + 1} more")
+            break
+        lines.append(line)
+    return "\n".join(lines)[:max_length]
+
+
+async def send_notifications(notifications: List[Notification]) -> None:
+    """
+    Attempt to send claimed notifications as a single SMS via Twilio & record the outcome of each,
+    scheduling a retry upon failure.
+
+    :param List[Notification] notifications: Priority notification, or notifications of one channel to digest.
+    """
+    ids = ", ".join(str(notification.id) for notification in notifications)
+    channel = notifications[0].channel
+    try:
+        body = digest_body(notifications, settings.NOTIFICATION_DIGEST_MAX_LENGTH)
+        message = await run_in_threadpool(sms.send_message, body)
+        outcomes = [{"provider_id": message.sid} for _ in notifications]
+        LOGGER.success(f"Sent `{channel}` notification(s) {ids} in one SMS.")
+    except Exception as e:
+        outcomes = []
+        for notification in notifications:
+            retry_at = None
+            if notification.attempts < settings.NOTIFICATION_MAX_ATTEMPTS:
+                retry_at = datetime.now() + timedelta(seconds=retry_delay(notification.attempts))
+            outcomes.append({"error": str(e), "retry_at": retry_at})
+        LOGGER.error(f"Failed to send `{channel}` notification(s) {ids}: {e}.")
+    async with AsyncSessionLocal() as db:
+        for notification, outcome in zip(notifications, outcomes):
+            await complete_notification(db, notification, **outcome)
+
+
+async def run_sender(worker: int) -> None:
+    """
+    Send due notifications until cancelled, waking when notifications are queued or every poll interval.
+
+    :param int worker: Number of worker, for logging.
+    """
+    while True:
+        try:
+            queued.clear()
+            async with AsyncSessionLocal() as db:
+                notifications = await claim_notifications(
+                    db, limit=settings.NOTIFICATION_BATCH_SIZE, lease=settings.NOTIFICATION_LEASE
+                )
+            for digest in group_digests(notifications):
+                await send_notifications(digest)
+            if notifications:
+                continue
+            try:
+                await asyncio.wait_for(queued.wait(), timeout=settings.NOTIFICATION_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            LOGGER.error(f"Unexpected error in notification sender {worker}: {e}")
+            await asyncio.sleep(settings.NOTIFICATION_POLL_INTERVAL)
@@ -0,0 +1,36 @@
+"""Opaque cursors for keyset-paginated endpoints."""
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from typing import Optional, Tuple, Union
+
+from fastapi import HTTPException
+
+
+def encode_cursor(sort_at: Optional[datetime], row_id: Union[int, str]) -> str:
+    """
+    Build opaque cursor pointing after a row ordered by `(sort_at, id)`.
+
+    :param Optional[datetime] sort_at: Sort key of the last row of a page, which may be null.
+    :param Union[int, str] row_id: ID of the last row of a page.
+
+    :returns: str
+    """
+    return urlsafe_b64encode(f"{sort_at.isoformat() if sort_at else ''}|{row_id}".encode()).decode()
+
+
+def decode_cursor(cursor: Optional[str]) -> Tuple[Optional[datetime], Optional[str]]:
+    """
+    Parse cursor produced by `encode_cursor`; a cursor after a row with a null sort key has an ID but no `sort_at`.
+
+    :param Optional[str] cursor: Opaque cursor from the `X-Next-Cursor` header of a previous page.
+
+    :returns: Tuple[Optional[datetime], Optional[str]]
+    """
+    if not cursor:
+        return None, None
+    try:
+        sort_at, row_id = urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(sort_at) if sort_at else None, row_id
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor `{cursor}`.") from e
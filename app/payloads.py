@@ -0,0 +1,170 @@
+"""Fast-path parsing of large Ghost post webhook payloads."""
+
+from typing import Any, List, NamedTuple, Optional, Union
+
+import orjson
+from fastapi import HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+from pydantic.json_schema import models_json_schema
+
+from config import settings
+from database.schemas import BasePost, PostUpdate
+
+# Fields webhook handlers read without checking for `None`; payloads missing them are rejected with a 422.
+REQUIRED_POST_FIELDS = ("id", "slug", "title")
+
+# Fields of a Ghost post which may be read from a `LeanPost`
+POST_FIELDS = frozenset(BasePost.model_fields)
+
+
+class LeanAuthor(NamedTuple):
+    """Subset of Ghost author fields used by webhook handlers."""
+
+    id: Optional[str]
+    name: Optional[str]
+    slug: Optional[str]
+    email: Optional[str]
+
+    @classmethod
+    def from_dict(cls, author: Optional[dict]) -> Optional["LeanAuthor"]:
+        if not author:
+            return None
+        return cls(author.get("id"), author.get("name"), author.get("slug"), author.get("email"))
+
+
+class LeanPost:
+    """
+    Ghost post decoded without model validation.
+
+    Fields used by webhook handlers are exposed as attributes; heavy bodies (`html`, `mobiledoc`, `plaintext`)
+    and any other field are read from the decoded payload only when accessed. Names which aren't fields of
+    `BasePost` raise `AttributeError`, as they would on the validated model.
+    """
+
+    __slots__ = ("_data", "_authors")
+
+    def __init__(self, data: dict):
+        self._data = data
+        self._authors: Optional[List[LeanAuthor]] = None
+
+    def __getattr__(self, name: str):
+        if name not in POST_FIELDS:
+            raise AttributeError(f"`{type(self).__name__}` has no field `{name}`")
+        return self._data.get(name)
+
+    @property
+    def authors(self) -> List[LeanAuthor]:
+        if self._authors is None:
+            self._authors = [LeanAuthor.from_dict(author) for author in self._data.get("authors") or []]
+        return self._authors
+
+    @property
+    def primary_author(self) -> Optional[LeanAuthor]:
+        return LeanAuthor.from_dict(self._data.get("primary_author"))
+
+
+class LeanPostChange(NamedTuple):
+    """Current & previous versions of an updated Ghost post."""
+
+    current: LeanPost
+    previous: Optional[LeanPost]
+
+
+class LeanPostUpdate(NamedTuple):
+    """Incoming post update request, decoded lazily."""
+
+    post: LeanPostChange
+
+    @classmethod
+    def from_json(cls, body: bytes) -> "LeanPostUpdate":
+        """
+        Decode Ghost `post.*` webhook payload.
+
+        :param bytes body: Raw request body.
+
+        :returns: LeanPostUpdate
+        """
+        post = orjson.loads(body)["post"]
+        current = post["current"]
+        validate_post(current)
+        previous = post.get("previous")
+        return cls(LeanPostChange(LeanPost(current), LeanPost(previous) if previous else None))
+
+
+def validate_post(post: dict) -> None:
+    """
+    Check the few fields webhook handlers depend on, in place of full model validation.
+
+    :param dict post: Decoded `post.current` of a Ghost webhook.
+    """
+    if not isinstance(post, dict):
+        raise TypeError("`post.current` must be an object.")
+    for field in REQUIRED_POST_FIELDS:
+        if not isinstance(post.get(field), str):
+            raise TypeError(f"`post.current.{field}` must be a string.")
+    primary_author = post.get("primary_author")
+    if not isinstance(primary_author, dict) or not isinstance(primary_author.get("id"), str):
+        raise TypeError("`post.current.primary_author` must be an author with an `id`.")
+    authors = post.get("authors")
+    if authors is not None and not (isinstance(authors, list) and all(isinstance(a, dict) for a in authors)):
+        raise TypeError("`post.current.authors` must be a list of authors.")
+
+
+def inline_schema_refs(schema: Any, definitions: Optional[dict] = None) -> Any:
+    """
+    Replace `$ref`s to a JSON schema's own `$defs` with the definitions they point to, leaving examples as-is.
+
+    :param Any schema: JSON schema generated from a pydantic model, or part of one.
+    :param Optional[dict] definitions: `$defs` of the top-level schema.
+
+    :returns: Any
+    """
+    if definitions is None and isinstance(schema, dict):
+        definitions = schema.get("$defs", {})
+        schema = {key: value for key, value in schema.items() if key != "$defs"}
+    if isinstance(schema, dict):
+        if "$ref" in schema:
+            return inline_schema_refs(definitions[schema["$ref"].split("/")[-1]], definitions)
+        return {
+            key: value if key in ("example", "examples") else inline_schema_refs(value, definitions)
+            for key, value in schema.items()
+        }
+    if isinstance(schema, list):
+        return [inline_schema_refs(value, definitions) for value in schema]
+    return schema
+
+
+# Documents the body parsed by `post_update_payload`, which routes read from the request rather than a model
+POST_UPDATE_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": inline_schema_refs(
+                    models_json_schema([(PostUpdate, "validation")])[1] | {"$ref": "#/$defs/PostUpdate"}
+                )
+            }
+        },
+    }
+}
+
+
+async def post_update_payload(request: Request) -> Union[LeanPostUpdate, PostUpdate]:
+    """
+    Route dependency which parses Ghost post webhooks, skipping full validation when lean parsing is enabled.
+
+    :param Request request: Incoming Ghost webhook request.
+
+    :returns: Union[LeanPostUpdate, PostUpdate]
+    """
+    body = await request.body()
+    if not settings.WEBHOOK_LEAN_PARSING:
+        try:
+            return PostUpdate.model_validate_json(body)
+        except ValidationError as e:
+            raise RequestValidationError(e.errors()) from e
+    try:
+        return LeanPostUpdate.from_json(body)
+    except (orjson.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+        raise HTTPException(status_code=422, detail=f"Malformed Ghost post payload: {e}") from e
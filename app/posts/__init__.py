@@ -3,14 +3,20 @@
 from datetime import datetime, timedelta
 from time import sleep
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.exceptions import HTTPException
 from fastapi.responses import JSONResponse
 
+from app.cache import results
+from app.idempotency import WebhookDelivery, webhook_delivery
 from app.moment import get_current_datetime, get_current_time
+from app.payloads import POST_UPDATE_OPENAPI, LeanPostUpdate, post_update_payload
 from app.posts.metadata import optimize_posts_metadata
 from app.posts.update import update_html_ssl_urls, update_metadata_images
 from clients import ghost
+from database import ghost_db
+from database.read_sql import collect_sql_queries
 from database.schemas import PostBulkUpdate, PostUpdate
 from log import LOGGER
 
@@ -23,12 +29,17 @@ router = APIRouter(prefix="/posts", tags=["posts"])
     description="Performs multiple actions to optimize post SEO. \
                 Generates meta tags, ensures SSL hyperlinks, and populates missing <img /> `alt` attributes.",
     response_model=PostUpdate,
+    openapi_extra=POST_UPDATE_OPENAPI,
 )
-async def update_post(post_update: PostUpdate) -> JSONResponse:
+async def update_post(
+    post_update: LeanPostUpdate = Depends(post_update_payload),
+    delivery: WebhookDelivery = Depends(webhook_delivery),
+) -> JSONResponse:
     """
     Enrich post metadata upon update.
 
-    :param PostUpdate post_update: Request to update Ghost post.
+    :param LeanPostUpdate post_update: Request to update Ghost post.
+    :param WebhookDelivery delivery: Webhook delivery, recorded to ignore retries.
 
     :returns: JSONResponse
     """
@@ -56,16 +67,19 @@ async def update_post(post_update: PostUpdate) -> JSONResponse:
             }
         ]
     }
-    if html and "http://" in html:
-        body = update_html_ssl_urls(html, body, slug)
+    if html:
+        body = update_html_ssl_urls(html, body, slug, title=post.title, mobiledoc=post.mobiledoc)
     if feature_image is not None:
         body = update_metadata_images(feature_image, body, slug)
     sleep(1)
     time = get_current_time()
     body["posts"][0]["updated_at"] = time
-    response, code = ghost.update_post(post.id, body, post.slug)
+    response = ghost.update_post(post.id, body, post.slug)
+    if response is None:
+        raise HTTPException(status_code=502, detail=f"Failed to update post `{slug}` in Ghost.")
+    await results.invalidate("posts")
     LOGGER.success(f"Successfully updated post `{slug}`: {body}")
-    return JSONResponse({str(code): response})
+    return await delivery.save(JSONResponse(response))
 
 
 @router.get(
@@ -74,19 +88,52 @@ async def update_post(post_update: PostUpdate) -> JSONResponse:
     description="Ensure all posts have properly optimized metadata.",
     response_model=PostBulkUpdate,
 )
-async def batch_update_metadata() -> JSONResponse:
+async def batch_update_metadata(
+    dry_run: bool = Query(default=False, description="Preview rows each update would match & its query plan.")
+) -> JSONResponse:
     """
     Run SQL queries to sanitize metadata for all posts.
 
+    :param bool dry_run: Report rows & query plan of each update statement without executing them.
+
     :returns: JSONResponse
     """
-    posts_metadata_updated, posts_metadata_added = optimize_posts_metadata()
+    if dry_run:
+        previews = await ghost_db.execute_queries_async(collect_sql_queries("posts/updates"), dry_run=True)
+        return JSONResponse(previews)
+    # Chunked update sweeps sleep between chunks & metadata inserts call the Ghost API; keep both off the event loop.
+    posts_metadata_updated, posts_metadata_added = await run_in_threadpool(optimize_posts_metadata)
+    await results.invalidate("posts")
     return JSONResponse(
         content=f"Inserted {posts_metadata_added}; Updated {posts_metadata_updated}",
         status_code=200,
     )
 
 
+@router.get(
+    "/all/",
+    summary="Get all post URLs.",
+)
+async def get_all_posts() -> JSONResponse:
+    """
+    List all published Ghost posts.
+
+    :returns: JSONResponse
+    """
+
+    async def fetch_all_posts():
+        posts = await run_in_threadpool(ghost.get_all_posts)
+        if posts is not None:
+            LOGGER.success(f"Fetched all {len(posts)} Ghost posts: {posts}")
+        return posts
+
+    posts = await results.get_or_set("posts", {}, fetch_all_posts)
+    return JSONResponse(
+        posts,
+        status_code=200,
+    )
+
+
 @router.get(
     "/{post_id}/",
     summary="Get a post.",
@@ -102,21 +149,3 @@ async def get_single_post(post_id: str) -> JSONResponse:
     if post_id is None:
         raise HTTPException(status_code=422, detail="Post ID required to test endpoint.")
     return JSONResponse(ghost.get_post(post_id))
-
-
-@router.get(
-    "/all/",
-    summary="Get all post URLs.",
-)
-async def get_all_posts() -> JSONResponse:
-    """
-    List all published Ghost posts.
-
-    :returns: JSONResponse
-    """
-    posts = ghost.get_all_posts()
-    LOGGER.success(f"Fetched all {len(posts)} Ghost posts: {posts}")
-    return JSONResponse(
-        posts,
-        status_code=200,
-    )
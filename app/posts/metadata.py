@@ -6,6 +6,7 @@ from app.posts.update import bulk_update_post_metadata
 from config import settings
 from database import ghost_db
 from database.read_sql import collect_sql_queries
+from database.sql_db import SKIPPED_QUERY
 from log import LOGGER
 
 
@@ -31,8 +32,9 @@ def update_posts_metadata(post_update_queries: dict) -> int:
     """
     update_results = ghost_db.execute_queries(post_update_queries)
     if update_results:
-        LOGGER.success(f"Updated metadata for {len(update_results)} posts.")
-        return len(update_results)
+        executed = [result for result in update_results.values() if result != SKIPPED_QUERY]
+        LOGGER.success(f"Updated metadata for {len(executed)} posts ({len(update_results) - len(executed)} skipped).")
+        return len(executed)
     return 0
 
 
@@ -42,11 +44,29 @@ def insert_posts_metadata() -> int:
 
     :returns: int
     """
-    insert_posts = ghost_db.execute_query_from_file(
+    if settings.GHOST_METADATA_WRITE_MODE == "sql":
+        return upsert_posts_metadata()
+    insert_posts = ghost_db.fetch_records_from_file(
         f"{settings.BASE_DIR}/database/queries/posts/selects/missing_all_metadata.sql",
     )
-    insert_results = bulk_update_post_metadata(insert_posts)
+    outcomes = bulk_update_post_metadata(insert_posts)
+    insert_results = [outcome for outcome in outcomes if outcome["status"] == "updated"]
     if insert_results:
         LOGGER.success(f"Inserted metadata for {len(insert_results)} posts.")
-        return insert_results
+        return len(insert_results)
     return 0
+
+
+def upsert_posts_metadata() -> int:
+    """
+    Fill missing `posts_meta` fields for all posts with a single set-based SQL statement.
+
+    :returns: int
+    """
+    upsert_result = ghost_db.execute_query_from_file(
+        f"{settings.BASE_DIR}/database/queries/posts/inserts/posts_meta_missing_metadata.sql",
+    )
+    if isinstance(upsert_result, str) or upsert_result is None:
+        return 0
+    LOGGER.success(f"Upserted metadata into `posts_meta` ({upsert_result.rowcount} rows affected).")
+    return upsert_result.rowcount
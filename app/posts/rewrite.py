@@ -0,0 +1,333 @@
+"""Single-pass rewriting of post HTML & mobiledoc to secure URLs and populate missing image `alt` attributes."""
+
+import json
+import re
+from html import escape, unescape
+from html.parser import HTMLParser
+from os.path import basename, splitext
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+URL_ATTRIBUTES = ("href", "src", "srcset")
+HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+WHITESPACE = re.compile(r"\s+")
+FILENAME_SEPARATORS = re.compile(r"[-_@.]+")
+HTML_TAGS = re.compile(r"<[^>]+>")
+
+
+def secure_url(url: Optional[str], srcset: bool = False) -> Optional[str]:
+    """
+    Upgrade a URL starting with `http://` (or each such candidate of a `srcset`) to `https://`.
+
+    URLs embedded elsewhere in a value, such as in a query string, are left untouched.
+
+    :param Optional[str] url: Value of a URL attribute.
+    :param bool srcset: Whether value is a `srcset` of comma-separated image candidates.
+
+    :returns: Optional[str]
+    """
+    if not url:
+        return url
+    if srcset:
+        return "".join(secure_url(part) for part in srcset_parts(url))
+    return f"https://{url[7:]}" if url[:7].lower() == "http://" else url
+
+
+def srcset_parts(srcset: str) -> Iterator[str]:
+    """
+    Split a `srcset` into candidate URLs & the separators/descriptors between them, which join back into the input.
+
+    Follows the HTML parsing rules: a URL runs until whitespace, with trailing commas ending the candidate;
+    otherwise its descriptors run until the next comma.
+
+    :param str srcset: Value of a `srcset` attribute.
+
+    :returns: Iterator[str]
+    """
+    pos, length = 0, len(srcset)
+    while pos < length:
+        start = pos
+        while pos < length and (srcset[pos].isspace() or srcset[pos] == ","):
+            pos += 1
+        end = pos
+        while end < length and not srcset[end].isspace():
+            end += 1
+        url = srcset[pos:end].rstrip(",")
+        yield srcset[start:pos]
+        yield url
+        pos += len(url)
+        if pos == end:
+            comma = srcset.find(",", pos)
+            end = length if comma == -1 else comma
+            yield srcset[pos:end]
+            pos = end
+
+
+def alt_from_filename(src: Optional[str]) -> Optional[str]:
+    """
+    Derive human-readable image description from an image's filename.
+
+    :param Optional[str] src: Image URL.
+
+    :returns: Optional[str]
+    """
+    if not src:
+        return None
+    name = splitext(basename(src.split("?")[0]))[0]
+    name = FILENAME_SEPARATORS.sub(" ", name).strip()
+    return name.capitalize() if name and not name.isdigit() else None
+
+
+class PostHtmlRewriter(HTMLParser):
+    """
+    Streaming HTML rewriter.
+
+    Tokens are re-emitted exactly as received unless a tag contains an insecure `href`/`src`/`srcset`
+    or is an `<img />` missing an `alt`, so text content and code samples are never modified.
+    """
+
+    def __init__(self, title: Optional[str] = None):
+        super().__init__(convert_charrefs=False)
+        self.title = title
+        self.upgraded_urls = 0
+        self.populated_alts = 0
+        self._out: List[str] = []
+        self._heading: Optional[List[str]] = None
+        self._last_heading: Optional[str] = None
+        self._figure_depth = 0
+        self._caption: Optional[List[str]] = None
+        self._pending_images: List[Tuple[int, str, list, bool]] = []
+        # Input not yet passed by an end tag, starting at line `_raw_line` whose first character is at `_raw_line_start`
+        self._raw = ""
+        self._raw_offset = 0
+        self._raw_line = 1
+        self._raw_line_start = 0
+
+    @property
+    def changed(self) -> bool:
+        """Whether any tag was rewritten."""
+        return bool(self.upgraded_urls or self.populated_alts)
+
+    def drain(self) -> str:
+        """
+        Return rewritten HTML produced so far.
+        Output is held back while an image inside a `<figure>` waits for its `<figcaption>`.
+
+        :returns: str
+        """
+        if self._pending_images:
+            return ""
+        output = "".join(self._out)
+        self._out = []
+        return output
+
+    def feed(self, data: str) -> None:
+        self._raw += data
+        super().feed(data)
+
+    def close(self) -> None:
+        """Flush remaining input & resolve images still waiting on a caption."""
+        super().close()
+        self._resolve_pending_images(None)
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        self._rewrite_tag(tag, attrs, self_closing=False)
+        if tag in HEADING_TAGS:
+            self._heading = []
+        elif tag == "figure":
+            self._figure_depth += 1
+        elif tag == "figcaption" and self._figure_depth:
+            self._caption = []
+
+    def handle_startendtag(self, tag: str, attrs: list) -> None:
+        self._rewrite_tag(tag, attrs, self_closing=True)
+
+    def handle_endtag(self, tag: str) -> None:
+        self._out.append(self._raw_endtag() or f"</{tag}>")
+        if tag in HEADING_TAGS and self._heading is not None:
+            self._last_heading = self._text(self._heading) or self._last_heading
+            self._heading = None
+        elif tag == "figcaption" and self._caption is not None:
+            self._resolve_pending_images(self._text(self._caption))
+            self._caption = None
+        elif tag == "figure" and self._figure_depth:
+            self._figure_depth -= 1
+            self._resolve_pending_images(None)
+
+    def handle_data(self, data: str) -> None:
+        self._out.append(data)
+        if self._heading is not None:
+            self._heading.append(data)
+        if self._caption is not None:
+            self._caption.append(data)
+
+    def handle_entityref(self, name: str) -> None:
+        self.handle_data(f"&{name};")
+
+    def handle_charref(self, name: str) -> None:
+        self.handle_data(f"&#{name};")
+
+    def handle_comment(self, data: str) -> None:
+        self._out.append(f"<!--{data}-->")
+
+    def handle_decl(self, decl: str) -> None:
+        self._out.append(f"<!{decl}>")
+
+    def handle_pi(self, data: str) -> None:
+        self._out.append(f"<?{data}>")
+
+    def unknown_decl(self, data: str) -> None:
+        self._out.append(f"<![{data}]]>")
+
+    def _raw_endtag(self) -> Optional[str]:
+        """
+        Raw text of the end tag being handled, located from the parser's position (the start of the current tag),
+        since `handle_endtag` only receives the lowercased tag name. Input before it is discarded.
+
+        :returns: Optional[str]
+        """
+        line, column = self.getpos()
+        start = self._raw_line_start - self._raw_offset
+        for _ in range(line - self._raw_line):
+            start = self._raw.index("\n", max(start, 0)) + 1
+        index = start + column
+        self._raw_line, self._raw_line_start = line, self._raw_offset + start
+        self._raw, self._raw_offset = self._raw[index:], self._raw_offset + index
+        end = self._raw.find(">")
+        return self._raw[: end + 1] if self._raw.startswith("</") and end != -1 else None
+
+    def _rewrite_tag(self, tag: str, attrs: list, self_closing: bool) -> None:
+        """
+        Emit a start tag, rebuilding it only when an attribute needs to change.
+
+        :param str tag: Name of HTML tag.
+        :param list attrs: Tag attributes as (name, value) pairs.
+        :param bool self_closing: Whether tag was written as `<tag />`.
+        """
+        modified = False
+        for i, (name, value) in enumerate(attrs):
+            secured = secure_url(value, srcset=name == "srcset") if name in URL_ATTRIBUTES else value
+            if secured != value:
+                attrs[i] = (name, secured)
+                self.upgraded_urls += 1
+                modified = True
+        if tag == "img" and not (dict(attrs).get("alt") or "").strip():
+            attrs = [(name, value) for name, value in attrs if name != "alt"]
+            if self._figure_depth:
+                self._pending_images.append((len(self._out), tag, attrs, self_closing))
+                self._out.append("")
+                return
+            attrs.append(("alt", self._fallback_alt(dict(attrs).get("src"))))
+            self.populated_alts += 1
+            modified = True
+        self._out.append(self._build_tag(tag, attrs, self_closing) if modified else self.get_starttag_text())
+
+    def _resolve_pending_images(self, caption: Optional[str]) -> None:
+        """
+        Populate `alt` of images which were waiting for a figure caption.
+
+        :param Optional[str] caption: Text of the figure's `<figcaption>`, if any.
+        """
+        for index, tag, attrs, self_closing in self._pending_images:
+            alt = caption or self._fallback_alt(dict(attrs).get("src"))
+            self._out[index] = self._build_tag(tag, attrs + [("alt", alt)], self_closing)
+            self.populated_alts += 1
+        self._pending_images = []
+
+    def _fallback_alt(self, src: Optional[str]) -> str:
+        """
+        Best available description of an image lacking a caption.
+
+        :param Optional[str] src: Image URL.
+
+        :returns: str
+        """
+        return self._last_heading or self.title or alt_from_filename(src) or ""
+
+    @staticmethod
+    def _build_tag(tag: str, attrs: list, self_closing: bool) -> str:
+        """
+        Serialize start tag from its attributes.
+
+        :param str tag: Name of HTML tag.
+        :param list attrs: Tag attributes as (name, value) pairs.
+        :param bool self_closing: Whether to close tag as `<tag />`.
+
+        :returns: str
+        """
+        rendered = "".join(f" {name}" if value is None else f' {name}="{escape(value)}"' for name, value in attrs)
+        return f"<{tag}{rendered}{' /' if self_closing else ''}>"
+
+    @staticmethod
+    def _text(chunks: List[str]) -> str:
+        return WHITESPACE.sub(" ", unescape("".join(chunks))).strip()
+
+
+def rewrite_html_stream(chunks: Iterable[str], title: Optional[str] = None) -> Iterator[str]:
+    """
+    Rewrite HTML incrementally, yielding output as each chunk of input is consumed.
+
+    :param Iterable[str] chunks: Post HTML split into arbitrarily sized pieces.
+    :param Optional[str] title: Post title used as a last-resort image description.
+
+    :returns: Iterator[str]
+    """
+    rewriter = PostHtmlRewriter(title=title)
+    for chunk in chunks:
+        rewriter.feed(chunk)
+        output = rewriter.drain()
+        if output:
+            yield output
+    rewriter.close()
+    output = rewriter.drain()
+    if output:
+        yield output
+
+
+def rewrite_html(html: str, title: Optional[str] = None) -> Tuple[str, PostHtmlRewriter]:
+    """
+    Rewrite post HTML in a single pass.
+
+    :param str html: Raw post HTML.
+    :param Optional[str] title: Post title used as a last-resort image description.
+
+    :returns: Tuple[str, PostHtmlRewriter]
+    """
+    rewriter = PostHtmlRewriter(title=title)
+    rewriter.feed(html)
+    rewriter.close()
+    return rewriter.drain(), rewriter
+
+
+def rewrite_mobiledoc(mobiledoc: str, title: Optional[str] = None) -> Tuple[str, int]:
+    """
+    Secure link markups & image cards of a mobiledoc document, populating missing image `alt` values.
+
+    :param str mobiledoc: Mobiledoc encoded as a JSON string.
+    :param Optional[str] title: Post title used as a last-resort image description.
+
+    :returns: Tuple[str, int]
+    """
+    document = json.loads(mobiledoc)
+    changes = 0
+    for markup in document.get("markups", []):
+        attributes = markup[1] if len(markup) > 1 else []
+        for i in range(1, len(attributes), 2):
+            if attributes[i - 1] in URL_ATTRIBUTES:
+                secured = secure_url(attributes[i], srcset=attributes[i - 1] == "srcset")
+                if secured != attributes[i]:
+                    attributes[i] = secured
+                    changes += 1
+    for card_name, payload in document.get("cards", []):
+        images = payload.get("images", []) if card_name == "gallery" else [payload] if card_name == "image" else []
+        for image in images:
+            secured = secure_url(image.get("src"))
+            if secured != image.get("src"):
+                image["src"] = secured
+                changes += 1
+            if not (image.get("alt") or "").strip():
+                caption = HTML_TAGS.sub("", image.get("caption") or "").strip()
+                image["alt"] = caption or title or alt_from_filename(image.get("src")) or ""
+                changes += 1
+    if not changes:
+        return mobiledoc, 0
+    return json.dumps(document, ensure_ascii=False, separators=(",", ":")), changes
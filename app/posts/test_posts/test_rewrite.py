@@ -0,0 +1,87 @@
+"""Test single-pass rewriting of post HTML & mobiledoc."""
+
+import json
+
+from app.posts.rewrite import rewrite_html, rewrite_html_stream, rewrite_mobiledoc
+
+
+def test_rewrite_html_secures_only_url_attributes():
+    """Upgrade `href` & `src` URLs while leaving text content and code samples untouched."""
+    html = (
+        '<p>Visit <a href="http://example.com">http://example.com</a></p>'
+        "<pre><code>curl http://localhost:5000</code></pre>"
+        '<img src="http://cdn.example.com/a.jpg" alt="Chart">'
+    )
+    rewritten, rewriter = rewrite_html(html)
+    assert '<a href="https://example.com">http://example.com</a>' in rewritten
+    assert "<code>curl http://localhost:5000</code>" in rewritten
+    assert 'src="https://cdn.example.com/a.jpg"' in rewritten
+    assert rewriter.upgraded_urls == 2
+    assert rewriter.populated_alts == 0
+
+
+def test_rewrite_html_preserves_untouched_markup():
+    """Leave documents without insecure URLs or missing `alt` attributes byte-for-byte identical."""
+    html = "<!-- kg-card-begin: html --><p class='lead'>Fish &amp; chips &#169;</p><br/><img src='a.png' alt='A'>"
+    rewritten, rewriter = rewrite_html(html)
+    assert rewritten == html
+    assert rewriter.changed is False
+    raw = "<P class=a>One</P ><![CDATA[x < y]]><script>if (a </b) {}</script >"
+    assert rewrite_html(raw)[0] == raw
+
+
+def test_rewrite_html_populates_alt_from_context():
+    """Describe images using their figure caption, else the nearest heading, else the post title."""
+    html = (
+        '<figure><img src="https://cdn.example.com/1.jpg" alt=""><figcaption>Pandas <b>logo</b></figcaption></figure>'
+        '<h2>Installing Flask</h2><img src="https://cdn.example.com/2.jpg">'
+    )
+    rewritten, rewriter = rewrite_html(html, title="Building Flask Apps")
+    assert '<img src="https://cdn.example.com/1.jpg" alt="Pandas logo">' in rewritten
+    assert '<img src="https://cdn.example.com/2.jpg" alt="Installing Flask">' in rewritten
+    assert rewriter.populated_alts == 2
+    untitled, _ = rewrite_html('<img src="https://cdn.example.com/3.jpg">', title="Building Flask Apps")
+    assert 'alt="Building Flask Apps"' in untitled
+
+
+def test_rewrite_html_stream_matches_single_pass():
+    """Produce identical output regardless of how input is chunked."""
+    html = '<h1>Title</h1><p><a href="http://a.com">a</a></p><figure><img src="http://b.com/c.jpg"></figure>' * 50
+    expected, _ = rewrite_html(html)
+    chunks = [html[i : i + 7] for i in range(0, len(html), 7)]
+    assert "".join(rewrite_html_stream(chunks)) == expected
+
+
+def test_rewrite_mobiledoc():
+    """Secure link markups & image cards of mobiledoc, filling missing image `alt` values."""
+    mobiledoc = json.dumps(
+        {
+            "version": "0.3.1",
+            "markups": [["a", ["href", "http://hackersandslackers.com"]]],
+            "cards": [["image", {"src": "http://cdn.example.com/a.jpg", "caption": "<em>Diagram</em>"}]],
+            "sections": [[1, "p", [[0, [], 0, "Served over http://"]]]],
+        }
+    )
+    rewritten, changes = rewrite_mobiledoc(mobiledoc)
+    document = json.loads(rewritten)
+    assert changes == 3
+    assert document["markups"][0][1][1] == "https://hackersandslackers.com"
+    assert document["cards"][0][1] == {
+        "src": "https://cdn.example.com/a.jpg",
+        "caption": "<em>Diagram</em>",
+        "alt": "Diagram",
+    }
+    assert document["sections"][0][2][0][3] == "Served over http://"
+
+
+def test_rewrite_html_secures_only_leading_schemes():
+    """Upgrade URLs (& `srcset` candidates) starting with `http://`, leaving URLs embedded in query strings."""
+    html = (
+        '<a href="https://x.com/?u=http://partner.com">a</a>'
+        '<a href="/go?to=http://partner.com">b</a>'
+        '<img alt="A" srcset="http://a.com/1.jpg 1x,http://a.com/2.jpg?f=http://b.com 2x, /3.jpg,http://c.com 3x">'
+    )
+    rewritten, rewriter = rewrite_html(html)
+    assert '<a href="https://x.com/?u=http://partner.com">a</a><a href="/go?to=http://partner.com">b</a>' in rewritten
+    assert 'srcset="https://a.com/1.jpg 1x,https://a.com/2.jpg?f=http://b.com 2x, /3.jpg,http://c.com 3x"' in rewritten
+    assert rewriter.upgraded_urls == 1
@@ -1,83 +1,123 @@
 """Methods for updating Ghost post content or metadata."""
 
-from typing import List, Optional, Tuple
-
-from fastapi import HTTPException
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 
+from app.posts.rewrite import rewrite_html, rewrite_mobiledoc
 from clients import ghost
+from config import settings
 from log import LOGGER
 
+POST_METADATA_FIELDS = {"id", "slug", "title", "custom_excerpt", "updated_at"}
+
 
-def update_mobiledoc(post_id: str, mobiledoc: str) -> Tuple[str, int]:
+def update_mobiledoc(post_id: str, mobiledoc: str) -> Optional[dict]:
     """
     Update Lynx post with proper embedded URLs.
 
     :param str post_id: ID of post to be updated.
     :param str mobiledoc: Mobiledoc encoded as string with escaped characters.
 
-    :returns: Tuple[str, int]
+    :returns: Optional[dict]
     """
     ghost_post = ghost.get_post(post_id)
+    if ghost_post is None:
+        return None
     body = {
         "posts": [
             {
                 "mobiledoc": mobiledoc,
-                "status": ghost_post.status,
-                "updated_at": ghost_post.updated_at,
+                "status": ghost_post["status"],
+                "updated_at": ghost_post["updated_at"],
             }
         ]
     }
     return ghost.update_post(ghost_post["id"], body, ghost_post["slug"])
 
 
-def bulk_update_post_metadata(post_dicts: List[Optional[dict]]) -> List[Optional[dict]]:
+def bulk_update_post_metadata(post_dicts: List[Optional[dict]], concurrency: Optional[int] = None) -> List[dict]:
     """
-    Update Ghost posts with bad or missing metadata (if applicable).
+    Update Ghost posts with bad or missing metadata (if applicable), several posts at a time.
 
     :param List[Optional[dict]] post_dicts: Ghost posts as list of dictionaries.
+    :param Optional[int] concurrency: Maximum number of posts to fetch & update simultaneously.
 
-    :returns: List[Optional[dict]]
+    :returns: List[dict]
+    """
+    post_dicts = [post_dict for post_dict in post_dicts or [] if post_dict is not None]
+    if not post_dicts:
+        LOGGER.info("No posts found to update metadata.")
+        return []
+    max_workers = min(concurrency or settings.GHOST_BULK_UPDATE_CONCURRENCY, len(post_dicts))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ghost-metadata") as executor:
+        outcomes = list(executor.map(update_post_metadata, post_dicts))
+    updated = [outcome for outcome in outcomes if outcome["status"] == "updated"]
+    LOGGER.info(f"Bulk metadata update finished: {len(updated)} of {len(outcomes)} posts updated.")
+    return outcomes
+
+
+def update_post_metadata(post_dict: dict) -> dict:
+    """
+    Set a Ghost post's meta, OG, and Twitter fields to match its title and excerpt.
+    Posts are only fetched from the Admin API when `post_dict` lacks the fields needed to build the update.
+
+    :param dict post_dict: Ghost post containing at least an `id`.
+
+    :returns: dict
     """
+    post_id = post_dict["id"]
     try:
-        if bool(post_dicts):
-            updated_posts = []
-            for post_dict in post_dicts:
-                post = ghost.get_post(post_dict["id"])
-                body = {
-                    "posts": [
-                        {
-                            "meta_title": post["title"],
-                            "og_title": post["title"],
-                            "twitter_title": post["title"],
-                            "meta_description": post["custom_excerpt"],
-                            "twitter_description": post["custom_excerpt"],
-                            "og_description": post["custom_excerpt"],
-                            "updated_at": post["updated_at"],
-                        }
-                    ]
+        post = post_dict if POST_METADATA_FIELDS.issubset(post_dict) else ghost.get_post(post_id)
+        if post is None:
+            # `get_post` also gives up on posts it could not fetch after exhausting rate-limit retries.
+            error = "Post could not be fetched from Ghost."
+            return {"id": post_id, "slug": post_dict.get("slug"), "status": "failed", "error": error}
+        body = {
+            "posts": [
+                {
+                    "meta_title": post["title"],
+                    "og_title": post["title"],
+                    "twitter_title": post["title"],
+                    "meta_description": post["custom_excerpt"],
+                    "twitter_description": post["custom_excerpt"],
+                    "og_description": post["custom_excerpt"],
+                    "updated_at": post["updated_at"],
                 }
-                post = ghost.update_post(post_dict["id"], body, post["slug"])
-                if post:
-                    updated_posts.append(post)
-            return updated_posts
-        raise HTTPException(status_code=422, detail="No posts found to update metadata.")
+            ]
+        }
+        if ghost.update_post(post_id, body, post["slug"]) is None:
+            return {"id": post_id, "slug": post["slug"], "status": "failed"}
+        return {"id": post_id, "slug": post["slug"], "status": "updated"}
     except Exception as e:
-        LOGGER.error(f"Error updating metadata: {e}")
+        LOGGER.error(f"Error updating metadata for post `{post_id}`: {e}")
+        return {"id": post_id, "slug": post_dict.get("slug"), "status": "failed", "error": str(e)}
 
 
-def update_html_ssl_urls(html: str, body: dict, slug: str) -> dict:
+def update_html_ssl_urls(
+    html: str, body: dict, slug: str, title: Optional[str] = None, mobiledoc: Optional[str] = None
+) -> dict:
     """
-    Replace hyperlinks in post with SSL equivalents.
+    Replace hyperlinks & image sources in post with SSL equivalents and populate missing image `alt` attributes.
 
     :param str html: Raw post html.
     :param dict body: JSON body representing Ghost post.
     :param str slug: Unique post identifier for logging purposes.
+    :param Optional[str] title: Post title, used to describe images with no better context.
+    :param Optional[str] mobiledoc: Post mobiledoc, rewritten alongside HTML when present.
 
     :returns: dict
     """
-    html = html.replace("http://", "https://")
-    body["posts"][0].update({"html": html})
-    LOGGER.info(f"Replaced unsecure URLs in post `{slug}`")
+    html, rewriter = rewrite_html(html, title=title)
+    if rewriter.changed:
+        body["posts"][0].update({"html": html})
+        LOGGER.info(
+            f"Secured {rewriter.upgraded_urls} URLs & added {rewriter.populated_alts} image `alt` attributes in post `{slug}`"
+        )
+    if mobiledoc:
+        mobiledoc, mobiledoc_changes = rewrite_mobiledoc(mobiledoc, title=title)
+        if mobiledoc_changes:
+            body["posts"][0].update({"mobiledoc": mobiledoc})
+            LOGGER.info(f"Applied {mobiledoc_changes} URL & image `alt` fixes to mobiledoc of post `{slug}`")
     return body
 
 
@@ -3,6 +3,7 @@
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 
+from app.cache import results
 from database import ghost_db
 from database.read_sql import collect_sql_queries
 from database.schemas import TagUpdate
@@ -23,6 +24,7 @@ async def update_tags_metadata(tag_update: TagUpdate) -> JSONResponse:
     :returns: JSONResponse
     """
     tag_update_queries = collect_sql_queries("tags")
-    update_results = ghost_db.execute_queries(tag_update_queries)
+    update_results = await ghost_db.execute_queries_async(tag_update_queries)
+    await results.invalidate("posts")
     LOGGER.success(f"Tag `{tag_update.current.slug}` updated; updated tag page metadata: {update_results}")
     return JSONResponse(update_results, status_code=200)
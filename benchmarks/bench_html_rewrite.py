@@ -0,0 +1,63 @@
+"""
+Benchmark single-pass post HTML rewriting on large synthetic articles.
+
+Usage: python -m benchmarks.bench_html_rewrite
+"""
+
+import tracemalloc
+from time import perf_counter
+from typing import Iterator
+
+from app.posts.rewrite import rewrite_html, rewrite_html_stream
+
+SECTION = (
+    "<h2>Section {i}</h2>"
+    '<p>Read <a href="http://example.com/{i}">the docs</a> or browse http://example.com/{i} directly.</p>'
+    "<pre><code>requests.get('http://localhost:{i}/')</code></pre>"
+    '<figure class="kg-card kg-image-card"><img src="http://cdn.example.com/{i}.jpg" class="kg-image">'
+    "<figcaption>Figure {i}</figcaption></figure>"
+    '<p><img src="https://cdn.example.com/inline-{i}.png" alt=""> Fish &amp; chips.</p>'
+)
+
+
+def synthetic_article(size_bytes: int) -> str:
+    """
+    Generate article HTML of roughly `size_bytes` bytes.
+
+    :param int size_bytes: Approximate size of article to generate.
+
+    :returns: str
+    """
+    sections, length, i = [], 0, 0
+    while length < size_bytes:
+        section = SECTION.format(i=i)
+        sections.append(section)
+        length += len(section)
+        i += 1
+    return "".join(sections)
+
+
+def chunked(html: str, chunk_size: int = 64 * 1024) -> Iterator[str]:
+    """Split article into chunks, as if read from a socket or file."""
+    for i in range(0, len(html), chunk_size):
+        yield html[i : i + chunk_size]
+
+
+def run():
+    """Report throughput of whole-document rewriting & peak memory of streaming rewriting."""
+    print(f"{'size':>8} | {'seconds':>8} | {'MB/s':>6} | {'stream peak KB':>14}")
+    for size_mb in (0.1, 1, 10):
+        html = synthetic_article(int(size_mb * 1024 * 1024))
+        start = perf_counter()
+        rewrite_html(html)
+        elapsed = perf_counter() - start
+        tracemalloc.start()
+        for _ in rewrite_html_stream(chunked(html)):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{size_mb:>6}MB | {elapsed:>8.3f} | {size_mb / elapsed:>6.1f} | {peak / 1024:>14.0f}")
+
+
+if __name__ == "__main__":
+    run()
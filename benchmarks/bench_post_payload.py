@@ -0,0 +1,52 @@
+"""
+Benchmark CPU time spent parsing ~500KB Ghost `post.edited` webhooks.
+
+Usage: python -m benchmarks.bench_post_payload
+"""
+
+import json
+from time import process_time
+
+from app.payloads import LeanPostUpdate
+from database.schemas import PostUpdate
+
+ITERATIONS = 200
+
+
+def synthetic_payload(size_bytes: int = 500 * 1024) -> bytes:
+    """
+    Build Ghost `post.edited` payload whose `current` & `previous` bodies total roughly `size_bytes`.
+
+    :param int size_bytes: Approximate size of payload.
+
+    :returns: bytes
+    """
+    post = dict(PostUpdate.model_config["json_schema_extra"]["current"])
+    body_size = size_bytes // 6
+    paragraph = "<p>Pandas 1.0 came out recently. Here's a <a href='https://pandas.pydata.org'>link</a>.</p>"
+    post["html"] = paragraph * (body_size // len(paragraph))
+    post["plaintext"] = "Pandas 1.0 came out recently. " * (body_size // 30)
+    post["mobiledoc"] = json.dumps({"version": "0.3.1", "cards": [["html", {"html": post["html"]}]]})
+    return json.dumps({"post": {"current": post, "previous": post}}).encode()
+
+
+def handler_fields(post_update) -> tuple:
+    """Access the fields webhook handlers read from a post update."""
+    post = post_update.post.current
+    return post.id, post.slug, post.title, post.custom_excerpt, post.feature_image, post.updated_at, post.authors
+
+
+def run():
+    """Report CPU time per webhook for full model validation vs. lean parsing."""
+    payload = synthetic_payload()
+    print(f"payload size: {len(payload) / 1024:.0f}KB, {ITERATIONS} iterations")
+    for name, parse in (("PostUpdate", PostUpdate.model_validate_json), ("LeanPostUpdate", LeanPostUpdate.from_json)):
+        start = process_time()
+        for _ in range(ITERATIONS):
+            handler_fields(parse(payload))
+        elapsed = process_time() - start
+        print(f"{name:>15}: {elapsed / ITERATIONS * 1000:.2f}ms CPU per webhook")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,58 @@
+"""
+Benchmark building the search suggestion index & prefix lookups over 1M synthetic queries.
+
+Usage: python -m benchmarks.bench_suggest
+"""
+
+import random
+from statistics import median, quantiles
+from time import perf_counter
+from typing import List
+
+from app.analytics.suggest import SuggestionIndex
+
+WORDS = [
+    "python", "pandas", "flask", "django", "sql", "mysql", "postgres", "docker", "api", "async",
+    "dataframe", "groupby", "lambda", "deploy", "nginx", "redis", "celery", "plotly", "dash", "scraping",
+    "regex", "json", "csv", "excel", "bigquery", "spark", "kafka", "airflow", "ghost", "jamstack",
+]  # fmt: skip
+
+
+def synthetic_searches(count: int, seed: int = 7) -> List[dict]:
+    """
+    Generate `count` distinct queries of 1-4 words with Zipf-like search counts.
+
+    :param int count: Number of distinct queries.
+    :param int seed: Seed of random generator.
+
+    :returns: List[dict]
+    """
+    rng = random.Random(seed)
+    queries = set()
+    while len(queries) < count:
+        words = rng.choices(WORDS, k=rng.randint(1, 4))
+        queries.add(f"{' '.join(words)} {rng.randrange(100000)}" if len(queries) > len(WORDS) ** 2 else " ".join(words))
+    return [{"search": query, "count": int(1000 / rng.paretovariate(1.2))} for query in queries]
+
+
+def run():
+    """Report index build time & lookup latency percentiles by prefix length."""
+    searches = synthetic_searches(1_000_000)
+    start = perf_counter()
+    index = SuggestionIndex(searches)
+    print(f"Built index of {len(index)} queries in {perf_counter() - start:.2f}s")
+    rng = random.Random(11)
+    print(f"{'prefix':>6} | {'p50 µs':>7} | {'p99 µs':>7} | {'max µs':>7}")
+    for length in (1, 2, 3, 5, 8, 12):
+        prefixes = [rng.choice(index.queries)[:length] for _ in range(2000)]
+        timings = []
+        for prefix in prefixes:
+            start = perf_counter()
+            index.suggest(prefix)
+            timings.append((perf_counter() - start) * 1e6)
+        p99 = quantiles(timings, n=100)[98]
+        print(f"{length:>6} | {median(timings):>7.1f} | {p99:>7.1f} | {max(timings):>7.1f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -25,6 +25,7 @@ ghost = Ghost(
     client_id=settings.GHOST_CLIENT_ID,
     client_secret=settings.GHOST_ADMIN_API_KEY,
     content_api_key=settings.GHOST_CONTENT_API_KEY,
+    max_retries=settings.GHOST_RATE_LIMIT_RETRIES,
 )
 
 # Twilio SMS
@@ -44,7 +45,7 @@ gbq = bigquery.Client(
 # Mailgun SMTP
 mailgun = Mailgun(
     settings.MAILGUN_EMAIL_SERVER,
-    settings.MAILGUN_FROM_SENDER_EMAIL,
+    f"{settings.MAILGUN_FROM_SENDER_NAME} <{settings.MAILGUN_FROM_SENDER_EMAIL}>",
     settings.MAILGUN_SENDER_API_KEY,
 )
 
@@ -4,9 +4,11 @@ from datetime import datetime as date
 from typing import List, Optional, Tuple
 
 import jwt
-import requests
+from requests import Response
 from requests.exceptions import HTTPError
 
+from clients.http import HttpClient
+from clients.http import http as shared_http
 from log import LOGGER
 
 
@@ -21,6 +23,8 @@ class Ghost:
         content_api_key: str,
         client_id: str,
         client_secret: str,
+        max_retries: int = 3,
+        http: Optional[HttpClient] = None,
     ):
         """
         Ghost Admin API client constructor.
@@ -31,6 +35,8 @@ class Ghost:
         :param str content_api_key: Content API key for self-hosted Ghost API.
         :param str client_id: Unique ID of Ghost admin client.
         :param str client_secret: Authentication secret of Ghost admin client.
+        :param int max_retries: Number of times to retry a request which was rate-limited by Ghost.
+        :param Optional[HttpClient] http: Client to send requests with; defaults to the shared outbound client.
         """
         self.admin_api_url = admin_api_url
         self.api_version = api_version
@@ -38,12 +44,14 @@ class Ghost:
         self.content_api_url = content_api_url
         self.secret = client_secret
         self.content_api_key = content_api_key
+        self.max_retries = max_retries
+        self.http = http or shared_http
 
     def _https_session(self) -> None:
         """Authorize HTTPS session with Ghost admin."""
         endpoint = f"{self.admin_api_url}/session/"
         headers = {"Authorization": self.session_token}
-        resp = requests.post(endpoint, headers=headers, timeout=20)
+        resp = self._request("POST", endpoint, headers=headers)
         LOGGER.info(f"Authorization resulted in status code {resp.status_code}.")
 
     @property
@@ -55,6 +63,17 @@ class Ghost:
         token = jwt.encode(payload, bytes.fromhex(self.secret), algorithm="HS256", headers=header)
         return token
 
+    def _request(self, method: str, endpoint: str, **kwargs) -> Response:
+        """
+        Send request to Ghost API via the shared HTTP client, which backs off & retries when Ghost rate-limits us.
+
+        :param str method: HTTP method of request.
+        :param str endpoint: Ghost API endpoint to request.
+
+        :returns: Response
+        """
+        return self.http.request(method, endpoint, max_retries=self.max_retries, **kwargs)
+
     def get_post(self, post_id: str) -> Optional[dict]:
         """
         Fetch Ghost post by ID.
@@ -73,7 +92,7 @@ class Ghost:
                 "formats": "mobiledoc,html",
             }
             endpoint = f"{self.admin_api_url}/posts/{post_id}/"
-            resp = requests.get(endpoint, headers=headers, params=params, timeout=20)
+            resp = self._request("GET", endpoint, headers=headers, params=params)
             if resp.json().get("errors") is not None and resp.json().get("posts") is not None:
                 LOGGER.error(f"Failed to fetch post `{post_id}`: {resp.json().get('errors')[0]['message']}")
             post = resp.json()["posts"][0]
@@ -104,7 +123,7 @@ class Ghost:
                 "formats": "mobiledoc",
             }
             endpoint = f"{self.admin_api_url}/posts/slug/{post_slug}/"
-            resp = requests.get(endpoint, headers=headers, params=params, timeout=20)
+            resp = self._request("GET", endpoint, headers=headers, params=params)
             post = resp.json()["posts"][0]
             LOGGER.info(f"Fetched Ghost post `{post['slug']}`")
             return post
@@ -127,7 +146,7 @@ class Ghost:
                 "Content-Type": "application/json",
             }
             endpoint = f"{self.admin_api_url}/pages"
-            resp = requests.get(endpoint, headers=headers, timeout=20)
+            resp = self._request("GET", endpoint, headers=headers)
             if resp.json().get("errors") is not None:
                 LOGGER.error(f"Failed to fetch Ghost pages: {resp.json().get('errors')[0]['message']}")
             LOGGER.info(f"Fetched {len(resp.json())} Ghost pages")
@@ -150,18 +169,19 @@ class Ghost:
         :returns: Optional[dict]
         """
         try:
-            resp = requests.put(
+            resp = self._request(
+                "PUT",
                 f"{self.admin_api_url}/posts/{post_id}/",
                 json=body,
                 headers={
-                    "Authorization": self.session_token,
+                    "Authorization": f"Ghost {self.session_token}",
                     "Content-Type": "application/json",
                 },
-                timeout=20,
             )
-            if resp.status_code != 200:
+            if resp.status_code == 200:
                 LOGGER.success(f"Successfully updated post `{slug}`")
                 return resp.json()
+            LOGGER.error(f"Failed to update post `{slug}` with status code {resp.status_code}: {resp.text}")
         except HTTPError as e:
             LOGGER.error(f"HTTPError while updating Ghost post: {e}")
         except Exception as e:
@@ -179,7 +199,7 @@ class Ghost:
                 "Authorization": f"Ghost {self.session_token}",
                 "Content-Type": "application/json",
             }
-            resp = requests.get(f"{self.admin_api_url}/users", params=params, headers=headers, timeout=20)
+            resp = self._request("GET", f"{self.admin_api_url}/users", params=params, headers=headers)
             if resp.status_code == 200:
                 return resp.json().get("users")
         except HTTPError as e:
@@ -200,11 +220,11 @@ class Ghost:
             headers = {
                 "Content-Type": "application/json",
             }
-            resp = requests.get(
+            resp = self._request(
+                "GET",
                 f"{self.content_api_url}/authors/{author_id}/",
                 params=params,
                 headers=headers,
-                timeout=20,
             )
             if resp.status_code == 200:
                 return resp.json()["authors"]
@@ -222,11 +242,11 @@ class Ghost:
         :returns: Optional[List[str]]
         """
         try:
-            resp = requests.post(
+            resp = self._request(
+                "POST",
                 f"{self.admin_api_url}/members/",
                 json=body,
                 headers={"Authorization": self.session_token},
-                timeout=20,
             )
             response = f'Successfully created new Ghost member `{body.get("email")}: {resp.json()}.'
             LOGGER.success(response)
@@ -250,7 +270,7 @@ class Ghost:
                 "filter": "type:post",
             }
             endpoint = f"{self.admin_api_url}/posts"
-            resp = requests.get(endpoint, headers=headers, params=params, timeout=20)
+            resp = self._request("GET", endpoint, headers=headers, params=params)
             if resp.status_code == 200:
                 posts = resp.json()["posts"]
                 return [post["url"] for post in posts if post["status"] == "published"]
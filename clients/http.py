@@ -0,0 +1,441 @@
+"""Shared client for outbound HTTP requests to third-party APIs."""
+
+import asyncio
+import random
+from threading import BoundedSemaphore, Lock
+from time import monotonic, sleep
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import httpx
+from requests import Response, Session
+from requests.adapters import HTTPAdapter
+from requests.exceptions import (
+    ConnectionError,
+    ConnectTimeout,
+    RequestException,
+    Timeout,
+)
+
+from config import settings
+from log import LOGGER
+
+# Methods which may be re-sent after a server error or dropped connection without repeating a side effect
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class CircuitOpenError(RequestException):
+    """Request refused without being sent, since recent requests to its host kept failing."""
+
+
+class HostBusyError(RequestException):
+    """Request refused without being sent, since too many requests to its host are already in flight."""
+
+
+class CircuitBreaker:
+    """
+    Stop sending requests to a host after consecutive failures, then let a single trial request through
+    once `reset_timeout` has passed; the circuit closes again when a trial succeeds.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        """
+        :param int failure_threshold: Consecutive failures which open the circuit.
+        :param float reset_timeout: Seconds the circuit stays open before a trial request is allowed.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = Lock()
+
+    @property
+    def state(self) -> str:
+        """
+        Current state of circuit: closed, open or half-open.
+
+        :returns: str
+        """
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if monotonic() - self.opened_at >= self.reset_timeout else "open"
+
+    def allow(self) -> bool:
+        """
+        Whether a request may be sent; only one trial request is allowed while half-open.
+
+        :returns: bool
+        """
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Close circuit after a successful request."""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def cancel_trial(self) -> None:
+        """Allow another trial request when one ended without a verdict on the host's health."""
+        with self._lock:
+            self._trial = False
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening (or re-opening) the circuit once failures reach the threshold."""
+        with self._lock:
+            self.failures += 1
+            self._trial = False
+            if self.failures >= self.failure_threshold:
+                self.opened_at = monotonic()
+
+
+class Host:
+    """Connection pool, concurrency cap, rate-limit cooldown & circuit breaker of a single host."""
+
+    def __init__(self, max_connections: int, failure_threshold: int, reset_timeout: float):
+        """
+        :param int max_connections: Maximum concurrent requests (& pooled connections) to host.
+        :param int failure_threshold: Consecutive failures which open the host's circuit.
+        :param float reset_timeout: Seconds the host's circuit stays open.
+        """
+        self.session = Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.slots = BoundedSemaphore(max_connections)
+        # Created upon first async request, so it's bound to the running event loop
+        self.async_slots: Optional[asyncio.Semaphore] = None
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.cooldown_until = 0.0
+        self.in_flight = 0
+        self._lock = Lock()
+
+
+class HttpClient:
+    """
+    Send requests through a pooled session per host, retrying rate-limited & failed requests with jittered
+    exponential backoff, capping concurrent requests per host & failing fast while a host's circuit is open.
+    """
+
+    def __init__(
+        self,
+        timeout: Tuple[float, float],
+        max_retries: int,
+        backoff: float,
+        max_backoff: float,
+        max_connections: int,
+        failure_threshold: int,
+        reset_timeout: float,
+    ):
+        """
+        :param Tuple[float, float] timeout: Seconds to wait to connect to & read from a host, per attempt.
+        :param int max_retries: Retries of a request after a 429, 5xx or connection error.
+        :param float backoff: Base delay in seconds between retries, doubled per retry.
+        :param float max_backoff: Maximum delay in seconds between retries.
+        :param int max_connections: Maximum concurrent requests per host.
+        :param int failure_threshold: Consecutive failures which open a host's circuit.
+        :param float reset_timeout: Seconds a host's circuit stays open.
+        """
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_connections = max_connections
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.hosts: Dict[str, Host] = {}
+        self._hosts_lock = Lock()
+
+    def host(self, url: str) -> Host:
+        """
+        Get (or create) state of the host a URL points to.
+
+        :param str url: URL of request.
+
+        :returns: Host
+        """
+        netloc = urlsplit(url).netloc
+        with self._hosts_lock:
+            if netloc not in self.hosts:
+                self.hosts[netloc] = Host(self.max_connections, self.failure_threshold, self.reset_timeout)
+            return self.hosts[netloc]
+
+    def request(self, method: str, url: str, max_retries: Optional[int] = None, **kwargs) -> Response:
+        """
+        Send request, retrying 429s (any method) & 5xx or connection errors (idempotent methods only).
+
+        :param str method: HTTP method of request.
+        :param str url: URL to request.
+        :param Optional[int] max_retries: Retries of this request, overriding the client's default.
+
+        :returns: Response
+        """
+        method = method.upper()
+        max_retries = self.max_retries if max_retries is None else max_retries
+        kwargs.setdefault("timeout", self.timeout)
+        host = self.host(url)
+        netloc = urlsplit(url).netloc
+        attempt = 0
+        while True:
+            try:
+                resp = self._send(host, netloc, method, url, **kwargs)
+            except (ConnectionError, Timeout) as e:
+                # Requests which never connected were never received, so are safe to re-send whatever their method
+                if attempt >= max_retries or not (method in IDEMPOTENT_METHODS or isinstance(e, ConnectTimeout)):
+                    raise
+                attempt += 1
+                delay = self._backoff(attempt)
+                LOGGER.warning(
+                    f"{type(e).__name__} from `{netloc}`; retrying in {delay:.2f}s ({attempt}/{max_retries})."
+                )
+                sleep(delay)
+                continue
+            if not self._retryable(method, resp) or attempt >= max_retries:
+                return resp
+            attempt += 1
+            sleep(self._retry_delay(host, method, url, resp, attempt, max_retries))
+
+    async def request_async(
+        self, client: httpx.AsyncClient, method: str, url: str, max_retries: Optional[int] = None, **kwargs
+    ) -> httpx.Response:
+        """
+        Send request with an async client under the same per-host policy as `request`, sharing each host's
+        circuit breaker & rate-limit cooldown with threaded requests.
+
+        :param httpx.AsyncClient client: Async client holding the connection pool to send request with.
+        :param str method: HTTP method of request.
+        :param str url: URL to request.
+        :param Optional[int] max_retries: Retries of this request, overriding the client's default.
+
+        :returns: httpx.Response
+        """
+        method = method.upper()
+        max_retries = self.max_retries if max_retries is None else max_retries
+        kwargs.setdefault("timeout", httpx.Timeout(self.timeout[1], connect=self.timeout[0]))
+        host = self.host(url)
+        netloc = urlsplit(url).netloc
+        attempt = 0
+        while True:
+            try:
+                resp = await self._send_async(client, host, netloc, method, url, **kwargs)
+            except httpx.TransportError as e:
+                never_sent = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                if attempt >= max_retries or not (method in IDEMPOTENT_METHODS or never_sent):
+                    raise
+                attempt += 1
+                delay = self._backoff(attempt)
+                LOGGER.warning(
+                    f"{type(e).__name__} from `{netloc}`; retrying in {delay:.2f}s ({attempt}/{max_retries})."
+                )
+                await asyncio.sleep(delay)
+                continue
+            if not self._retryable(method, resp) or attempt >= max_retries:
+                return resp
+            attempt += 1
+            await asyncio.sleep(self._retry_delay(host, method, url, resp, attempt, max_retries))
+
+    def get(self, url: str, **kwargs) -> Response:
+        """
+        Send GET request.
+
+        :param str url: URL to request.
+
+        :returns: Response
+        """
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> Response:
+        """
+        Send POST request.
+
+        :param str url: URL to request.
+
+        :returns: Response
+        """
+        return self.request("POST", url, **kwargs)
+
+    def _send(self, host: Host, netloc: str, method: str, url: str, **kwargs) -> Response:
+        """
+        Send a single attempt of a request once any rate-limit cooldown has elapsed & the host has a free slot,
+        recording the outcome with the host's circuit breaker.
+
+        :param Host host: State of host being requested.
+        :param str netloc: Host (& port) being requested.
+        :param str method: HTTP method of request.
+        :param str url: URL to request.
+
+        :returns: Response
+        """
+        remaining = host.cooldown_until - monotonic()
+        if remaining > 0:
+            sleep(remaining)
+        if not host.slots.acquire(timeout=self.timeout[0]):
+            raise HostBusyError(f"{self.max_connections} requests to `{netloc}` already in flight.")
+        try:
+            if not host.breaker.allow():
+                raise CircuitOpenError(f"Circuit open for `{netloc}` after {host.breaker.failures} failures.")
+            with host._lock:
+                host.in_flight += 1
+            try:
+                resp = host.session.request(method, url, **kwargs)
+            except (ConnectionError, Timeout):
+                host.breaker.record_failure()
+                raise
+            except Exception:
+                host.breaker.cancel_trial()
+                raise
+            finally:
+                with host._lock:
+                    host.in_flight -= 1
+            if resp.status_code >= 500:
+                host.breaker.record_failure()
+            else:
+                host.breaker.record_success()
+            return resp
+        finally:
+            host.slots.release()
+
+    async def _send_async(
+        self, client: httpx.AsyncClient, host: Host, netloc: str, method: str, url: str, **kwargs
+    ) -> httpx.Response:
+        """
+        Async equivalent of `_send`, capping concurrent async requests to the host with its own semaphore.
+
+        :param httpx.AsyncClient client: Async client to send request with.
+        :param Host host: State of host being requested.
+        :param str netloc: Host (& port) being requested.
+        :param str method: HTTP method of request.
+        :param str url: URL to request.
+
+        :returns: httpx.Response
+        """
+        remaining = host.cooldown_until - monotonic()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        if host.async_slots is None:
+            host.async_slots = asyncio.Semaphore(self.max_connections)
+        try:
+            await asyncio.wait_for(host.async_slots.acquire(), timeout=self.timeout[0])
+        except asyncio.TimeoutError:
+            raise HostBusyError(f"{self.max_connections} requests to `{netloc}` already in flight.") from None
+        try:
+            if not host.breaker.allow():
+                raise CircuitOpenError(f"Circuit open for `{netloc}` after {host.breaker.failures} failures.")
+            with host._lock:
+                host.in_flight += 1
+            try:
+                resp = await client.request(method, url, **kwargs)
+            except httpx.PoolTimeout:
+                # Waiting on a free connection of our own pool says nothing of the host's health
+                host.breaker.cancel_trial()
+                raise
+            except httpx.TransportError:
+                host.breaker.record_failure()
+                raise
+            except BaseException:
+                host.breaker.cancel_trial()
+                raise
+            finally:
+                with host._lock:
+                    host.in_flight -= 1
+            if resp.status_code >= 500:
+                host.breaker.record_failure()
+            else:
+                host.breaker.record_success()
+            return resp
+        finally:
+            host.async_slots.release()
+
+    @staticmethod
+    def _retryable(method: str, resp: Union[Response, httpx.Response]) -> bool:
+        """
+        Whether a response may be retried: 429s for any method, 5xx for idempotent methods only.
+
+        :param str method: HTTP method of request.
+        :param Union[Response, httpx.Response] resp: Response to request.
+
+        :returns: bool
+        """
+        return resp.status_code == 429 or (resp.status_code >= 500 and method in IDEMPOTENT_METHODS)
+
+    def _retry_delay(
+        self, host: Host, method: str, url: str, resp: Union[Response, httpx.Response], attempt: int, max_retries: int
+    ) -> float:
+        """
+        Delay before retrying a response, holding back all requests to the host after a 429.
+
+        :param Host host: State of host being requested.
+        :param str method: HTTP method of request.
+        :param str url: URL requested.
+        :param Union[Response, httpx.Response] resp: Retryable response.
+        :param int attempt: Number of retry about to be made.
+        :param int max_retries: Retries allowed for the request.
+
+        :returns: float
+        """
+        delay = self._retry_after(resp) if resp.status_code == 429 else None
+        delay = self._backoff(attempt) if delay is None else delay
+        if resp.status_code == 429:
+            host.cooldown_until = max(host.cooldown_until, monotonic() + delay)
+        LOGGER.warning(
+            f"`{urlsplit(url).netloc}` responded {resp.status_code} to {method} {urlsplit(url).path}; "
+            f"retrying in {delay:.2f}s ({attempt}/{max_retries})."
+        )
+        return delay
+
+    def _backoff(self, attempt: int) -> float:
+        """
+        Delay before a retry with "full jitter": uniformly random up to the exponential backoff of the attempt.
+
+        :param int attempt: Number of retry about to be made.
+
+        :returns: float
+        """
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+    def _retry_after(self, resp: Union[Response, httpx.Response]) -> Optional[float]:
+        """
+        Delay requested by a rate-limited response's `Retry-After` header, capped at the maximum backoff.
+
+        :param Union[Response, httpx.Response] resp: Rate-limited response.
+
+        :returns: Optional[float]
+        """
+        retry_after = resp.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        return None
+
+    def stats(self) -> Dict[str, dict]:
+        """
+        Report circuit state, consecutive failures & requests in flight per host.
+
+        :returns: Dict[str, dict]
+        """
+        return {
+            netloc: {
+                "circuit": host.breaker.state,
+                "failures": host.breaker.failures,
+                "in_flight": host.in_flight,
+            }
+            for netloc, host in sorted(self.hosts.items())
+        }
+
+
+http = HttpClient(
+    timeout=(settings.HTTP_CONNECT_TIMEOUT, settings.HTTP_READ_TIMEOUT),
+    max_retries=settings.HTTP_MAX_RETRIES,
+    backoff=settings.HTTP_BACKOFF,
+    max_backoff=settings.HTTP_MAX_BACKOFF,
+    max_connections=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+    failure_threshold=settings.HTTP_CIRCUIT_FAILURES,
+    reset_timeout=settings.HTTP_CIRCUIT_RESET,
+)
@@ -1,25 +1,67 @@
 """Create Mailgun client."""
 
-from typing import List
+import asyncio
+import json
+from typing import Dict, List, Optional
 
-import requests
-from requests import HTTPError, Response
+from httpx import AsyncBaseTransport, AsyncClient, HTTPError, Limits, Response
+from requests import RequestException
 
+from clients.http import HttpClient
+from clients.http import http as shared_http
 from log import LOGGER
 
+# Most recipients Mailgun accepts in a single batch send
+MAILGUN_BATCH_LIMIT = 1000
+
 
 class Mailgun:
-    """Mailgun email client."""
+    """
+    Async Mailgun email client, reusing pooled connections across sends & sending through the per-host retries,
+    concurrency cap & circuit breaker of the shared outbound HTTP client.
+    """
 
-    def __init__(self, mail_server: str, from_address: str, api_key: str):
+    def __init__(
+        self,
+        mail_server: str,
+        from_address: str,
+        api_key: str,
+        http: Optional[HttpClient] = None,
+        transport: Optional[AsyncBaseTransport] = None,
+    ):
         self.mail_server = mail_server
         self.from_address = from_address
         self.api_key = api_key
+        self.http = http or shared_http
+        self.transport = transport
         self.endpoint = f"https://api.mailgun.net/v3/{self.mail_server}/messages"
+        self._client: Optional[AsyncClient] = None
+
+    @property
+    def client(self) -> AsyncClient:
+        """
+        Pooled HTTP client, created upon first send so it's bound to the running event loop.
 
-    def send_email(self, body: dict, test_mode=False) -> Response:
+        :returns: AsyncClient
         """
-        Send email via Mailgun.
+        if self._client is None or self._client.is_closed:
+            max_connections = self.http.max_connections
+            self._client = AsyncClient(
+                auth=("api", self.api_key),
+                limits=Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+                transport=self.transport,
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def send_email(self, body: dict, test_mode=False) -> Optional[Response]:
+        """
+        Send email via Mailgun, retrying rate-limited sends & those which failed to connect.
 
         :param dict body: Properties of outbound email.
         :param bool test_mode: Flag to indicate email is being sent for test purposes.
@@ -29,17 +71,42 @@ class Mailgun:
         try:
             if test_mode is True:
                 body.update({"o:testmode": True})
-            return requests.post(
-                self.endpoint,
-                auth=("api", self.api_key),
-                data=body,
-            )
-        except HTTPError as e:
+            return await self.http.request_async(self.client, "POST", self.endpoint, data=body)
+        except (HTTPError, RequestException) as e:
             LOGGER.error(f"HTTPError error while sending email to `{body['to']}` subject `{body['subject']}`: {e}")
         except Exception as e:
             LOGGER.error(f"Unexpected error while sending email to `{body['to']}` subject `{body['subject']}`: {e}")
 
-    def email_notification_new_comment(self, post: dict, recipient: List[str], comment: dict, test_mode=False) -> dict:
+    async def send_batch(self, body: dict, recipients: Dict[str, dict], test_mode=False) -> List[Optional[Response]]:
+        """
+        Send an email to many recipients with Mailgun's batch sending, where each recipient receives their own copy
+        personalized by their `recipient-variables`. Batches over Mailgun's limit are split & sent concurrently.
+
+        :param dict body: Properties of outbound email, excluding recipients.
+        :param Dict[str, dict] recipients: Variables of each recipient, keyed by email address.
+        :param bool test_mode: Flag to indicate email is being sent for test purposes.
+
+        :returns: List[Optional[Response]]
+        """
+        addresses = list(recipients)
+        batches = [addresses[i : i + MAILGUN_BATCH_LIMIT] for i in range(0, len(addresses), MAILGUN_BATCH_LIMIT)]
+        return await asyncio.gather(
+            *(
+                self.send_email(
+                    {
+                        **body,
+                        "to": batch,
+                        "recipient-variables": json.dumps({address: recipients[address] for address in batch}),
+                    },
+                    test_mode,
+                )
+                for batch in batches
+            )
+        )
+
+    async def email_notification_new_comment(
+        self, post: dict, recipient: List[str], comment: dict, test_mode=False
+    ) -> dict:
         """
         Notify author when a user comments on a post.
 
@@ -59,8 +126,8 @@ class Mailgun:
             "o:tracking-clicks": True,
             "text": f"Your post `{post['title']}` received a comment. {comment.get('user_name')} says: \n\n{comment.get('body')} \n\nSee the comment here: {post['url'].replace('.app', '.com')}",
         }
-        email_response = self.send_email(body, test_mode)
-        if email_response.status_code == 200:
+        email_response = await self.send_email(body, test_mode)
+        if email_response is not None and email_response.status_code == 200:
             LOGGER.success(f"Successfully send comment notification to {recipient}: {body}")
             return {
                 "status": {
@@ -71,14 +138,15 @@ class Mailgun:
                 "email": body,
             }
         else:
+            error = email_response.json() if email_response is not None else "Request to Mailgun failed."
             LOGGER.error(
-                f"Failed to send comment notification to {recipient} with error {email_response.status_code} ({email_response.json()}): {body}"
+                f"Failed to send comment notification to {recipient} with error {getattr(email_response, 'status_code', None)} ({error}): {body}"
             )
             return {
                 "status": {
                     "sent": False,
-                    "code": email_response.status_code,
-                    "error": email_response.json(),
+                    "code": getattr(email_response, "status_code", None),
+                    "error": error,
                 },
                 "email": body,
             }
@@ -24,7 +24,7 @@ def ghost() -> Ghost:
 def mailgun() -> Mailgun:
     return Mailgun(
         settings.MAILGUN_EMAIL_SERVER,
-        settings.MAILGUN_FROM_SENDER_EMAIL,
+        f"{settings.MAILGUN_FROM_SENDER_NAME} <{settings.MAILGUN_FROM_SENDER_EMAIL}>",
         settings.MAILGUN_SENDER_API_KEY,
     )
 
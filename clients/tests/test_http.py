@@ -0,0 +1,126 @@
+"""Test retries, backoff & circuit breaking of the shared outbound HTTP client."""
+
+import asyncio
+
+import httpx
+import pytest
+from requests import Response
+from requests.exceptions import ConnectTimeout
+
+from clients import http as http_module
+from clients.http import CircuitOpenError, HttpClient
+
+URL = "https://api.example.com/stats"
+
+
+def stub_response(status_code: int, headers: dict = None) -> Response:
+    """Response with a status code & headers but no body."""
+    resp = Response()
+    resp.status_code = status_code
+    resp.headers.update(headers or {})
+    return resp
+
+
+@pytest.fixture
+def client(monkeypatch) -> HttpClient:
+    """Client which doesn't sleep between retries."""
+
+    async def no_sleep(seconds):
+        pass
+
+    monkeypatch.setattr(http_module, "sleep", lambda seconds: None)
+    monkeypatch.setattr(http_module.asyncio, "sleep", no_sleep)
+    return HttpClient(
+        timeout=(1, 1),
+        max_retries=2,
+        backoff=0.1,
+        max_backoff=1,
+        max_connections=2,
+        failure_threshold=3,
+        reset_timeout=60,
+    )
+
+
+def respond_with(client: HttpClient, *outcomes) -> list:
+    """Make the host of `URL` answer with each outcome in turn, recording the methods it receives."""
+    received, outcomes = [], list(outcomes)
+
+    def request(method, url, **kwargs):
+        received.append(method)
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return stub_response(*outcome)
+
+    client.host(URL).session.request = request
+    return received
+
+
+def test_retries_idempotent_requests_on_server_errors(client):
+    """Retry GETs after 5xx responses & connect timeouts, but never re-send a POST the server may have processed."""
+    received = respond_with(client, (503,), ConnectTimeout(), (200,))
+    assert client.get(URL).status_code == 200
+    assert received == ["GET", "GET", "GET"]
+
+    received = respond_with(client, (502,), (200,))
+    assert client.post(URL).status_code == 502
+    assert received == ["POST"]
+
+
+def test_retries_rate_limited_requests_after_cooldown(client):
+    """Retry any method after a 429, holding back other requests to the host until `Retry-After` elapses."""
+    received = respond_with(client, (429, {"Retry-After": "30"}), (201,))
+    assert client.post(URL).status_code == 201
+    assert received == ["POST", "POST"]
+    assert client.host(URL).cooldown_until > 0
+
+
+def test_circuit_opens_after_consecutive_failures(client, monkeypatch):
+    """Fail fast once failures reach the threshold, then close the circuit after a successful trial request."""
+    respond_with(client, (500,), (500,), (500,))
+    assert client.get(URL).status_code == 500
+    assert client.stats()["api.example.com"]["circuit"] == "open"
+    with pytest.raises(CircuitOpenError):
+        client.get(URL)
+
+    opened_at = client.host(URL).breaker.opened_at
+    monkeypatch.setattr(http_module, "monotonic", lambda: opened_at + 61)
+    received = respond_with(client, (200,))
+    assert client.get(URL).status_code == 200
+    assert received == ["GET"]
+    assert client.stats()["api.example.com"] == {"circuit": "closed", "failures": 0, "in_flight": 0}
+
+
+def request_async(client: HttpClient, method: str, *outcomes) -> tuple:
+    """Send a request with an async client whose host answers with each outcome in turn."""
+    received, outcomes = [], list(outcomes)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        received.append(request.method)
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(*outcome)
+
+    async def send():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as async_client:
+            return await client.request_async(async_client, method, URL)
+
+    return asyncio.run(send()), received
+
+
+def test_async_requests_share_host_policy(client):
+    """Retry async POSTs only when rate limited or never connected, tripping the host's circuit on failures."""
+    resp, received = request_async(client, "POST", httpx.ConnectError("refused"), (429,), (200,))
+    assert resp.status_code == 200
+    assert received == ["POST", "POST", "POST"]
+
+    resp, received = request_async(client, "POST", (503,), (200,))
+    assert resp.status_code == 503
+    assert received == ["POST"]
+
+    with pytest.raises(CircuitOpenError):
+        request_async(client, "GET", (500,), (500,))
+    assert client.stats()["api.example.com"] == {"circuit": "open", "failures": 3, "in_flight": 0}
+    with pytest.raises(CircuitOpenError):
+        client.get(URL)
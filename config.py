@@ -50,6 +50,34 @@ class Settings(BaseSettings):
     SQLALCHEMY_DATABASE_PEM: str = getenv("SQLALCHEMY_DATABASE_PEM")
     SQLALCHEMY_TRACK_MODIFICATIONS: bool = False
     SQLALCHEMY_ENGINE_OPTIONS: dict = {"ssl": {"key": SQLALCHEMY_DATABASE_PEM}}
+    SQLALCHEMY_POOL_SIZE: int = int(getenv("SQLALCHEMY_POOL_SIZE", "5"))
+    SQLALCHEMY_MAX_OVERFLOW: int = int(getenv("SQLALCHEMY_MAX_OVERFLOW", "5"))
+    SQLALCHEMY_ASYNC_POOL_SIZE: int = int(getenv("SQLALCHEMY_ASYNC_POOL_SIZE", "3"))
+    SQLALCHEMY_ASYNC_MAX_OVERFLOW: int = int(getenv("SQLALCHEMY_ASYNC_MAX_OVERFLOW", "2"))
+    SQLALCHEMY_POOL_TIMEOUT: int = int(getenv("SQLALCHEMY_POOL_TIMEOUT", "30"))
+    SQLALCHEMY_POOL_RECYCLE: int = int(getenv("SQLALCHEMY_POOL_RECYCLE", "1800"))
+    SQLALCHEMY_POOL_PRE_PING: bool = getenv("SQLALCHEMY_POOL_PRE_PING", "true").lower() == "true"
+    SQLALCHEMY_SLOW_QUERY_MS: float = float(getenv("SQLALCHEMY_SLOW_QUERY_MS", "500"))
+    SQLALCHEMY_SKIP_UNAFFECTED_QUERIES: bool = getenv("SQLALCHEMY_SKIP_UNAFFECTED_QUERIES", "true").lower() == "true"
+    SQLALCHEMY_UPDATE_BATCH_SIZE: int = int(getenv("SQLALCHEMY_UPDATE_BATCH_SIZE", "500"))
+    SQLALCHEMY_UPDATE_BATCH_PAUSE: float = float(getenv("SQLALCHEMY_UPDATE_BATCH_PAUSE", "0.1"))
+    SQLALCHEMY_INSERT_CHUNK_SIZE: int = int(getenv("SQLALCHEMY_INSERT_CHUNK_SIZE", "5000"))
+    SQLALCHEMY_LOAD_DATA_LOCAL_INFILE: bool = getenv("SQLALCHEMY_LOAD_DATA_LOCAL_INFILE", "false").lower() == "true"
+
+    # Read endpoint result cache
+    # `local` caches are per worker: writes only invalidate the worker handling them, so other workers may serve
+    # stale results until their entries expire. Under multiple workers (`WEB_CONCURRENCY`, read by uvicorn as its
+    # default `--workers`) local entries expire after `RESULT_CACHE_LOCAL_TTL` instead; use `sql` to share a cache.
+    RESULT_CACHE_BACKEND: str = getenv("RESULT_CACHE_BACKEND", "local")  # `local` or `sql`
+    RESULT_CACHE_TTL: int = int(getenv("RESULT_CACHE_TTL", "300"))
+    RESULT_CACHE_LOCAL_TTL: int = int(getenv("RESULT_CACHE_LOCAL_TTL", "15"))
+    WEB_CONCURRENCY: int = int(getenv("WEB_CONCURRENCY", "1"))
+    RESULT_CACHE_SIZE: int = int(getenv("RESULT_CACHE_SIZE", "256"))
+
+    # Webhook idempotency
+    WEBHOOK_IDEMPOTENCY_TTL: int = int(getenv("WEBHOOK_IDEMPOTENCY_TTL", "86400"))
+    WEBHOOK_IDEMPOTENCY_CACHE_SIZE: int = int(getenv("WEBHOOK_IDEMPOTENCY_CACHE_SIZE", "1024"))
+    WEBHOOK_LEAN_PARSING: bool = getenv("WEBHOOK_LEAN_PARSING", "true").lower() == "true"
 
     # Algolia API
     ALGOLIA_SEARCHES_ENDPOINT: str = "https://analytics.algolia.com/2/searches"
@@ -57,6 +85,10 @@ class Settings(BaseSettings):
     ALGOLIA_API_KEY: str = getenv("ALGOLIA_API_KEY")
     ALGOLIA_TABLE_WEEKLY: str = "algolia_searches_week"
     ALGOLIA_TABLE_MONTHLY: str = "algolia_searches_month"
+    # Seconds before each worker rebuilds its search suggestion index from the stored Algolia tables
+    SEARCH_SUGGESTIONS_TTL: int = int(getenv("SEARCH_SUGGESTIONS_TTL", "3600"))
+    # Weight of the past week's searches relative to the rest of the month's when ranking suggestions (1 = no boost)
+    SEARCH_SUGGESTIONS_RECENCY_WEIGHT: float = float(getenv("SEARCH_SUGGESTIONS_RECENCY_WEIGHT", "1.0"))
 
     # Google Cloud Auth
     GCP_PROJECT_NAME: str = getenv("GCP_PROJECT_NAME")
@@ -67,15 +99,46 @@ class Settings(BaseSettings):
     GCP_BIGQUERY_TABLE: str = getenv("GCP_BIGQUERY_TABLE")
     GCP_BIGQUERY_DATASET: str = getenv("GCP_BIGQUERY_DATASET")
     GCP_BIGQUERY_URI: str = f"bigquery://{GCP_PROJECT_NAME}/{GCP_BIGQUERY_DATASET}"
+    # Read query results via the BigQuery Storage Read API when `google-cloud-bigquery-storage` is installed
+    GCP_BIGQUERY_STORAGE_API: bool = getenv("GCP_BIGQUERY_STORAGE_API", "true").lower() == "true"
+    # Append new days of page views to `daily_page_views` & roll windows up locally instead of rescanning each window
+    ANALYTICS_INCREMENTAL: bool = getenv("ANALYTICS_INCREMENTAL", "true").lower() == "true"
+    ANALYTICS_RETENTION_DAYS: int = int(getenv("ANALYTICS_RETENTION_DAYS", "365"))
+    # Most recent imported days to fetch visits & bounces for from Plausible (one API request per day)
+    ANALYTICS_BOUNCE_DAYS: int = int(getenv("ANALYTICS_BOUNCE_DAYS", "30"))
 
     # Google Cloud storage
     GCP_BUCKET_URL: str = getenv("GCP_BUCKET_URL")
     GCP_BUCKET_NAME: str = getenv("GCP_BUCKET_NAME")
     GCP_BUCKET_FOLDER: list = [f'{dt.year}/{dt.strftime("%m")}']
 
+    # Outbound HTTP requests to third-party APIs: timeouts & retries per attempt, caps & circuit breakers per host
+    HTTP_CONNECT_TIMEOUT: float = float(getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+    HTTP_READ_TIMEOUT: float = float(getenv("HTTP_READ_TIMEOUT", "10"))
+    HTTP_MAX_RETRIES: int = int(getenv("HTTP_MAX_RETRIES", "2"))
+    HTTP_BACKOFF: float = float(getenv("HTTP_BACKOFF", "0.5"))
+    HTTP_MAX_BACKOFF: float = float(getenv("HTTP_MAX_BACKOFF", "8"))
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = int(getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "8"))
+    HTTP_CIRCUIT_FAILURES: int = int(getenv("HTTP_CIRCUIT_FAILURES", "5"))
+    HTTP_CIRCUIT_RESET: float = float(getenv("HTTP_CIRCUIT_RESET", "30"))
+
+    # Notification outbox: sender workers per API worker, polling & retries of queued SMS notifications
+    NOTIFICATION_WORKERS: int = int(getenv("NOTIFICATION_WORKERS", "2"))
+    NOTIFICATION_POLL_INTERVAL: float = float(getenv("NOTIFICATION_POLL_INTERVAL", "5"))
+    NOTIFICATION_BATCH_SIZE: int = int(getenv("NOTIFICATION_BATCH_SIZE", "10"))
+    NOTIFICATION_LEASE: int = int(getenv("NOTIFICATION_LEASE", "120"))
+    NOTIFICATION_MAX_ATTEMPTS: int = int(getenv("NOTIFICATION_MAX_ATTEMPTS", "5"))
+    NOTIFICATION_BACKOFF: float = float(getenv("NOTIFICATION_BACKOFF", "10"))
+    NOTIFICATION_MAX_BACKOFF: float = float(getenv("NOTIFICATION_MAX_BACKOFF", "600"))
+    # Seconds non-priority notifications are held to be sent as one digest per channel (0 to send immediately)
+    NOTIFICATION_DIGEST_WINDOW: int = int(getenv("NOTIFICATION_DIGEST_WINDOW", "300"))
+    NOTIFICATION_DIGEST_MAX_LENGTH: int = int(getenv("NOTIFICATION_DIGEST_MAX_LENGTH", "1600"))
+
     # Plausible Analytics
     PLAUSIBLE_STATS_ENDPOINT: str = "https://plausible.io/api/v1/stats/breakdown"
     PLAUSIBLE_API_TOKEN: str = getenv("PLAUSIBLE_API_TOKEN")
+    # Seconds between refreshes of stored top pages by each worker's background task (0 to disable)
+    PLAUSIBLE_REFRESH_INTERVAL: int = int(getenv("PLAUSIBLE_REFRESH_INTERVAL", "3600"))
 
     # Ghost
     GHOST_API_VERSION: str = "v3.0"
@@ -90,6 +153,9 @@ class Settings(BaseSettings):
     GHOST_API_EXPORT_URL: str = f"{GHOST_BASE_URL}/admin/db/"
 
     GHOST_ADMIN_USER_ID: str = "1"
+    GHOST_BULK_UPDATE_CONCURRENCY: int = int(getenv("GHOST_BULK_UPDATE_CONCURRENCY", "8"))
+    GHOST_RATE_LIMIT_RETRIES: int = int(getenv("GHOST_RATE_LIMIT_RETRIES", "3"))
+    GHOST_METADATA_WRITE_MODE: str = getenv("GHOST_METADATA_WRITE_MODE", "api")  # `api` or `sql`
 
     # Mailgun
     MAILGUN_EMAIL_SERVER: str = getenv("MAILGUN_EMAIL_SERVER")
@@ -100,6 +166,9 @@ class Settings(BaseSettings):
     MAILGUN_PERSONAL_EMAIL: str = getenv("MAILGUN_PERSONAL_EMAIL")
     MAILGUN_PASSWORD: str = getenv("MAILGUN_PASSWORD")
     MAILGUN_SUBJECT_LINE: str = "To Hack or to Slack; That is the Question."
+    # Welcome emails to subscribers signing up within this many seconds are sent in one batch (0 to send at once)
+    MAILGUN_BATCH_WINDOW: float = float(getenv("MAILGUN_BATCH_WINDOW", "0.25"))
+    MAILGUN_BATCH_SIZE: int = int(getenv("MAILGUN_BATCH_SIZE", "1000"))
 
     MAILGUN_CONF: ConnectionConfig = ConnectionConfig(
         MAIL_USERNAME="api",
@@ -1,22 +1,32 @@
 """Initialize custom Database clients for direct read/write access."""
 
-from sqlalchemy import create_engine
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-from config import Settings, settings
+from config import settings
 
+from .engines import get_async_engine, get_engine
 from .sql_db import Database
 
 # Create SQL Engine
-engine = create_engine(
-    f"{settings.SQLALCHEMY_DATABASE_URI}/{settings.SQLALCHEMY_FEATURES_DATABASE_NAME}",
-    connect_args=settings.SQLALCHEMY_ENGINE_OPTIONS,
-    echo=False,
+engine = get_engine(
+    settings.SQLALCHEMY_DATABASE_URI,
+    settings.SQLALCHEMY_FEATURES_DATABASE_NAME,
+    settings.SQLALCHEMY_ENGINE_OPTIONS,
+)
+
+async_engine = get_async_engine(
+    settings.SQLALCHEMY_DATABASE_URI,
+    settings.SQLALCHEMY_FEATURES_DATABASE_NAME,
+    settings.SQLALCHEMY_ENGINE_OPTIONS,
 )
 
 # Create SQL Session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
@@ -30,16 +40,22 @@ def get_db():
         ses.close()
 
 
+# Async database session dependency
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as ses:
+        yield ses
+
+
 # Ghost database connection
 ghost_db = Database(
-    uri=Settings().SQLALCHEMY_DATABASE_URI,
-    db_name=Settings().SQLALCHEMY_GHOST_DATABASE_NAME,
-    args=Settings().SQLALCHEMY_ENGINE_OPTIONS,
+    uri=settings.SQLALCHEMY_DATABASE_URI,
+    db_name=settings.SQLALCHEMY_GHOST_DATABASE_NAME,
+    args=settings.SQLALCHEMY_ENGINE_OPTIONS,
 )
 
-# Feature database connection
+# Feature database connection; shares `engine`'s connection pool
 feature_db = Database(
-    uri=Settings().SQLALCHEMY_DATABASE_URI,
-    db_name=Settings().SQLALCHEMY_FEATURES_DATABASE_NAME,
-    args=Settings().SQLALCHEMY_ENGINE_OPTIONS,
+    uri=settings.SQLALCHEMY_DATABASE_URI,
+    db_name=settings.SQLALCHEMY_FEATURES_DATABASE_NAME,
+    args=settings.SQLALCHEMY_ENGINE_OPTIONS,
 )
@@ -1,69 +1,522 @@
-from datetime import datetime
-from typing import Optional
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
 
-from sqlalchemy.engine.result import Result
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, insert, literal_column, select, text, tuple_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.models import Account, Donation
+from database.models import (
+    Account,
+    CachedResult,
+    Donation,
+    DonationDaily,
+    DonationSupporter,
+    Notification,
+    WebhookDelivery,
+)
 from database.schemas import NewDonation
 from log import LOGGER
 
+# MySQL error code of a duplicate unique key, reported as a warning by `INSERT IGNORE`.
+DUPLICATE_ENTRY = 1062
 
-def get_donation(db: Session, donation: NewDonation) -> Optional[NewDonation]:
+
+def donation_row(donation: NewDonation, created_at: datetime) -> dict:
     """
-    Fetch BuyMeACoffee donation by ID.
+    Map incoming BuyMeACoffee donation to `donation` table columns.
 
-    :param Session db: ORM database session.
-    :param NewDonation donation: Donation record to be fetched.
+    :param NewDonation donation: Donation schema object.
+    :param datetime created_at: Time donation was received, unless the donation specifies one.
 
-    :returns: Optional[NewDonation]
+    :returns: dict
     """
-    existing_donation = db.query(Donation).filter(Donation.coffee_id == donation.coffee_id).first()
-    if existing_donation is None:
-        return donation
-    LOGGER.warning(f"Donation `{existing_donation.id}` from `{existing_donation.email}` already exists; skipping.")
-    return None
+    return {
+        "coffee_id": donation.coffee_id,
+        "email": donation.email,
+        "name": donation.name,
+        "count": donation.count,
+        "message": donation.message,
+        "url": donation.link,
+        "created_at": donation.created_at or created_at,
+    }
 
 
-def create_donation(db: Session, donation: NewDonation) -> Donation:
+async def insert_donation(db: AsyncSession, donation: NewDonation) -> Optional[bool]:
     """
-    Create new BuyMeACoffee donation record.
+    Atomically insert BuyMeACoffee donation unless one with the same `coffee_id` exists.
 
-    :param Session db: ORM database session.
+    `INSERT IGNORE` also skips rows colliding on the unique `url` & turns data errors into warnings, so the
+    warnings of a skipped row are checked: only a duplicate `coffee_id` counts as an existing donation.
+    Values truncated by MySQL in a row which *was* inserted are still saved as truncated.
+
+    :param AsyncSession db: ORM database session.
     :param NewDonation donation: Donation schema object.
 
-    :returns: Donation
+    :returns: Optional[bool]
     """
     try:
-        db_item = Donation(
-            coffee_id=donation.coffee_id,
-            email=donation.email,
-            name=donation.name,
-            count=donation.count,
-            message=donation.message,
-            link=donation.link,
-            created_at=datetime.now(),
-        )
-        db.add(db_item)
-        db.commit()
+        row = donation_row(donation, datetime.now())
+        # Unlike ON DUPLICATE KEY UPDATE, ignored rows count as unaffected even with CLIENT_FOUND_ROWS set.
+        result = await db.execute(mysql_insert(Donation).prefix_with("IGNORE").values(row))
+        if result.rowcount == 0:
+            warnings = (await db.execute(text("SHOW WARNINGS"))).all()
+            await db.rollback()
+            problems = [message for level, code, message in warnings if not is_duplicate_coffee_id(code, message)]
+            if problems:
+                LOGGER.error(f"Donation `{donation.coffee_id}` was not inserted: {'; '.join(problems)}")
+                return None
+            LOGGER.warning(f"Donation `{donation.coffee_id}` from `{donation.email}` already exists; skipping.")
+            return False
+        await add_to_donation_aggregates(db, [Donation(**row)])
+        await db.commit()
         LOGGER.success(f"Successfully received donation: `{donation.count}` coffees from `{donation.name}`.")
-        return db_item
-    except IntegrityError as e:
-        LOGGER.error(f"DB IntegrityError while creating donation record: {e}")
+        return True
     except SQLAlchemyError as e:
-        LOGGER.error(f"SQLAlchemyError while creating donation record: {e}")
-    except Exception as e:
-        LOGGER.error(f"Unexpected error while creating donation record: {e}")
+        await db.rollback()
+        LOGGER.error(f"SQLAlchemyError while inserting donation `{donation.coffee_id}`: {e}")
+
+
+def is_duplicate_coffee_id(code: int, message: str) -> bool:
+    """
+    Check whether a MySQL warning reports a row skipped for colliding on `donation.coffee_id`.
+
+    :param int code: MySQL warning code.
+    :param str message: MySQL warning message (ie: "Duplicate entry '1' for key 'donation.coffee_id'").
+
+    :returns: bool
+    """
+    return code == DUPLICATE_ENTRY and message.endswith("coffee_id'")
+
+
+async def import_donations(db: AsyncSession, donations: List[NewDonation], chunk_size: int) -> int:
+    """
+    Insert historical BuyMeACoffee donations in chunks, skipping those already recorded.
+    Donation aggregates are rebuilt once chunks are inserted, including when a chunk fails after earlier
+    chunks were committed.
+    As with `insert_donation`, rows colliding on `url` or holding invalid values are skipped too.
+
+    :param AsyncSession db: ORM database session.
+    :param List[NewDonation] donations: Donation schema objects.
+    :param int chunk_size: Number of donations per multi-row INSERT.
+
+    :returns: int
+    """
+    inserted = 0
+    now = datetime.now()
+    try:
+        for i in range(0, len(donations), chunk_size):
+            rows = [donation_row(donation, now) for donation in donations[i : i + chunk_size]]
+            result = await db.execute(mysql_insert(Donation).prefix_with("IGNORE").values(rows))
+            await db.commit()
+            inserted += result.rowcount
+    finally:
+        if inserted:
+            # Discard a failed chunk, if any, so aggregates are rebuilt from committed donations only.
+            await db.rollback()
+            await rebuild_donation_aggregates(db)
+    LOGGER.success(f"Imported {inserted} of {len(donations)} donations.")
+    return inserted
+
+
+async def delete_donation(db: AsyncSession, coffee_id: int) -> bool:
+    """
+    Delete BuyMeACoffee donation by `coffee_id` & recompute donation aggregates without it.
+
+    :param AsyncSession db: ORM database session.
+    :param int coffee_id: BuyMeACoffee ID of donation.
+
+    :returns: bool
+    """
+    result = await db.execute(delete(Donation).where(Donation.coffee_id == coffee_id))
+    if result.rowcount == 0:
+        await db.rollback()
+        return False
+    await rebuild_donation_aggregates(db)
+    LOGGER.success(f"Deleted donation `{coffee_id}`.")
+    return True
 
 
-def get_account(db: Session, account_email: str) -> Optional[Result]:
+async def add_to_donation_aggregates(db: AsyncSession, donations: List[Donation]):
+    """
+    Fold new donations into per-day & per-supporter totals within the caller's transaction.
+
+    :param AsyncSession db: ORM database session.
+    :param List[Donation] donations: Newly inserted donations.
+    """
+    days, supporters = defaultdict(lambda: [0, 0]), {}
+    for donation in donations:
+        count = donation.count or 0
+        days[donation.created_at.date()][0] += 1
+        days[donation.created_at.date()][1] += count
+        if donation.email:
+            supporter = supporters.setdefault(donation.email, [donation.name, 0, 0, donation.created_at])
+            supporter[1] += 1
+            supporter[2] += count
+            supporter[3] = max(supporter[3], donation.created_at)
+    if days:
+        insert_days = mysql_insert(DonationDaily).values(
+            [{"day": day, "donations": totals[0], "coffees": totals[1]} for day, totals in days.items()]
+        )
+        await db.execute(
+            insert_days.on_duplicate_key_update(
+                donations=DonationDaily.donations + insert_days.inserted.donations,
+                coffees=DonationDaily.coffees + insert_days.inserted.coffees,
+            )
+        )
+    if supporters:
+        insert_supporters = mysql_insert(DonationSupporter).values(
+            [
+                {"email": email, "name": name, "donations": donations, "coffees": coffees, "last_donated_at": last}
+                for email, (name, donations, coffees, last) in supporters.items()
+            ]
+        )
+        await db.execute(
+            insert_supporters.on_duplicate_key_update(
+                name=insert_supporters.inserted.name,
+                donations=DonationSupporter.donations + insert_supporters.inserted.donations,
+                coffees=DonationSupporter.coffees + insert_supporters.inserted.coffees,
+                last_donated_at=func.greatest(
+                    DonationSupporter.last_donated_at, insert_supporters.inserted.last_donated_at
+                ),
+            )
+        )
+
+
+async def rebuild_donation_aggregates(db: AsyncSession):
+    """
+    Recompute per-day & per-supporter donation totals from the donation ledger.
+
+    :param AsyncSession db: ORM database session.
+    """
+    await db.execute(delete(DonationDaily))
+    await db.execute(delete(DonationSupporter))
+    await db.execute(
+        insert(DonationDaily).from_select(
+            ["day", "donations", "coffees"],
+            select(
+                func.date(Donation.created_at),
+                func.count(Donation.id),
+                func.coalesce(func.sum(Donation.count), 0),
+            ).group_by(func.date(Donation.created_at)),
+        )
+    )
+    await db.execute(
+        insert(DonationSupporter).from_select(
+            ["email", "name", "donations", "coffees", "last_donated_at"],
+            select(
+                Donation.email,
+                func.max(Donation.name),
+                func.count(Donation.id),
+                func.coalesce(func.sum(Donation.count), 0),
+                func.max(Donation.created_at),
+            )
+            .where(Donation.email.is_not(None))
+            .group_by(Donation.email),
+        )
+    )
+    await db.commit()
+
+
+async def get_donations_page(
+    db: AsyncSession, after_at: Optional[datetime], after_id: Optional[int], limit: int
+) -> List[dict]:
+    """
+    Fetch donations in order received, starting after the given position.
+
+    :param AsyncSession db: ORM database session.
+    :param Optional[datetime] after_at: `created_at` of the last donation of the previous page.
+    :param Optional[int] after_id: ID of the last donation of the previous page.
+    :param int limit: Maximum number of donations to fetch.
+
+    :returns: List[dict]
+    """
+    query = select(
+        Donation.id,
+        Donation.coffee_id,
+        Donation.email,
+        Donation.name,
+        Donation.count,
+        Donation.message,
+        Donation.url,
+        Donation.created_at,
+    )
+    if after_at is not None:
+        query = query.where(tuple_(Donation.created_at, Donation.id) > tuple_(after_at, after_id))
+    result = await db.execute(query.order_by(Donation.created_at, Donation.id).limit(limit))
+    return [dict(row) for row in result.mappings()]
+
+
+async def get_donation_stats(db: AsyncSession, days: int, top: int) -> dict:
+    """
+    Fetch precomputed donation totals per day & month along with top supporters.
+
+    :param AsyncSession db: ORM database session.
+    :param int days: Number of most recent days to include daily totals for.
+    :param int top: Number of top supporters to include.
+
+    :returns: dict
+    """
+    since = date.today() - timedelta(days=days - 1)
+    daily = await db.execute(
+        select(DonationDaily.day, DonationDaily.donations, DonationDaily.coffees)
+        .where(DonationDaily.day >= since)
+        .order_by(DonationDaily.day)
+    )
+    month = func.date_format(DonationDaily.day, literal_column("'%Y-%m'"))
+    monthly = await db.execute(
+        select(
+            month.label("month"),
+            func.sum(DonationDaily.donations).label("donations"),
+            func.sum(DonationDaily.coffees).label("coffees"),
+        )
+        .group_by(month)
+        .order_by(month)
+    )
+    supporters = await db.execute(
+        select(
+            DonationSupporter.name,
+            DonationSupporter.donations,
+            DonationSupporter.coffees,
+            DonationSupporter.last_donated_at,
+        )
+        .order_by(DonationSupporter.coffees.desc())
+        .limit(top)
+    )
+    return {
+        "daily": [dict(row) for row in daily.mappings()],
+        "monthly": [
+            {**row, "donations": int(row["donations"]), "coffees": int(row["coffees"])} for row in monthly.mappings()
+        ],
+        "top_supporters": [dict(row) for row in supporters.mappings()],
+    }
+
+
+async def get_account(db: AsyncSession, account_email: str) -> Optional[Account]:
     """
     Fetch account by email address.
 
-    :param Session db: ORM database session.
+    :param AsyncSession db: ORM database session.
     :param str account_email: Primary key for account record.
 
-    :returns: Optional[Result]
+    :returns: Optional[Account]
+    """
+    return await db.scalar(select(Account).where(Account.email == account_email).limit(1))
+
+
+async def get_webhook_delivery(db: AsyncSession, key: str) -> Optional[WebhookDelivery]:
+    """
+    Fetch unexpired result of a previously processed webhook delivery.
+
+    :param AsyncSession db: ORM database session.
+    :param str key: Delivery ID or fingerprint of webhook request.
+
+    :returns: Optional[WebhookDelivery]
     """
-    return db.query(Account).filter(Account.email == account_email).first()
+    return await db.scalar(
+        select(WebhookDelivery).where(WebhookDelivery.key == key, WebhookDelivery.expires_at > datetime.now()).limit(1)
+    )
+
+
+async def create_webhook_delivery(db: AsyncSession, key: str, route: str, status_code: int, response: str, ttl: int):
+    """
+    Record result of a processed webhook delivery & purge expired deliveries.
+
+    :param AsyncSession db: ORM database session.
+    :param str key: Delivery ID or fingerprint of webhook request.
+    :param str route: Path of route which processed the delivery.
+    :param int status_code: HTTP status code returned for the delivery.
+    :param str response: Serialized response body returned for the delivery.
+    :param int ttl: Number of seconds to retain the delivery.
+    """
+    try:
+        now = datetime.now()
+        await db.execute(delete(WebhookDelivery).where(WebhookDelivery.expires_at <= now))
+        await db.merge(
+            WebhookDelivery(
+                key=key,
+                route=route,
+                status_code=status_code,
+                response=response,
+                created_at=now,
+                expires_at=now + timedelta(seconds=ttl),
+            )
+        )
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        LOGGER.error(f"SQLAlchemyError while saving webhook delivery `{key}`: {e}")
+
+
+async def get_cached_result(db: AsyncSession, key: str) -> Optional[str]:
+    """
+    Fetch unexpired serialized result of a read endpoint.
+
+    :param AsyncSession db: ORM database session.
+    :param str key: Cache key of result.
+
+    :returns: Optional[str]
+    """
+    return await db.scalar(
+        select(CachedResult.value).where(CachedResult.key == key, CachedResult.expires_at > datetime.now())
+    )
+
+
+async def get_cached_results(db: AsyncSession, keys: List[str]) -> Dict[str, str]:
+    """
+    Fetch unexpired serialized results of several keys in a single query.
+
+    :param AsyncSession db: ORM database session.
+    :param List[str] keys: Cache keys of results.
+
+    :returns: Dict[str, str]
+    """
+    rows = await db.execute(
+        select(CachedResult.key, CachedResult.value).where(
+            CachedResult.key.in_(keys), CachedResult.expires_at > datetime.now()
+        )
+    )
+    return {key: value for key, value in rows}
+
+
+async def set_cached_result(db: AsyncSession, key: str, value: str, ttl: float):
+    """
+    Store serialized result of a read endpoint & purge expired results.
+
+    :param AsyncSession db: ORM database session.
+    :param str key: Cache key of result.
+    :param str value: Serialized result.
+    :param float ttl: Number of seconds the result remains valid.
+    """
+    try:
+        now = datetime.now()
+        await db.execute(delete(CachedResult).where(CachedResult.expires_at <= now))
+        await db.merge(CachedResult(key=key, value=value, expires_at=now + timedelta(seconds=ttl)))
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        LOGGER.error(f"SQLAlchemyError while caching result `{key}`: {e}")
+
+
+async def create_notification(
+    db: AsyncSession, channel: str, body: str, priority: bool = False, send_at: Optional[datetime] = None
+) -> Optional[Notification]:
+    """
+    Queue a notification to be sent by a sender worker.
+
+    :param AsyncSession db: ORM database session.
+    :param str channel: Source of notification (ie: `github`, `authors`).
+    :param str body: Content of message to send.
+    :param bool priority: Send on its own as soon as possible rather than in a digest.
+    :param Optional[datetime] send_at: Earliest time to send notification; defaults to now.
+
+    :returns: Optional[Notification]
+    """
+    try:
+        notification = Notification(
+            channel=channel,
+            body=body,
+            priority=priority,
+            status="pending",
+            attempts=0,
+            next_attempt_at=send_at or datetime.now(),
+        )
+        db.add(notification)
+        await db.commit()
+        return notification
+    except SQLAlchemyError as e:
+        await db.rollback()
+        LOGGER.error(f"SQLAlchemyError while queueing `{channel}` notification: {e}")
+
+
+async def get_notification(db: AsyncSession, notification_id: int) -> Optional[Notification]:
+    """
+    Fetch queued notification & its delivery status.
+
+    :param AsyncSession db: ORM database session.
+    :param int notification_id: ID of queued notification.
+
+    :returns: Optional[Notification]
+    """
+    return await db.get(Notification, notification_id)
+
+
+async def claim_notifications(db: AsyncSession, limit: int, lease: int) -> List[Notification]:
+    """
+    Claim notifications due to be sent, skipping rows claimed by other workers.
+
+    Pending non-priority notifications of the same channels as due notifications are claimed along with them, even
+    if not yet due, so they are sent together as a single digest.
+    Claimed notifications are leased for `lease` seconds, after which they are claimable again in case the
+    worker sending them died.
+
+    :param AsyncSession db: ORM database session.
+    :param int limit: Maximum number of notifications to claim.
+    :param int lease: Seconds before a claimed notification which was neither sent nor failed is retried.
+
+    :returns: List[Notification]
+    """
+    now = datetime.now()
+    notifications = (
+        await db.scalars(
+            select(Notification)
+            .where(Notification.status.in_(("pending", "sending")), Notification.next_attempt_at <= now)
+            .order_by(Notification.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+    ).all()
+    channels = {notification.channel for notification in notifications if not notification.priority}
+    if channels:
+        notifications += (
+            await db.scalars(
+                select(Notification)
+                .where(
+                    Notification.status == "pending",
+                    Notification.priority.is_(False),
+                    Notification.channel.in_(channels),
+                    Notification.id.not_in([notification.id for notification in notifications]),
+                )
+                .order_by(Notification.id)
+                .with_for_update(skip_locked=True)
+            )
+        ).all()
+    for notification in notifications:
+        notification.status = "sending"
+        notification.attempts += 1
+        notification.next_attempt_at = now + timedelta(seconds=lease)
+    await db.commit()
+    return list(notifications)
+
+
+async def complete_notification(
+    db: AsyncSession,
+    notification: Notification,
+    provider_id: Optional[str] = None,
+    error: Optional[str] = None,
+    retry_at: Optional[datetime] = None,
+):
+    """
+    Record outcome of an attempt to send a notification.
+
+    :param AsyncSession db: ORM database session.
+    :param Notification notification: Notification which was attempted.
+    :param Optional[str] provider_id: ID assigned to the message by the provider, if sent.
+    :param Optional[str] error: Error raised by the attempt, if it failed.
+    :param Optional[datetime] retry_at: Time to retry a failed attempt; failures without one are final.
+    """
+    try:
+        if error is None:
+            notification.status = "sent"
+            notification.provider_id = provider_id
+            notification.sent_at = datetime.now()
+        else:
+            notification.status = "pending" if retry_at else "failed"
+            notification.last_error = error
+            notification.next_attempt_at = retry_at
+        await db.merge(notification)
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        LOGGER.error(f"SQLAlchemyError while recording outcome of notification `{notification.id}`: {e}")
@@ -0,0 +1,229 @@
+"""Shared SQLAlchemy engines, one per physical database, with instrumented connection pools."""
+
+import ssl
+from threading import Lock
+from time import perf_counter
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, QueuePool
+
+from config import settings
+from database.instrumentation import instrument_engine
+
+
+class PoolMetrics:
+    """Running totals of connection checkouts & time spent waiting on a pool."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.invalidations = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._lock = Lock()
+
+    def record_checkout(self, wait: float) -> None:
+        """
+        Record a connection handed out by the pool.
+
+        :param float wait: Seconds spent waiting for the connection.
+        """
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def record_timeout(self) -> None:
+        """Record a checkout which gave up waiting for a free connection."""
+        with self._lock:
+            self.timeouts += 1
+
+    def record_invalidation(self, *args) -> None:
+        """Record a connection discarded as stale or disconnected (ie: by a failed pre-ping)."""
+        with self._lock:
+            self.invalidations += 1
+
+    def to_dict(self) -> dict:
+        """
+        Serialize metrics.
+
+        :returns: dict
+        """
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "invalidations": self.invalidations,
+                "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+class TimedQueuePool(QueuePool):
+    """`QueuePool` which records how long each checkout waits for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            # Only exhausted pools; connection failures (DNS, auth, `OperationalError`) propagate uncounted.
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(perf_counter() - start)
+        return connection
+
+    def recreate(self) -> "TimedQueuePool":
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class TimedAsyncAdaptedQueuePool(TimedQueuePool, AsyncAdaptedQueuePool):
+    """`TimedQueuePool` for engines using an asyncio driver."""
+
+
+_engines: Dict[Tuple[str, str], Engine] = {}
+_async_engines: Dict[Tuple[str, str], AsyncEngine] = {}
+_engines_lock = Lock()
+
+
+def _pool_options(is_async: bool = False) -> dict:
+    """
+    Connection pool configuration of sync & async engines.
+
+    Async engines get their own, smaller pool size so a database used from both paths
+    does not hold two full sets of connections per worker.
+
+    :param bool is_async: Whether the pool belongs to an asyncio engine.
+
+    :returns: dict
+    """
+    return {
+        "pool_size": settings.SQLALCHEMY_ASYNC_POOL_SIZE if is_async else settings.SQLALCHEMY_POOL_SIZE,
+        "max_overflow": settings.SQLALCHEMY_ASYNC_MAX_OVERFLOW if is_async else settings.SQLALCHEMY_MAX_OVERFLOW,
+        "pool_timeout": settings.SQLALCHEMY_POOL_TIMEOUT,
+        "pool_recycle": settings.SQLALCHEMY_POOL_RECYCLE,
+        "pool_pre_ping": settings.SQLALCHEMY_POOL_PRE_PING,
+    }
+
+
+def get_engine(uri: str, db_name: str, args: dict) -> Engine:
+    """
+    Fetch the shared engine for a database, creating it on first use.
+
+    :param str uri: Database connection URI, excluding database name.
+    :param str db_name: Name of database.
+    :param dict args: Driver-specific connection arguments.
+
+    :returns: Engine
+    """
+    key = (uri, db_name)
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            if settings.SQLALCHEMY_LOAD_DATA_LOCAL_INFILE:
+                args = {**args, "local_infile": True}
+            engine = create_engine(
+                f"{uri}/{db_name}",
+                connect_args=args,
+                poolclass=TimedQueuePool,
+                echo=False,
+                **_pool_options(),
+            )
+            event.listen(engine.pool, "invalidate", engine.pool.metrics.record_invalidation)
+            instrument_engine(engine)
+            _engines[key] = engine
+        return engine
+
+
+def get_async_engine(uri: str, db_name: str, args: dict) -> AsyncEngine:
+    """
+    Fetch the shared asyncio engine for a database, creating it on first use.
+
+    :param str uri: Database connection URI, excluding database name; its driver is swapped for `aiomysql`.
+    :param str db_name: Name of database.
+    :param dict args: Connection arguments of the sync engine; SSL options are converted for `aiomysql`.
+
+    :returns: AsyncEngine
+    """
+    key = (uri, db_name)
+    with _engines_lock:
+        engine = _async_engines.get(key)
+        if engine is None:
+            url = make_url(f"{uri}/{db_name}").set(drivername="mysql+aiomysql")
+            engine = create_async_engine(
+                url,
+                connect_args=async_connect_args(args),
+                poolclass=TimedAsyncAdaptedQueuePool,
+                echo=False,
+                **_pool_options(is_async=True),
+            )
+            event.listen(engine.sync_engine.pool, "invalidate", engine.sync_engine.pool.metrics.record_invalidation)
+            instrument_engine(engine.sync_engine)
+            _async_engines[key] = engine
+        return engine
+
+
+def async_connect_args(args: dict) -> dict:
+    """
+    Convert `pymysql` connection arguments to their `aiomysql` equivalent.
+
+    `aiomysql` expects an `SSLContext` rather than a dict of options, so one is built
+    the same way `pymysql` builds it from the dict.
+
+    :param dict args: Connection arguments passed to `pymysql`.
+
+    :returns: dict
+    """
+    ssl_options = args.get("ssl")
+    if not isinstance(ssl_options, dict):
+        return dict(args)
+    context = ssl.create_default_context(cafile=ssl_options.get("ca"), capath=ssl_options.get("capath"))
+    if ssl_options.get("ca") is None and ssl_options.get("capath") is None:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    if ssl_options.get("cert"):
+        context.load_cert_chain(ssl_options["cert"], keyfile=ssl_options.get("key"))
+    return {**args, "ssl": context}
+
+
+def pool_status() -> Dict[str, dict]:
+    """
+    Report connection usage & checkout metrics of each engine's pool.
+
+    :returns: Dict[str, dict]
+    """
+    with _engines_lock:
+        engines = {db_name: engine for (uri, db_name), engine in _engines.items()}
+        engines.update({f"{db_name}:async": engine.sync_engine for (uri, db_name), engine in _async_engines.items()})
+    return {
+        name: {
+            "size": engine.pool.size(),
+            "checked_out": engine.pool.checkedout(),
+            "overflow": engine.pool.overflow(),
+            "idle": engine.pool.checkedin(),
+            **engine.pool.metrics.to_dict(),
+        }
+        for name, engine in engines.items()
+    }
+
+
+def find_engine(db_name: str) -> Optional[Engine]:
+    """
+    Fetch the synchronous engine of a database by name.
+
+    :param str db_name: Name of database.
+
+    :returns: Optional[Engine]
+    """
+    with _engines_lock:
+        return next((engine for (uri, name), engine in _engines.items() if name == db_name), None)
@@ -0,0 +1,179 @@
+"""Per-query timing, slow-query logging & on-demand `EXPLAIN` of SQL statements."""
+
+from bisect import bisect_left
+from collections import deque
+from threading import Lock
+from time import perf_counter
+from typing import Deque, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config import settings
+from log import LOGGER
+
+# Upper bounds (in milliseconds) of query duration histogram buckets; the last bucket is unbounded.
+DURATION_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+EXPLAINABLE_STATEMENTS = ("SELECT", "UPDATE", "DELETE", "INSERT", "REPLACE")
+
+
+class QueryStats:
+    """Duration histogram, row counts & recent slow statements, grouped by query name."""
+
+    def __init__(self, slow_query_ms: float, max_slow_queries: int = 50):
+        """
+        :param float slow_query_ms: Duration above which a statement is logged & retained as slow.
+        :param int max_slow_queries: Number of most recent slow statements to retain.
+        """
+        self.slow_query_ms = slow_query_ms
+        self._queries: Dict[str, dict] = {}
+        self._slow: Deque[dict] = deque(maxlen=max_slow_queries)
+        self._lock = Lock()
+
+    def record(self, name: str, database: str, statement: str, parameters, duration_ms: float, rowcount: int) -> None:
+        """
+        Record execution of a statement.
+
+        :param str name: Query file or logical name of statement.
+        :param str database: Name of database statement ran against.
+        :param str statement: SQL sent to the driver.
+        :param parameters: Parameters sent to the driver.
+        :param float duration_ms: Execution time in milliseconds.
+        :param int rowcount: Rows matched or affected, as reported by the driver (-1 if unknown).
+        """
+        with self._lock:
+            stats = self._queries.get(name)
+            if stats is None:
+                stats = self._queries[name] = {
+                    "database": database,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "rows": 0,
+                    "buckets": [0] * (len(DURATION_BUCKETS_MS) + 1),
+                }
+            stats["count"] += 1
+            stats["total_ms"] += duration_ms
+            stats["max_ms"] = max(stats["max_ms"], duration_ms)
+            stats["rows"] += max(rowcount, 0)
+            stats["buckets"][bisect_left(DURATION_BUCKETS_MS, duration_ms)] += 1
+            if duration_ms >= self.slow_query_ms:
+                self._slow.append(
+                    {
+                        "name": name,
+                        "database": database,
+                        "duration_ms": round(duration_ms, 3),
+                        "rowcount": rowcount,
+                        "statement": statement,
+                        "parameters": parameters,
+                    }
+                )
+        if duration_ms >= self.slow_query_ms:
+            LOGGER.warning(f"Slow query `{name}` on `{database}` took {duration_ms:.0f}ms ({rowcount} rows).")
+
+    def summary(self) -> List[dict]:
+        """
+        Report aggregate timings per query, slowest in total first.
+
+        :returns: List[dict]
+        """
+        with self._lock:
+            queries = [(name, dict(stats, buckets=list(stats["buckets"]))) for name, stats in self._queries.items()]
+        labels = [f"<={bound}ms" for bound in DURATION_BUCKETS_MS] + [f">{DURATION_BUCKETS_MS[-1]}ms"]
+        return [
+            {
+                "name": name,
+                "database": stats["database"],
+                "count": stats["count"],
+                "total_ms": round(stats["total_ms"], 3),
+                "avg_ms": round(stats["total_ms"] / stats["count"], 3),
+                "max_ms": round(stats["max_ms"], 3),
+                "rows": stats["rows"],
+                "histogram": dict(zip(labels, stats["buckets"])),
+            }
+            for name, stats in sorted(queries, key=lambda query: query[1]["total_ms"], reverse=True)
+        ]
+
+    def slow_queries(self, include_parameters: bool = False) -> List[dict]:
+        """
+        Fetch most recent slow statements, newest first.
+
+        :param bool include_parameters: Whether to include bound parameters, which may contain user data.
+
+        :returns: List[dict]
+        """
+        with self._lock:
+            slow = list(reversed(self._slow))
+        if include_parameters:
+            return slow
+        return [{k: v for k, v in query.items() if k != "parameters"} for query in slow]
+
+
+query_stats = QueryStats(slow_query_ms=settings.SQLALCHEMY_SLOW_QUERY_MS)
+
+
+def query_name(statement: str, execution_options: dict) -> str:
+    """
+    Identify a statement by its `query_name` execution option, or else by its leading SQL.
+
+    :param str statement: SQL sent to the driver.
+    :param dict execution_options: Execution options of the statement.
+
+    :returns: str
+    """
+    name = execution_options.get("query_name")
+    if name:
+        return name
+    return " ".join(statement.split())[:80]
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Time every statement executed by an engine (the `sync_engine` of async engines).
+
+    :param Engine engine: Engine to instrument.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def record_query_time(conn, cursor, statement, parameters, context, executemany):
+        duration_ms = (perf_counter() - conn.info["query_start"].pop()) * 1000
+        options = context.execution_options if context is not None else {}
+        query_stats.record(
+            query_name(statement, options),
+            engine.url.database,
+            statement,
+            parameters,
+            duration_ms,
+            cursor.rowcount if cursor is not None else -1,
+        )
+
+    @event.listens_for(engine, "handle_error")
+    def discard_query_timer(exception_context):
+        if exception_context.connection is not None:
+            starts = exception_context.connection.info.get("query_start")
+            if starts:
+                starts.pop()
+
+
+def explain(engine: Engine, statement: str, parameters) -> Optional[List[dict]]:
+    """
+    Run `EXPLAIN` for a captured statement.
+
+    :param Engine engine: Synchronous engine of the database the statement ran against.
+    :param str statement: SQL sent to the driver.
+    :param parameters: Parameters sent to the driver.
+
+    :returns: Optional[List[dict]]
+    """
+    if not statement.lstrip().upper().startswith(EXPLAINABLE_STATEMENTS):
+        return None
+    if isinstance(parameters, (list, tuple)) and parameters and isinstance(parameters[0], (list, tuple, dict)):
+        parameters = parameters[0]
+    with engine.connect() as conn:
+        result = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters or ())
+        return [dict(row._mapping) for row in result]
@@ -1,8 +1,20 @@
 """Data models."""
 
-from sqlalchemy import Column, DateTime, Integer, String, Text
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+)
 from sqlalchemy.sql import func
 
+from config import settings
 from database import Base
 
 
@@ -36,7 +48,181 @@ class Donation(Base):
     count = Column(Integer)
     message = Column(Text)
     url = Column(Text, unique=True, index=True)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, server_default=func.now(), index=True)
 
     def __repr__(self):
         return f"<Donation {self.id}, ({self.url}): `{self.message}`>"
+
+
+class DonationDaily(Base):
+    """Donation totals per day, maintained as donations are received."""
+
+    __tablename__ = "donation_daily"
+
+    day = Column(Date, primary_key=True)
+    donations = Column(Integer, default=0)
+    coffees = Column(Integer, default=0)
+
+    def __repr__(self):
+        return f"<DonationDaily {self.day}: {self.donations} donations, {self.coffees} coffees>"
+
+
+class DonationSupporter(Base):
+    """Donation totals per supporter, maintained as donations are received."""
+
+    __tablename__ = "donation_supporter"
+
+    email = Column(String(255), primary_key=True)
+    name = Column(String(255))
+    donations = Column(Integer, default=0)
+    coffees = Column(Integer, default=0, index=True)
+    last_donated_at = Column(DateTime)
+
+    def __repr__(self):
+        return f"<DonationSupporter {self.email}: {self.donations} donations, {self.coffees} coffees>"
+
+
+class WebhookDelivery(Base):
+    """Result of a processed webhook delivery, replayed when the same delivery is retried."""
+
+    __tablename__ = "webhook_delivery"
+
+    key = Column(String(255), primary_key=True)
+    route = Column(String(255))
+    status_code = Column(Integer)
+    response = Column(Text)
+    created_at = Column(DateTime, server_default=func.now())
+    expires_at = Column(DateTime, index=True)
+
+    def __repr__(self):
+        return f"<WebhookDelivery {self.key}, {self.route}: {self.status_code}>"
+
+
+class Notification(Base):
+    """SMS notification queued by a webhook & delivered by background sender workers."""
+
+    __tablename__ = "notification_outbox"
+
+    id = Column(Integer, primary_key=True, autoincrement="auto")
+    channel = Column(String(50), index=True)
+    body = Column(Text)
+    priority = Column(Boolean, default=False)
+    status = Column(String(20), default="pending")
+    attempts = Column(Integer, default=0)
+    next_attempt_at = Column(DateTime)
+    provider_id = Column(String(255), nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (Index("ix_notification_outbox_status_next_attempt_at", "status", "next_attempt_at"),)
+
+    def __repr__(self):
+        return f"<Notification {self.id}, {self.channel}: {self.status}>"
+
+
+class CachedResult(Base):
+    """Serialized result of a read endpoint, shared between API workers."""
+
+    __tablename__ = "result_cache"
+
+    key = Column(String(255), primary_key=True)
+    value = Column(Text(16777215))
+    expires_at = Column(DateTime, index=True)
+
+    def __repr__(self):
+        return f"<CachedResult {self.key}, expires {self.expires_at}>"
+
+
+class PageViewStats:
+    """Columns shared by top-page tables imported from the analytics warehouse or Plausible."""
+
+    id = Column(Integer, primary_key=True, autoincrement="auto")
+    title = Column(Text)
+    url = Column(String(255), index=True)
+    slug = Column(String(255), index=True)
+    views = Column(Integer, index=True)
+    visitors = Column(Integer, nullable=True)
+    visits = Column(Integer, nullable=True)
+    bounce_rate = Column(Integer, nullable=True)
+    visit_duration = Column(Integer, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.slug}: {self.views} views>"
+
+
+class WeeklyStats(PageViewStats, Base):
+    """Most viewed pages over the past 7 days."""
+
+    __tablename__ = "weekly_stats"
+
+
+class MonthlyStats(PageViewStats, Base):
+    """Most viewed pages over the past 30 days."""
+
+    __tablename__ = "monthly_stats"
+
+
+class YearlyStats(PageViewStats, Base):
+    """Most viewed pages over the past 365 days."""
+
+    __tablename__ = "yearly_stats"
+
+
+class DailyPageViews(Base):
+    """Views per page per day, appended incrementally from the analytics warehouse."""
+
+    __tablename__ = "daily_page_views"
+
+    day = Column(Date, primary_key=True)
+    url = Column(String(512), primary_key=True)
+    slug = Column(String(255), index=True)
+    title = Column(Text)
+    views = Column(Integer)
+    visits = Column(Integer, nullable=True)
+    bounces = Column(Integer, nullable=True)
+
+    def __repr__(self):
+        return f"<DailyPageViews {self.day}, {self.slug}: {self.views} views>"
+
+
+class AlgoliaSearches:
+    """Columns shared by tables of search queries imported from Algolia."""
+
+    id = Column(Integer, primary_key=True, autoincrement="auto")
+    search = Column(String(255), index=True)
+    count = Column(Integer, index=True)
+    nbHits = Column(Integer)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.search}: {self.count} searches>"
+
+
+class AlgoliaSearchesWeek(AlgoliaSearches, Base):
+    """Searches submitted over the past 7 days."""
+
+    __tablename__ = settings.ALGOLIA_TABLE_WEEKLY
+
+
+class AlgoliaSearchesMonth(AlgoliaSearches, Base):
+    """Searches submitted over the past 30 days."""
+
+    __tablename__ = settings.ALGOLIA_TABLE_MONTHLY
+
+
+# Tables owned by Ghost, declared only for the indexes this API's queries rely on; Ghost creates the tables
+ghost_metadata = MetaData()
+
+GhostComments = Table(
+    "comments",
+    ghost_metadata,
+    Column("id", String(24), primary_key=True),
+    Column("status", String(50)),
+    Column("edited_at", DateTime),
+)
+
+# Serves keyset pages of `/account/comments/` as plain ranges over `(status, edited_at, id)`
+GHOST_INDEXES = (
+    Index("comments_status_edited_at_id", GhostComments.c.status, GhostComments.c.edited_at, GhostComments.c.id),
+)
@@ -0,0 +1,19 @@
+SELECT
+  DATE(timestamp) AS day,
+  url,
+  REPLACE(REPLACE(url, 'https://hackersandslackers.com/', ''), '/' , '') AS slug,
+  REPLACE(ANY_VALUE(title), ' - Hackers and Slackers', '') AS title,
+  COUNT(*) AS views
+FROM
+  hackersgatsbyprod.pages
+WHERE
+  timestamp >= TIMESTAMP(@since)
+  AND timestamp < TIMESTAMP_TRUNC(CURRENT_TIMESTAMP(), DAY)
+  AND url NOT LIKE '%/page/%'
+  AND url NOT LIKE '%/tag/%'
+  AND url NOT LIKE '%/series/%'
+  AND url NOT LIKE '%/author/%'
+  AND title IS NOT NULL
+GROUP BY
+  day,
+  url;
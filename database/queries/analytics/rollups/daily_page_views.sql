@@ -0,0 +1,12 @@
+SELECT
+	day,
+	url,
+	slug,
+	title,
+	views,
+	visits,
+	bounces
+FROM
+	daily_page_views
+WHERE
+	day >= :since;
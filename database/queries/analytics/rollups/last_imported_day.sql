@@ -0,0 +1,4 @@
+SELECT
+	MAX(day) AS day
+FROM
+	daily_page_views;
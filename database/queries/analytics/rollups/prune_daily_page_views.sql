@@ -0,0 +1,4 @@
+DELETE FROM
+	daily_page_views
+WHERE
+	day < :before;
@@ -0,0 +1,14 @@
+SELECT
+	MAX(title) AS title,
+	url,
+	MAX(slug) AS slug,
+	SUM(views) AS views
+FROM
+	daily_page_views
+WHERE
+	day >= :since
+GROUP BY
+	url
+ORDER BY
+	views DESC
+LIMIT :limit;
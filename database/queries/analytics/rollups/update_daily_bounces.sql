@@ -0,0 +1,8 @@
+UPDATE
+	daily_page_views
+SET
+	visits = :visits,
+	bounces = :bounces
+WHERE
+	day = :day
+	AND slug = :slug;
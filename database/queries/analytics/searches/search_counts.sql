@@ -0,0 +1,9 @@
+SELECT
+	month.search,
+	month.count,
+	COALESCE(week.count, 0) AS recent
+FROM
+	algolia_searches_month AS month
+	LEFT JOIN (
+		SELECT search, SUM(count) AS count FROM algolia_searches_week GROUP BY search
+	) AS week ON week.search = month.search;
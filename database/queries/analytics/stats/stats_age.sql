@@ -0,0 +1,3 @@
+SELECT
+	(SELECT TIMESTAMPDIFF(SECOND, MAX(created_at), NOW()) FROM weekly_stats) AS weekly_age,
+	(SELECT TIMESTAMPDIFF(SECOND, MAX(created_at), NOW()) FROM monthly_stats) AS monthly_age;
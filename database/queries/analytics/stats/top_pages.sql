@@ -0,0 +1,37 @@
+(
+	SELECT
+		'weekly' AS timeframe,
+		title,
+		url,
+		slug,
+		views,
+		visitors,
+		visits,
+		bounce_rate,
+		visit_duration,
+		TIMESTAMPDIFF(SECOND, created_at, NOW()) AS age
+	FROM
+		weekly_stats
+	ORDER BY
+		views DESC
+	LIMIT :weekly_limit
+)
+UNION ALL
+(
+	SELECT
+		'monthly' AS timeframe,
+		title,
+		url,
+		slug,
+		views,
+		visitors,
+		visits,
+		bounce_rate,
+		visit_duration,
+		TIMESTAMPDIFF(SECOND, created_at, NOW()) AS age
+	FROM
+		monthly_stats
+	ORDER BY
+		views DESC
+	LIMIT :monthly_limit
+);
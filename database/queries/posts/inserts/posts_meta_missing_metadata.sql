@@ -0,0 +1,40 @@
+INSERT INTO posts_meta (
+	id,
+	post_id,
+	meta_title,
+	meta_description,
+	og_title,
+	og_description,
+	twitter_title,
+	twitter_description,
+	email_only
+)
+SELECT
+	LOWER(SUBSTRING(REPLACE(UUID(), '-', ''), 1, 24)),
+	posts.id,
+	posts.title,
+	posts.custom_excerpt,
+	posts.title,
+	posts.custom_excerpt,
+	posts.title,
+	posts.custom_excerpt,
+	0
+FROM
+	posts
+	LEFT JOIN posts_meta AS existing_meta ON posts.id = existing_meta.post_id
+WHERE
+	posts.type = 'post'
+	AND (existing_meta.id IS NULL
+		OR existing_meta.meta_title IS NULL
+		OR existing_meta.meta_description IS NULL
+		OR existing_meta.og_title IS NULL
+		OR existing_meta.og_description IS NULL
+		OR existing_meta.twitter_title IS NULL
+		OR existing_meta.twitter_description IS NULL)
+ON DUPLICATE KEY UPDATE
+	meta_title = COALESCE(posts_meta.meta_title, VALUES(meta_title)),
+	meta_description = COALESCE(posts_meta.meta_description, VALUES(meta_description)),
+	og_title = COALESCE(posts_meta.og_title, VALUES(og_title)),
+	og_description = COALESCE(posts_meta.og_description, VALUES(og_description)),
+	twitter_title = COALESCE(posts_meta.twitter_title, VALUES(twitter_title)),
+	twitter_description = COALESCE(posts_meta.twitter_description, VALUES(twitter_description));
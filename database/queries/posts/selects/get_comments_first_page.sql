@@ -0,0 +1,17 @@
+-- Keyset pages of comments are served by the `comments_status_edited_at_id` index declared in `database/models.py`.
+SELECT
+	id,
+	post_id,
+	member_id,
+	parent_id,
+	html,
+	edited_at,
+	created_at
+FROM
+	comments
+WHERE
+	status = 'published'
+ORDER BY
+	edited_at DESC,
+	id DESC
+LIMIT :limit;
@@ -0,0 +1,22 @@
+-- Page of edited comments following a comment with a non-null `edited_at`; uses `comments_status_edited_at_id`.
+-- Comments never edited sort after all edited comments, & are fetched by `get_comments_unedited_first_page.sql` once these run out.
+SELECT
+	id,
+	post_id,
+	member_id,
+	parent_id,
+	html,
+	edited_at,
+	created_at
+FROM
+	comments
+WHERE
+	status = 'published'
+	AND (
+		edited_at < :cursor_at
+		OR (edited_at = :cursor_at AND id < :cursor_id)
+	)
+ORDER BY
+	edited_at DESC,
+	id DESC
+LIMIT :limit;
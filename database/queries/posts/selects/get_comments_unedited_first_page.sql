@@ -0,0 +1,17 @@
+-- First page of comments which were never edited, following the last edited comment; uses `comments_status_edited_at_id`.
+SELECT
+	id,
+	post_id,
+	member_id,
+	parent_id,
+	html,
+	edited_at,
+	created_at
+FROM
+	comments
+WHERE
+	status = 'published'
+	AND edited_at IS NULL
+ORDER BY
+	id DESC
+LIMIT :limit;
@@ -0,0 +1,18 @@
+-- Page following a comment which was never edited; uses `comments_status_edited_at_id`.
+SELECT
+	id,
+	post_id,
+	member_id,
+	parent_id,
+	html,
+	edited_at,
+	created_at
+FROM
+	comments
+WHERE
+	status = 'published'
+	AND edited_at IS NULL
+	AND id < :cursor_id
+ORDER BY
+	id DESC
+LIMIT :limit;
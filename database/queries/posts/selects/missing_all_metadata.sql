@@ -0,0 +1,18 @@
+SELECT
+	posts.id,
+	posts.slug,
+	posts.title,
+	posts.custom_excerpt,
+	DATE_FORMAT(posts.updated_at, '%Y-%m-%dT%H:%i:%s.000Z') AS updated_at
+FROM
+	posts
+	LEFT JOIN posts_meta ON posts.id = posts_meta.post_id
+WHERE
+	posts.type = 'post'
+	AND (posts_meta.id IS NULL
+		OR posts_meta.meta_title IS NULL
+		OR posts_meta.meta_description IS NULL
+		OR posts_meta.og_title IS NULL
+		OR posts_meta.og_description IS NULL
+		OR posts_meta.twitter_title IS NULL
+		OR posts_meta.twitter_description IS NULL);
@@ -16,6 +16,7 @@ class NewDonation(BaseModel):
     message: Optional[str] = Field(None, example="Great tutorials but this is a test message.")
     link: str = Field(None, example="https://buymeacoffee.com/hackersslackers/c/fake")
     coffee_id: int = Field(None, example=3453543)
+    created_at: Optional[datetime] = Field(None, example="2021-06-01T12:00:00")
     # fmt: on
 
     class Config:
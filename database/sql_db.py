@@ -1,54 +1,404 @@
 """Database client."""
 
-from typing import List, Optional
+import asyncio
+from contextlib import asynccontextmanager
+from itertools import islice
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from time import sleep
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from uuid import uuid4
 
 from pandas import DataFrame
-from sqlalchemy import MetaData, Table, create_engine, text
-from sqlalchemy.engine import CursorResult
-from sqlalchemy.engine.result import Result
+from sqlalchemy import MetaData, Table, column, inspect, table, text
+from sqlalchemy.engine import Connection, CursorResult
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.sql.elements import TextClause
 
+from config import settings
+from database.engines import get_async_engine, get_engine
+from database.statements import (
+    UpdateStatement,
+    chunk_boundary_sql,
+    chunk_update_sql,
+    parse_update,
+    summarize_plan,
+)
 from log import LOGGER
 
 metadata_obj = MetaData()
 
+SKIPPED_QUERY = "Skipped; 0 rows matched."
+
+# Characters escaped in `LOAD DATA` input using MySQL's default `ESCAPED BY '\\'`
+LOAD_DATA_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r", "\0": "\\0"})
+
+
+def chunked(rows: Iterable[dict], chunk_size: int) -> Iterator[List[dict]]:
+    """
+    Split rows into lists of at most `chunk_size` rows without materializing all of them.
+
+    :param Iterable[dict] rows: Rows to split.
+    :param int chunk_size: Maximum number of rows per chunk.
+
+    :returns: Iterator[List[dict]]
+    """
+    rows = iter(rows)
+    while chunk := list(islice(rows, chunk_size)):
+        yield chunk
+
+
+def chunk_boundary(name: str, statement: UpdateStatement, key: str, lower, batch_size: int) -> Tuple[TextClause, dict]:
+    """
+    Build query & parameters fetching the last primary key of the next chunk of an `UPDATE` sweep.
+
+    :param str name: Name of query.
+    :param UpdateStatement statement: Parsed single-table `UPDATE` statement.
+    :param str key: Primary key column of updated table.
+    :param lower: Last primary key of the previous chunk, if any.
+    :param int batch_size: Number of rows per chunk.
+
+    :returns: Tuple[TextClause, dict]
+    """
+    query = text(chunk_boundary_sql(statement, key, lower is not None)).execution_options(query_name=f"chunk:{name}")
+    params = {"offset": batch_size - 1}
+    if lower is not None:
+        params["lower"] = lower
+    return query, params
+
+
+def chunk_update(name: str, statement: UpdateStatement, key: str, lower, upper) -> Tuple[TextClause, dict]:
+    """
+    Build `UPDATE` & parameters restricted to the primary key range of a chunk.
+
+    :param str name: Name of query.
+    :param UpdateStatement statement: Parsed single-table `UPDATE` statement.
+    :param str key: Primary key column of updated table.
+    :param lower: Last primary key of the previous chunk, if any.
+    :param upper: Last primary key of this chunk, or `None` for the final chunk.
+
+    :returns: Tuple[TextClause, dict]
+    """
+    query = text(chunk_update_sql(statement, key, lower is not None, upper is not None))
+    params = {name: value for name, value in (("lower", lower), ("upper", upper)) if value is not None}
+    return query.execution_options(query_name=name), params
+
+
+def query_file_name(sql_file: str) -> str:
+    """
+    Name a query after its SQL file, relative to the `queries` directory.
+
+    :param str sql_file: Filepath of SQL query.
+
+    :returns: str
+    """
+    path = Path(sql_file)
+    parts = path.with_suffix("").parts
+    return "/".join(parts[parts.index("queries") + 1 :]) if "queries" in parts else path.stem
+
+
+def staging_table_name(table_name: str, role: str) -> str:
+    """
+    Name a transient copy of a table uniquely, so concurrent replacements of the same table never collide.
+
+    :param str table_name: Name of database table.
+    :param str role: Purpose of copy (ie: `staging`, `retired`).
+
+    :returns: str
+    """
+    return f"{table_name}__{role}_{uuid4().hex[:8]}"
+
+
+def load_data_value(value) -> str:
+    """
+    Serialize a value as a field of tab-separated `LOAD DATA` input.
+
+    :param value: Column value.
+
+    :returns: str
+    """
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return str(int(value))
+    return str(value).translate(LOAD_DATA_ESCAPES)
+
 
 class Database:
     """Database client."""
 
     def __init__(self, uri: str, db_name: str, args: dict):
-        self.db = create_engine(f"{uri}/{db_name}", connect_args=args, echo=False)
+        self.db = get_engine(uri, db_name, args)
+        self._engine_args = (uri, db_name, args)
+        self._metadata = MetaData()
+        self._tables: Dict[str, Table] = {}
+        self._primary_keys: Dict[str, Optional[str]] = {}
+        self._tables_lock = Lock()
+
+    @property
+    def async_db(self) -> AsyncEngine:
+        """Asyncio engine of database, created on first use so databases only queried synchronously skip its pool."""
+        return get_async_engine(*self._engine_args)
 
     def _table(self, table_name: str) -> Table:
         """
-        Build database table object.
+        Reflect database table object, reusing it on subsequent calls.
 
         :param str table_name: Name of database table to fetch
 
         :returns: Table
         """
-        return Table(table_name, MetaData, autoload=True)
+        with self._tables_lock:
+            if table_name not in self._tables:
+                self._tables[table_name] = Table(table_name, self._metadata, autoload_with=self.db)
+            return self._tables[table_name]
 
-    def execute_queries(self, queries: dict) -> dict:
+    def _forget_table(self, table_name: str) -> None:
         """
-        Execute collection of SQL analytics.
+        Drop cached reflection of a table whose schema may have changed.
+
+        :param str table_name: Name of database table.
+        """
+        with self._tables_lock:
+            cached = self._tables.pop(table_name, None)
+            if cached is not None:
+                self._metadata.remove(cached)
+
+    def execute_queries(
+        self,
+        queries: dict,
+        dry_run: bool = False,
+        skip_unaffected: Optional[bool] = None,
+        batch_size: Optional[int] = None,
+    ) -> Optional[dict]:
+        """
+        Execute collection of SQL analytics, each in its own transaction.
+
+        `UPDATE` statements can first have their predicate counted with a non-locking `SELECT COUNT(*)`:
+        in `dry_run` mode nothing is written & each statement's match count & `EXPLAIN` plan are reported,
+        while `skip_unaffected` skips statements which match no rows. Single-table `UPDATE` statements are
+        executed in primary key ranges of `batch_size` rows, committing & pausing between chunks.
 
         :param dict queries: Map of query names -> SQL analytics.
+        :param bool dry_run: Report rows each statement would match & its query plan without executing it.
+        :param Optional[bool] skip_unaffected: Skip statements matching zero rows; defaults to setting.
+        :param Optional[int] batch_size: Rows per chunk of `UPDATE` sweeps (0 to disable); defaults to setting.
 
-        :returns: dict
+        :returns: Optional[dict]
         """
+        if skip_unaffected is None:
+            skip_unaffected = settings.SQLALCHEMY_SKIP_UNAFFECTED_QUERIES
+        if batch_size is None:
+            batch_size = settings.SQLALCHEMY_UPDATE_BATCH_SIZE
         try:
             results = {}
+            for k, v in queries.items():
+                statement = parse_update(v)
+                if dry_run:
+                    results[k] = self._preview_update(k, v, statement)
+                    continue
+                if skip_unaffected and statement is not None and self._count_matches(k, statement) == 0:
+                    results[k] = SKIPPED_QUERY
+                    continue
+                key = self._chunk_key(statement) if batch_size else None
+                if key is not None:
+                    affected = self._execute_update_in_chunks(k, statement, key, batch_size)
+                else:
+                    with self.db.begin() as conn:
+                        affected = conn.execute(text(v).execution_options(query_name=k)).rowcount
+                results[k] = f"{affected} rows affected."
+            return results
+        except SQLAlchemyError as e:
+            LOGGER.error(f"SQLAlchemyError while executing queries `{','.join(queries.keys())}`: {e}")
+        except Exception as e:
+            LOGGER.error(f"Unexpected exception while executing queries `{','.join(queries.keys())}`: {e}")
+
+    def _preview_update(self, name: str, query: str, statement: Optional[UpdateStatement]) -> dict:
+        """
+        Report rows an `UPDATE` would match & its query plan without executing it.
+
+        :param str name: Name of query.
+        :param str query: SQL query.
+        :param Optional[UpdateStatement] statement: Parsed `UPDATE` statement.
+
+        :returns: dict
+        """
+        if statement is None:
+            return {"matched_rows": None, "error": "Only UPDATE statements can be previewed."}
+        with self.db.connect() as conn:
+            explain_query = text(f"EXPLAIN FORMAT=JSON {query}").execution_options(query_name=f"explain:{name}")
+            plan = conn.execute(explain_query).scalar()
+        return {"matched_rows": self._count_matches(name, statement), **summarize_plan(plan)}
+
+    def _count_matches(self, name: str, statement: UpdateStatement) -> int:
+        """
+        Count rows matched by an `UPDATE` statement's predicate.
+
+        :param str name: Name of query.
+        :param UpdateStatement statement: Parsed `UPDATE` statement.
+
+        :returns: int
+        """
+        with self.db.connect() as conn:
+            return conn.execute(text(statement.count_sql()).execution_options(query_name=f"count:{name}")).scalar()
+
+    def _chunk_key(self, statement: Optional[UpdateStatement]) -> Optional[str]:
+        """
+        Find single-column primary key to split an `UPDATE` by, if it targets a single table.
+
+        :param Optional[UpdateStatement] statement: Parsed `UPDATE` statement.
+
+        :returns: Optional[str]
+        """
+        if statement is None or statement.table is None:
+            return None
+        if statement.table not in self._primary_keys:
+            with self.db.connect() as conn:
+                columns = inspect(conn).get_pk_constraint(statement.table)["constrained_columns"]
+            self._primary_keys[statement.table] = columns[0] if len(columns) == 1 else None
+        return self._primary_keys[statement.table]
+
+    def _execute_update_in_chunks(self, name: str, statement: UpdateStatement, key: str, batch_size: int) -> int:
+        """
+        Execute single-table `UPDATE` over consecutive primary key ranges, committing each range separately.
+
+        :param str name: Name of query.
+        :param UpdateStatement statement: Parsed single-table `UPDATE` statement.
+        :param str key: Primary key column of updated table.
+        :param int batch_size: Number of rows per primary key range.
+
+        :returns: int
+        """
+        affected, lower = 0, None
+        while True:
             with self.db.begin() as conn:
-                for k, v in queries.items():
-                    query_result = conn.execute(v)
-                    results[k] = f"{query_result.rowcount} rows affected."
-                return results
+                upper = conn.execute(*chunk_boundary(name, statement, key, lower, batch_size)).scalar()
+                affected += conn.execute(*chunk_update(name, statement, key, lower, upper)).rowcount
+            if upper is None:
+                return affected
+            lower = upper
+            sleep(settings.SQLALCHEMY_UPDATE_BATCH_PAUSE)
+
+    async def execute_queries_async(
+        self,
+        queries: dict,
+        dry_run: bool = False,
+        skip_unaffected: Optional[bool] = None,
+        batch_size: Optional[int] = None,
+    ) -> Optional[dict]:
+        """
+        Execute collection of SQL queries without blocking the event loop.
+
+        Accepts the same `dry_run`, `skip_unaffected` & `batch_size` modes as `execute_queries`.
+
+        :param dict queries: Map of query names -> SQL queries.
+        :param bool dry_run: Report rows each statement would match & its query plan without executing it.
+        :param Optional[bool] skip_unaffected: Skip statements matching zero rows; defaults to setting.
+        :param Optional[int] batch_size: Rows per chunk of `UPDATE` sweeps (0 to disable); defaults to setting.
+
+        :returns: Optional[dict]
+        """
+        if skip_unaffected is None:
+            skip_unaffected = settings.SQLALCHEMY_SKIP_UNAFFECTED_QUERIES
+        if batch_size is None:
+            batch_size = settings.SQLALCHEMY_UPDATE_BATCH_SIZE
+        try:
+            results = {}
+            for k, v in queries.items():
+                statement = parse_update(v)
+                if dry_run:
+                    results[k] = await self._preview_update_async(k, v, statement)
+                    continue
+                if skip_unaffected and statement is not None and await self._count_matches_async(k, statement) == 0:
+                    results[k] = SKIPPED_QUERY
+                    continue
+                key = await self._chunk_key_async(statement) if batch_size else None
+                if key is not None:
+                    affected = await self._execute_update_in_chunks_async(k, statement, key, batch_size)
+                else:
+                    async with self.async_db.begin() as conn:
+                        affected = (await conn.execute(text(v).execution_options(query_name=k))).rowcount
+                results[k] = f"{affected} rows affected."
+            return results
         except SQLAlchemyError as e:
             LOGGER.error(f"SQLAlchemyError while executing queries `{','.join(queries.keys())}`: {e}")
         except Exception as e:
             LOGGER.error(f"Unexpected exception while executing queries `{','.join(queries.keys())}`: {e}")
 
+    async def _preview_update_async(self, name: str, query: str, statement: Optional[UpdateStatement]) -> dict:
+        """
+        Report rows an `UPDATE` would match & its query plan without executing it.
+
+        :param str name: Name of query.
+        :param str query: SQL query.
+        :param Optional[UpdateStatement] statement: Parsed `UPDATE` statement.
+
+        :returns: dict
+        """
+        if statement is None:
+            return {"matched_rows": None, "error": "Only UPDATE statements can be previewed."}
+        async with self.async_db.connect() as conn:
+            explain_query = text(f"EXPLAIN FORMAT=JSON {query}").execution_options(query_name=f"explain:{name}")
+            plan = (await conn.execute(explain_query)).scalar()
+        return {"matched_rows": await self._count_matches_async(name, statement), **summarize_plan(plan)}
+
+    async def _count_matches_async(self, name: str, statement: UpdateStatement) -> int:
+        """
+        Count rows matched by an `UPDATE` statement's predicate.
+
+        :param str name: Name of query.
+        :param UpdateStatement statement: Parsed `UPDATE` statement.
+
+        :returns: int
+        """
+        async with self.async_db.connect() as conn:
+            count_query = text(statement.count_sql()).execution_options(query_name=f"count:{name}")
+            return (await conn.execute(count_query)).scalar()
+
+    async def _chunk_key_async(self, statement: Optional[UpdateStatement]) -> Optional[str]:
+        """
+        Find single-column primary key to split an `UPDATE` by, if it targets a single table.
+
+        :param Optional[UpdateStatement] statement: Parsed `UPDATE` statement.
+
+        :returns: Optional[str]
+        """
+        if statement is None or statement.table is None:
+            return None
+        if statement.table not in self._primary_keys:
+            async with self.async_db.connect() as conn:
+                constraint = await conn.run_sync(
+                    lambda sync_conn: inspect(sync_conn).get_pk_constraint(statement.table)
+                )
+            columns = constraint["constrained_columns"]
+            self._primary_keys[statement.table] = columns[0] if len(columns) == 1 else None
+        return self._primary_keys[statement.table]
+
+    async def _execute_update_in_chunks_async(
+        self, name: str, statement: UpdateStatement, key: str, batch_size: int
+    ) -> int:
+        """
+        Execute single-table `UPDATE` over consecutive primary key ranges, committing each range separately.
+
+        :param str name: Name of query.
+        :param UpdateStatement statement: Parsed single-table `UPDATE` statement.
+        :param str key: Primary key column of updated table.
+        :param int batch_size: Number of rows per primary key range.
+
+        :returns: int
+        """
+        affected, lower = 0, None
+        while True:
+            async with self.async_db.begin() as conn:
+                upper = (await conn.execute(*chunk_boundary(name, statement, key, lower, batch_size))).scalar()
+                affected += (await conn.execute(*chunk_update(name, statement, key, lower, upper))).rowcount
+            if upper is None:
+                return affected
+            lower = upper
+            await asyncio.sleep(settings.SQLALCHEMY_UPDATE_BATCH_PAUSE)
+
     def execute_query(self, query: str) -> Optional[CursorResult]:
         """
         Execute single SQL query.
@@ -63,18 +413,22 @@ class Database:
         except SQLAlchemyError as e:
             LOGGER.error(f"Failed to execute SQL query {query}: {e}")
 
-    def execute_query_from_file(self, sql_file: str) -> Optional[CursorResult]:
+    def execute_query_from_file(
+        self, sql_file: str, params: Optional[Union[dict, List[dict]]] = None
+    ) -> Optional[CursorResult]:
         """
         Execute single SQL query.
 
         :param str sql_file: Filepath of SQL query to run.
+        :param Optional[Union[dict, List[dict]]] params: Values of bound parameters in query; a list executes it per item.
 
         :returns: Optional[CursorResult]
         """
         try:
             with self.db.begin() as conn:
                 with open(sql_file, "r", encoding="utf-8") as query:
-                    return conn.execute(text(query))
+                    sql_query = text(query.read()).execution_options(query_name=query_file_name(sql_file))
+                    return conn.execute(sql_query, params or {})
         except SQLAlchemyError as e:
             LOGGER.error(f"SQLAlchemyError while executing SQL `{sql_file}`: {e}")
             return f"Failed to execute SQL `{sql_file}`: {e}"
@@ -82,38 +436,220 @@ class Database:
             LOGGER.error(f"Unexpected exception while executing SQL `{sql_file}`: {e}")
             return f"Failed to execute SQL `{sql_file}`: {e}"
 
-    def insert_records(self, rows: List[dict], table_name: str, replace=False) -> Result:
+    def fetch_records_from_file(self, sql_file: str, params: Optional[dict] = None) -> List[dict]:
         """
-        Insert rows into SQL table.
+        Execute SELECT query from a file & return resulting rows as dictionaries.
 
-        :param List[dict] rows: List of dictionaries to insert where keys are columns.
-        :param str table_name: Name of database table to fetch.
-        :param bool replace: Flag to truncate table prior to insert.
+        :param str sql_file: Filepath of SQL query to run.
+        :param Optional[dict] params: Values of bound parameters in query.
 
-        :returns: Result
+        :returns: List[dict]
         """
         try:
+            with open(sql_file, "r", encoding="utf-8") as query:
+                sql_query = query.read()
+            with self.db.connect() as conn:
+                result = conn.execute(
+                    text(sql_query).execution_options(query_name=query_file_name(sql_file)), params or {}
+                )
+                return [dict(row._mapping) for row in result]
+        except SQLAlchemyError as e:
+            LOGGER.error(f"SQLAlchemyError while fetching records from SQL `{sql_file}`: {e}")
+        except Exception as e:
+            LOGGER.error(f"Unexpected exception while fetching records from SQL `{sql_file}`: {e}")
+        return []
+
+    async def fetch_records_from_file_async(self, sql_file: str, params: Optional[dict] = None) -> List[dict]:
+        """
+        Execute SELECT query from a file without blocking the event loop & return resulting rows as dictionaries.
+
+        :param str sql_file: Filepath of SQL query to run.
+        :param Optional[dict] params: Values of bound parameters in query.
+
+        :returns: List[dict]
+        """
+        try:
+            with open(sql_file, "r", encoding="utf-8") as query:
+                sql_query = query.read()
+            async with self.async_db.connect() as conn:
+                result = await conn.execute(
+                    text(sql_query).execution_options(query_name=query_file_name(sql_file)), params or {}
+                )
+                return [dict(row._mapping) for row in result]
+        except SQLAlchemyError as e:
+            LOGGER.error(f"SQLAlchemyError while fetching records from SQL `{sql_file}`: {e}")
+        except Exception as e:
+            LOGGER.error(f"Unexpected exception while fetching records from SQL `{sql_file}`: {e}")
+        return []
+
+    async def stream_records_from_file_async(
+        self, sql_file: str, params: Optional[dict] = None, batch_size: int = 500
+    ) -> AsyncIterator[dict]:
+        """
+        Execute SELECT query from a file with a server-side cursor, yielding rows as they are fetched.
+
+        Only `batch_size` rows are held in memory at once; the connection is held until the iterator is exhausted.
+
+        :param str sql_file: Filepath of SQL query to run.
+        :param Optional[dict] params: Values of bound parameters in query.
+        :param int batch_size: Number of rows fetched from the server per round trip.
+
+        :returns: AsyncIterator[dict]
+        """
+        with open(sql_file, "r", encoding="utf-8") as query:
+            sql_query = query.read()
+        async with self.async_db.connect() as conn:
+            result = await conn.stream(
+                text(sql_query),
+                params or {},
+                execution_options={"yield_per": batch_size, "query_name": query_file_name(sql_file)},
+            )
+            async for row in result:
+                yield dict(row._mapping)
+
+    @asynccontextmanager
+    async def named_lock_async(self, name: str, timeout: float = 0) -> AsyncIterator[bool]:
+        """
+        Hold a MySQL named lock (`GET_LOCK`) for the duration of the block, shared by every worker & process.
+
+        Yields whether the lock was acquired within `timeout` seconds; callers should skip their work when it wasn't.
+
+        :param str name: Name of lock.
+        :param float timeout: Seconds to wait for the lock to be released by its current holder.
+
+        :returns: AsyncIterator[bool]
+        """
+        async with self.async_db.connect() as conn:
+            acquired = await conn.scalar(text("SELECT GET_LOCK(:name, :timeout)"), {"name": name, "timeout": timeout})
+            try:
+                yield acquired == 1
+            finally:
+                if acquired == 1:
+                    await conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": name})
+
+    def insert_records(
+        self,
+        rows: Iterable[dict],
+        table_name: str,
+        replace: bool = False,
+        chunk_size: Optional[int] = None,
+    ) -> Optional[int]:
+        """
+        Insert rows into SQL table in chunks of multi-row INSERTs (or `LOAD DATA LOCAL INFILE` when enabled).
+
+        When replacing, rows are loaded into a uniquely named staging copy of the table which is then atomically
+        swapped in place, so readers never see the table empty or partially loaded.
+
+        :param Iterable[dict] rows: Dictionaries to insert where keys are columns; may be a generator.
+        :param str table_name: Name of database table to insert into.
+        :param bool replace: Flag to replace existing contents of table.
+        :param Optional[int] chunk_size: Number of rows per INSERT statement.
+
+        :returns: Optional[int]
+        """
+        chunk_size = chunk_size or settings.SQLALCHEMY_INSERT_CHUNK_SIZE
+        staging_name = staging_table_name(table_name, "staging")
+        try:
+            columns = self._table(table_name).columns.keys()
+            target_name = table_name
+            if replace:
+                with self.db.begin() as conn:
+                    conn.execute(text(f"CREATE TABLE `{staging_name}` LIKE `{table_name}`"))
+                target_name = staging_name
+            target = table(target_name, *[column(name) for name in columns])
+            inserted = 0
+            with self.db.begin() as conn:
+                for chunk in chunked(rows, chunk_size):
+                    if settings.SQLALCHEMY_LOAD_DATA_LOCAL_INFILE:
+                        self._load_data(conn, target_name, chunk)
+                    else:
+                        # `pymysql` rewrites executemany() of an INSERT into a single multi-row INSERT
+                        conn.execute(target.insert().execution_options(query_name=f"insert:{table_name}"), chunk)
+                    inserted += len(chunk)
             if replace:
-                self.db.execute(f"TRUNCATE TABLE {table_name}")
-            table = self._table(table_name)
-            return self.db.execute(table.insert(), rows)
+                self._swap_tables(table_name, staging_name)
+            LOGGER.info(f"Inserted {inserted} rows into `{table_name}`{' (replaced)' if replace else ''}.")
+            return inserted
         except IntegrityError as e:
             LOGGER.error(f"IntegrityError error while inserting records into table `{table_name}`: {e}")
         except SQLAlchemyError as e:
             LOGGER.error(f"SQLAlchemyError while inserting records into table `{table_name}`: {e}")
         except Exception as e:
             LOGGER.error(f"Unexpected error while inserting records into table `{table_name}`: {e}")
+        finally:
+            if replace:
+                self._drop_table(staging_name)
+
+    @staticmethod
+    def _load_data(conn: Connection, table_name: str, rows: List[dict]) -> None:
+        """
+        Bulk load rows via `LOAD DATA LOCAL INFILE`, requiring `local_infile` on both client & server.
+
+        :param Connection conn: Open database connection.
+        :param str table_name: Name of database table to load into.
+        :param List[dict] rows: Rows sharing the same keys.
+        """
+        columns = list(rows[0].keys())
+        with NamedTemporaryFile("w", encoding="utf-8", suffix=".tsv") as f:
+            for row in rows:
+                f.write("\t".join(load_data_value(row.get(name)) for name in columns) + "\n")
+            f.flush()
+            conn.exec_driver_sql(
+                f"LOAD DATA LOCAL INFILE '{f.name}' INTO TABLE `{table_name}` CHARACTER SET utf8mb4 "
+                f"({', '.join(f'`{name}`' for name in columns)})"
+            )
+
+    def _swap_tables(self, table_name: str, staging_name: str) -> None:
+        """
+        Atomically replace a table with its fully loaded staging copy.
+
+        :param str table_name: Name of live database table.
+        :param str staging_name: Name of staging table to swap in.
+        """
+        retired_name = staging_table_name(table_name, "retired")
+        with self.db.begin() as conn:
+            if inspect(conn).has_table(table_name):
+                conn.execute(
+                    text(f"RENAME TABLE `{table_name}` TO `{retired_name}`, `{staging_name}` TO `{table_name}`")
+                )
+                conn.execute(text(f"DROP TABLE `{retired_name}`"))
+            else:
+                conn.execute(text(f"RENAME TABLE `{staging_name}` TO `{table_name}`"))
+        self._forget_table(table_name)
+
+    def _drop_table(self, table_name: str) -> None:
+        """
+        Drop a leftover transient table, if it still exists.
+
+        :param str table_name: Name of database table.
+        """
+        try:
+            with self.db.begin() as conn:
+                conn.execute(text(f"DROP TABLE IF EXISTS `{table_name}`"))
+        except SQLAlchemyError as e:
+            LOGGER.error(f"SQLAlchemyError while dropping table `{table_name}`: {e}")
 
     def insert_dataframe(self, df: DataFrame, table_name: str, action="append") -> DataFrame:
         """
-        Insert Pandas DataFrame into SQL table.
+        Insert Pandas DataFrame into SQL table using chunked multi-row INSERTs.
+
+        Replacing loads a staging table which is then atomically swapped in place of `table_name`.
 
         :param DataFrame df: Tabular data to insert into SQL table.
         :param str table_name: Name of database table to insert into.
-        :param str action: Method of dealing with duplicate rows.
+        :param str action: Method of dealing with existing table (`append`, `replace`, or `fail`).
 
         :returns: DataFrame
         """
-        df.to_sql(table_name, self.db, if_exists=action)
+        chunk_size = settings.SQLALCHEMY_INSERT_CHUNK_SIZE
+        if action == "replace":
+            staging_name = staging_table_name(table_name, "staging")
+            try:
+                df.to_sql(staging_name, self.db, if_exists="fail", method="multi", chunksize=chunk_size)
+                self._swap_tables(table_name, staging_name)
+            finally:
+                self._drop_table(staging_name)
+        else:
+            df.to_sql(table_name, self.db, if_exists=action, method="multi", chunksize=chunk_size)
         LOGGER.info(f"Updated {len(df)} rows via {action} into `{table_name}`.")
         return df
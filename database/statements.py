@@ -0,0 +1,161 @@
+"""Parse maintenance `UPDATE` statements to preview the rows they would touch."""
+
+import json
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+CLAUSE_KEYWORDS = ("SET", "WHERE", "ORDER BY", "LIMIT")
+
+
+class UpdateStatement(NamedTuple):
+    """Clauses of a (single or multi-table) MySQL `UPDATE` statement."""
+
+    tables: str
+    assignments: str
+    where: Optional[str]
+
+    @property
+    def table(self) -> Optional[str]:
+        """Name of the updated table, unless the statement updates or joins several tables."""
+        if "," in self.tables or top_level_keywords(self.tables, ("JOIN",)) or len(self.tables.split()) > 1:
+            return None
+        return self.tables.strip("`")
+
+    def count_sql(self) -> str:
+        """
+        Build `SELECT COUNT(*)` of rows matched by the statement's predicate, without taking write locks.
+
+        :returns: str
+        """
+        where = f" WHERE {self.where}" if self.where else ""
+        return f"SELECT COUNT(*) FROM {self.tables}{where}"
+
+
+def top_level_keywords(sql: str, keywords: Iterable[str]) -> List[Tuple[str, int]]:
+    """
+    Locate keywords appearing outside of string literals, identifiers & parentheses.
+
+    :param str sql: SQL statement.
+    :param Iterable[str] keywords: Keywords to locate (ie: `WHERE`).
+
+    :returns: List[Tuple[str, int]]
+    """
+    upper = sql.upper()
+    found, depth, quote, i = [], 0, None, 0
+    while i < len(sql):
+        char = sql[i]
+        if quote:
+            if char == "\\" and quote != "`":
+                i += 1
+            elif char == quote:
+                quote = None
+        elif char in ("'", '"', "`"):
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif depth == 0 and (i == 0 or not (sql[i - 1].isalnum() or sql[i - 1] == "_")):
+            for keyword in keywords:
+                end = i + len(keyword)
+                if upper.startswith(keyword, i) and (end == len(sql) or not (sql[end].isalnum() or sql[end] == "_")):
+                    found.append((keyword, i))
+                    i = end - 1
+                    break
+        i += 1
+    return found
+
+
+def parse_update(sql: str) -> Optional[UpdateStatement]:
+    """
+    Split an `UPDATE` statement into its tables, assignments & predicate.
+
+    :param str sql: SQL statement.
+
+    :returns: Optional[UpdateStatement]
+    """
+    statement = sql.strip().rstrip(";").strip()
+    if not statement[:6].upper() == "UPDATE" or not statement[6:7].isspace():
+        return None
+    clauses = top_level_keywords(statement, CLAUSE_KEYWORDS)
+    positions = {keyword: position for keyword, position in reversed(clauses)}
+    if "SET" not in positions:
+        return None
+    ends = sorted(position for position in positions.values()) + [len(statement)]
+
+    def clause(keyword: str) -> Optional[str]:
+        if keyword not in positions:
+            return None
+        start = positions[keyword]
+        end = next(position for position in ends if position > start)
+        return statement[start + len(keyword) : end].strip()
+
+    return UpdateStatement(statement[6 : positions["SET"]].strip(), clause("SET"), clause("WHERE"))
+
+
+def summarize_plan(explain_json: str) -> dict:
+    """
+    Extract estimated cost & rows examined from `EXPLAIN FORMAT=JSON` output.
+
+    :param str explain_json: JSON query plan returned by MySQL.
+
+    :returns: dict
+    """
+    plan = json.loads(explain_json)
+    query_block = plan.get("query_block", {})
+    rows_examined, access_types = 0, []
+
+    def walk(node):
+        nonlocal rows_examined
+        if isinstance(node, dict):
+            if "rows_examined_per_scan" in node:
+                rows_examined += int(node["rows_examined_per_scan"])
+            if "access_type" in node:
+                access_types.append(f"{node.get('table_name')}:{node['access_type']}")
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(query_block)
+    cost = query_block.get("cost_info", {}).get("query_cost")
+    return {
+        "estimated_cost": float(cost) if cost is not None else None,
+        "estimated_rows_examined": rows_examined,
+        "access": access_types,
+        "plan": plan,
+    }
+
+
+def chunk_boundary_sql(statement: UpdateStatement, key: str, has_lower: bool) -> str:
+    """
+    Build query for the key closing the next chunk of `:offset + 1` rows after `:lower`, using only the key index.
+
+    :param UpdateStatement statement: Single-table `UPDATE` to split into chunks.
+    :param str key: Primary key column of updated table.
+    :param bool has_lower: Whether chunk starts after a previous chunk.
+
+    :returns: str
+    """
+    lower = f" WHERE `{key}` > :lower" if has_lower else ""
+    return f"SELECT `{key}` FROM {statement.tables}{lower} ORDER BY `{key}` LIMIT 1 OFFSET :offset"
+
+
+def chunk_update_sql(statement: UpdateStatement, key: str, has_lower: bool, has_upper: bool) -> str:
+    """
+    Restrict `UPDATE` to rows whose primary key falls within `(:lower, :upper]`.
+
+    :param UpdateStatement statement: Single-table `UPDATE` to split into chunks.
+    :param str key: Primary key column of updated table.
+    :param bool has_lower: Whether chunk starts after a previous chunk.
+    :param bool has_upper: Whether chunk ends before the last row of the table.
+
+    :returns: str
+    """
+    conditions = [f"({statement.where})"] if statement.where else []
+    if has_lower:
+        conditions.append(f"`{key}` > :lower")
+    if has_upper:
+        conditions.append(f"`{key}` <= :upper")
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    return f"UPDATE {statement.tables} SET {statement.assignments}{where}"
@@ -51,11 +51,11 @@ def mailgun() -> Mailgun:
     """
     Initialize `Mail` client object.
 
-    :returns: Ghost
+    :returns: Mailgun
     """
     return Mailgun(
         settings.MAILGUN_EMAIL_SERVER,
-        settings.MAILGUN_FROM_SENDER,
+        f"{settings.MAILGUN_FROM_SENDER_NAME} <{settings.MAILGUN_FROM_SENDER_EMAIL}>",
         settings.MAILGUN_SENDER_API_KEY,
     )
 
@@ -0,0 +1,18 @@
+"""Test helpers of the bulk insert path."""
+
+from database.sql_db import chunked, load_data_value
+
+
+def test_chunked_consumes_generator_lazily():
+    """Split a generator of rows into bounded chunks."""
+    rows = ({"id": i} for i in range(7))
+    chunks = list(chunked(rows, 3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert chunks[-1] == [{"id": 6}]
+
+
+def test_load_data_value_escapes():
+    """Escape values the way `LOAD DATA` expects them by default."""
+    assert load_data_value(None) == "\\N"
+    assert load_data_value(True) == "1"
+    assert load_data_value("tab\there\nback\\slash") == "tab\\there\\nback\\\\slash"
@@ -0,0 +1,27 @@
+"""Test keyset pagination of Ghost comments."""
+
+import asyncio
+from datetime import datetime
+from pathlib import Path
+
+from app import accounts
+
+
+def test_comments_page_continues_with_unedited_comments(monkeypatch):
+    """Follow the last edited comments with unedited ones, each fetched by its own index range."""
+    edited = [{"id": "c2", "edited_at": datetime(2024, 1, 1)}]
+    unedited = [{"id": "c9", "edited_at": None}, {"id": "c8", "edited_at": None}]
+    queries = []
+
+    async def stub_fetch_records(sql_file, params):
+        queries.append((Path(sql_file).stem, params["limit"]))
+        rows = edited if "next_page" in sql_file else unedited
+        return rows[: params["limit"]]
+
+    monkeypatch.setattr(accounts.ghost_db, "fetch_records_from_file_async", stub_fetch_records)
+    params = {"limit": 2, "cursor_at": "2024-02-01 00:00:00", "cursor_id": "c3"}
+    page = asyncio.run(accounts.fetch_comments_page(params))
+
+    assert [comment["id"] for comment in page["comments"]] == ["c2", "c9"]
+    assert queries == [("get_comments_next_page", 2), ("get_comments_unedited_first_page", 1)]
+    assert page["next_cursor"] is not None
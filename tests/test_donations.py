@@ -0,0 +1,44 @@
+"""Test importing BuyMeACoffee donation history."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from database import crud
+from database.schemas import NewDonation
+
+
+class FailingSession:
+    """Session whose INSERT of the second chunk fails."""
+
+    def __init__(self):
+        self.executed = 0
+        self.calls = []
+
+    async def execute(self, statement):
+        self.executed += 1
+        if self.executed == 2:
+            raise OperationalError("INSERT", {}, Exception("Lost connection"))
+        return SimpleNamespace(rowcount=2)
+
+    async def commit(self):
+        self.calls.append("commit")
+
+    async def rollback(self):
+        self.calls.append("rollback")
+
+
+def test_import_rebuilds_aggregates_after_failed_chunk(monkeypatch):
+    """Rebuild aggregates from chunks committed before a later chunk failed."""
+    rebuilt = []
+
+    async def stub_rebuild(db):
+        rebuilt.append(db.calls[-1])
+
+    monkeypatch.setattr(crud, "rebuild_donation_aggregates", stub_rebuild)
+    donations = [NewDonation(coffee_id=i, email=f"{i}@example.com", name="Fan", count=1) for i in range(4)]
+    with pytest.raises(OperationalError):
+        asyncio.run(crud.import_donations(FailingSession(), donations, chunk_size=2))
+    assert rebuilt == ["rollback"]
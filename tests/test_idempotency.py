@@ -0,0 +1,89 @@
+"""Test suppression of duplicate webhook deliveries."""
+
+import asyncio
+
+from fastapi import Depends, FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app import idempotency
+from app.cache import TTLCache
+from app.idempotency import (
+    PENDING,
+    DuplicateDeliveryError,
+    WebhookDelivery,
+    delivery_key,
+    replay_duplicate_delivery,
+    webhook_delivery,
+)
+
+
+def webhook_app() -> FastAPI:
+    """Minimal app with a single idempotent webhook route."""
+    api = FastAPI()
+    api.add_exception_handler(DuplicateDeliveryError, replay_duplicate_delivery)
+
+    @api.post("/hook/")
+    async def hook(delivery: WebhookDelivery = Depends(webhook_delivery)):
+        return await delivery.save(JSONResponse({"processed": True}, status_code=201))
+
+    return api
+
+
+def test_delivery_key_prefers_delivery_id_header():
+    """Key deliveries by their delivery ID header, falling back to a fingerprint of the payload."""
+
+    class StubRequest:
+        def __init__(self, headers: dict, body: bytes):
+            self.headers = headers
+            self.url = type("URL", (), {"path": "/hook/"})()
+            self._body = body
+
+        async def body(self) -> bytes:
+            return self._body
+
+    by_header = asyncio.run(delivery_key(StubRequest({"x-github-delivery": "abc"}, b"{}")))
+    first = asyncio.run(delivery_key(StubRequest({}, b'{"id": 1}')))
+    second = asyncio.run(delivery_key(StubRequest({}, b'{"id": 1}')))
+    other = asyncio.run(delivery_key(StubRequest({}, b'{"id": 2}')))
+    assert by_header == "/hook/:abc"
+    assert first == second != other
+
+
+def test_ttl_cache_add_only_sets_missing_keys():
+    """Only the first of concurrent deliveries claims a key."""
+    cache = TTLCache(max_size=4, ttl=60)
+    assert cache.add("delivery", PENDING) is True
+    assert cache.add("delivery", PENDING) is False
+    cache.delete("delivery")
+    assert cache.add("delivery", PENDING, ttl=0) is True
+    assert cache.add("delivery", PENDING) is True
+
+
+def test_webhook_delivery_replays_and_rejects_duplicates(monkeypatch):
+    """Replay processed deliveries & reject deliveries which are still being processed."""
+    processed = {"/hook/:replayed": (201, {"processed": True})}
+
+    async def stub_processed_delivery(key: str):
+        return processed.get(key) or idempotency.deliveries.get(key)
+
+    async def stub_create_webhook_delivery(db, **kwargs):
+        processed[kwargs["key"]] = (kwargs["status_code"], kwargs["response"])
+
+    monkeypatch.setattr(idempotency, "processed_delivery", stub_processed_delivery)
+    monkeypatch.setattr(idempotency, "create_webhook_delivery", stub_create_webhook_delivery)
+    monkeypatch.setattr(idempotency, "deliveries", TTLCache(max_size=16, ttl=60))
+    client = TestClient(webhook_app())
+
+    replayed = client.post("/hook/", headers={"idempotency-key": "replayed"}, json={})
+    assert replayed.status_code == 201
+    assert replayed.json() == {"processed": True}
+    assert replayed.headers["Idempotent-Replayed"] == "true"
+
+    first = client.post("/hook/", headers={"idempotency-key": "new"}, json={})
+    assert first.status_code == 201
+    assert "Idempotent-Replayed" not in first.headers
+    assert processed["/hook/:new"] == (201, '{"processed": true}')
+
+    idempotency.deliveries.add("/hook/:pending", PENDING)
+    assert client.post("/hook/", headers={"idempotency-key": "pending"}, json={}).status_code == 409
@@ -0,0 +1,65 @@
+"""Test batching welcome emails to newsletter subscribers."""
+
+import asyncio
+import json
+from typing import List
+from urllib.parse import parse_qs
+
+from httpx import MockTransport, Request, Response
+
+from app.newsletter.newsletter import WelcomeEmails
+from clients.http import HttpClient
+from clients.mail import Mailgun
+from database.schemas import GhostMember
+
+
+def mock_mailgun(received: List[dict]) -> Mailgun:
+    """Mailgun client whose requests are recorded rather than sent."""
+
+    def handler(request: Request) -> Response:
+        received.append(parse_qs(request.content.decode()))
+        return Response(200, json={"message": "Queued. Thank you."})
+
+    http = HttpClient(
+        timeout=(1, 1),
+        max_retries=0,
+        backoff=0,
+        max_backoff=0,
+        max_connections=2,
+        failure_threshold=5,
+        reset_timeout=30,
+    )
+    return Mailgun(
+        "mail.example.com",
+        "Hackers and Slackers <noreply@example.com>",
+        "key",
+        http=http,
+        transport=MockTransport(handler),
+    )
+
+
+def test_welcome_emails_batched_within_window():
+    """Send welcome emails to subscribers signing up at once in a single request with recipient-variables."""
+    received = []
+    subscribers = [
+        GhostMember(id=str(i), uuid=str(i), email=f"user{i}@example.com", name=f"User {i}") for i in range(3)
+    ]
+
+    async def signup_burst():
+        welcome_emails = WelcomeEmails(mock_mailgun(received), window=0.05, max_batch=1000)
+        return await asyncio.gather(*(welcome_emails.send(subscriber) for subscriber in subscribers))
+
+    assert asyncio.run(signup_burst()) == [True, True, True]
+    assert len(received) == 1
+    assert received[0]["to"] == [subscriber.email for subscriber in subscribers]
+    assert json.loads(received[0]["recipient-variables"][0])["user1@example.com"] == {"name": "User 1"}
+    assert json.loads(received[0]["h:X-Mailgun-Variables"][0]) == {"name": "%recipient.name%"}
+
+
+def test_send_batch_splits_recipients_over_limit():
+    """Split batches over Mailgun's 1,000 recipient limit into concurrent requests."""
+    received = []
+    recipients = {f"user{i}@example.com": {"name": f"User {i}"} for i in range(2500)}
+    responses = asyncio.run(mock_mailgun(received).send_batch({"subject": "Hi"}, recipients))
+    assert [resp.status_code for resp in responses] == [200, 200, 200]
+    assert sorted(len(data["to"]) for data in received) == [500, 1000, 1000]
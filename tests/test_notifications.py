@@ -0,0 +1,106 @@
+"""Test queueing & sending notifications through the outbox."""
+
+import asyncio
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import github
+from app.notifications import outbox
+from database.models import Notification
+
+PR_PAYLOAD = {
+    "action": "opened",
+    "sender": {"login": "contributor"},
+    "pull_request": {"number": 7, "title": "Fix typo", "body": "", "url": "https://api.github.com/pulls/7"},
+    "repository": {"name": "blog", "full_name": "hackersandslackers/blog"},
+}
+
+
+def test_github_pr_queues_notification_without_sending(monkeypatch):
+    """Respond to webhooks as soon as their SMS is queued, rather than once Twilio sends it."""
+    queued = []
+
+    async def stub_enqueue_notification(channel, body, priority=False):
+        queued.append((channel, body))
+        return Notification(id=1, channel=channel, body=body, status="pending")
+
+    def unexpected_send_message(body):
+        raise AssertionError("SMS sent while handling webhook.")
+
+    monkeypatch.setattr(github, "enqueue_notification", stub_enqueue_notification)
+    monkeypatch.setattr(outbox.sms, "send_message", unexpected_send_message)
+    api = FastAPI()
+    api.include_router(github.router)
+    response = TestClient(api).post("/github/pr/", json=PR_PAYLOAD)
+
+    assert response.status_code == 200
+    assert response.json()["pr"]["status"] == "pending"
+    assert response.json()["sms"]["status_url"] == "/notifications/1/"
+    assert [channel for channel, _ in queued] == ["github"]
+
+
+def test_send_notification_retries_then_gives_up(monkeypatch):
+    """Schedule a retry after a failed attempt, until attempts are exhausted."""
+    outcomes = []
+
+    async def stub_complete_notification(db, notification, **outcome):
+        outcomes.append(outcome)
+
+    def failing_send_message(body):
+        raise RuntimeError("Twilio unavailable")
+
+    monkeypatch.setattr(outbox, "complete_notification", stub_complete_notification)
+    monkeypatch.setattr(outbox.settings, "NOTIFICATION_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(outbox.sms, "send_message", failing_send_message)
+    asyncio.run(outbox.send_notifications([Notification(id=1, channel="github", body="hi", attempts=1)]))
+    asyncio.run(outbox.send_notifications([Notification(id=1, channel="github", body="hi", attempts=2)]))
+    assert outcomes[0]["error"] == "Twilio unavailable"
+    assert outcomes[0]["retry_at"] is not None
+    assert outcomes[1]["retry_at"] is None
+
+    monkeypatch.setattr(outbox.sms, "send_message", lambda body: SimpleNamespace(sid="SM123"))
+    asyncio.run(outbox.send_notifications([Notification(id=1, channel="github", body="hi", attempts=3)]))
+    assert outcomes[2] == {"provider_id": "SM123"}
+
+
+def test_digests_notifications_per_channel(monkeypatch):
+    """Send a channel's notifications as one SMS, apart from priority notifications which are sent alone."""
+    sent, outcomes = [], []
+
+    async def stub_complete_notification(db, notification, **outcome):
+        outcomes.append((notification.id, outcome))
+
+    def send_message(body):
+        sent.append(body)
+        return SimpleNamespace(sid=f"SM{len(sent)}")
+
+    monkeypatch.setattr(outbox, "complete_notification", stub_complete_notification)
+    monkeypatch.setattr(outbox.sms, "send_message", send_message)
+    notifications = [
+        Notification(id=1, channel="github", body="PR opened", priority=False, attempts=1),
+        Notification(id=2, channel="authors", body="Post updated", priority=False, attempts=1),
+        Notification(id=3, channel="github", body="Issue opened", priority=True, attempts=1),
+        Notification(id=4, channel="github", body="PR closed", priority=False, attempts=1),
+    ]
+    digests = outbox.group_digests(notifications)
+    assert [[notification.id for notification in digest] for digest in digests] == [[1, 4], [2], [3]]
+    for digest in digests:
+        asyncio.run(outbox.send_notifications(digest))
+    assert sent == ["2 github notifications:\n- PR opened\n- PR closed", "Post updated", "Issue opened"]
+    assert dict(outcomes) == {
+        1: {"provider_id": "SM1"},
+        4: {"provider_id": "SM1"},
+        2: {"provider_id": "SM2"},
+        3: {"provider_id": "SM3"},
+    }
+
+
+def test_digest_body_summarizes_overflow():
+    """Summarize notifications which don't fit in a single SMS rather than cutting one off mid-message."""
+    notifications = [Notification(id=i, channel="authors", body=f"Post {i} updated") for i in range(100)]
+    body = outbox.digest_body(notifications, 160)
+    assert len(body) <= 160
+    assert body.startswith("100 authors notifications:\n- Post 0 updated")
+    assert body.endswith("more")
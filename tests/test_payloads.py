@@ -0,0 +1,56 @@
+"""Test fast-path parsing of Ghost post webhooks."""
+
+import json
+
+import pytest
+from fastapi import FastAPI
+
+from app import authors, images, posts
+from app.payloads import LeanPostUpdate
+from database.schemas import PostUpdate
+
+
+def test_lean_post_update_matches_post_update():
+    """Expose the same handler-facing fields as the fully validated `PostUpdate` model."""
+    current = PostUpdate.model_config["json_schema_extra"]["current"]
+    body = json.dumps({"post": {"current": current, "previous": {}}}).encode()
+    lean = LeanPostUpdate.from_json(body)
+    full = PostUpdate.model_validate_json(body)
+    assert lean.post.previous is None
+    for field in ("id", "slug", "title", "custom_excerpt", "feature_image", "html", "mobiledoc"):
+        assert getattr(lean.post.current, field) == getattr(full.post.current, field)
+    assert lean.post.current.updated_at == current["updated_at"]
+    assert lean.post.current.primary_author.name == full.post.current.primary_author.name
+    assert [author.id for author in lean.post.current.authors] == [author.id for author in full.post.current.authors]
+
+
+def test_lean_post_update_rejects_missing_required_fields():
+    """Reject payloads missing fields handlers rely on, as full validation would."""
+    current = dict(PostUpdate.model_config["json_schema_extra"]["current"])
+    for field in ("slug", "primary_author"):
+        body = json.dumps({"post": {"current": {k: v for k, v in current.items() if k != field}}}).encode()
+        with pytest.raises(TypeError):
+            LeanPostUpdate.from_json(body)
+    with pytest.raises(TypeError):
+        LeanPostUpdate.from_json(json.dumps({"post": {"current": {**current, "authors": "todd"}}}).encode())
+
+
+def test_lean_post_rejects_unknown_fields():
+    """Raise on misspelled fields rather than reading them as missing."""
+    current = PostUpdate.model_config["json_schema_extra"]["current"]
+    lean = LeanPostUpdate.from_json(json.dumps({"post": {"current": current}}).encode())
+    assert lean.post.current.canonical_url is None
+    with pytest.raises(AttributeError):
+        lean.post.current.feature_img
+
+
+def test_post_webhooks_document_request_body():
+    """Document the post payload of routes which parse it from the raw request."""
+    api = FastAPI()
+    for module in (authors, images, posts):
+        api.include_router(module.router)
+    paths = api.openapi()["paths"]
+    for path in ("/authors/post/created/", "/authors/post/updated/", "/images/", "/posts/"):
+        schema = paths[path]["post"]["requestBody"]["content"]["application/json"]["schema"]
+        current = schema["properties"]["post"]["properties"]["current"]
+        assert "name" in current["properties"]["primary_author"]["allOf"][0]["properties"]
@@ -0,0 +1,26 @@
+"""Test connection pool checkout metrics."""
+
+import sqlite3
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from database.engines import TimedQueuePool
+
+
+def test_pool_counts_only_checkout_timeouts():
+    """Count checkouts which gave up waiting on an exhausted pool, but not failures to connect."""
+    pool = TimedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0, timeout=0.01)
+    held = pool.connect()
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+    held.close()
+    assert pool.metrics.to_dict()["timeouts"] == 1
+
+    def refuse_connection():
+        raise sqlite3.OperationalError("Access denied")
+
+    failing = TimedQueuePool(refuse_connection, pool_size=1, max_overflow=0)
+    with pytest.raises(sqlite3.OperationalError):
+        failing.connect()
+    assert failing.metrics.to_dict()["timeouts"] == 0
@@ -0,0 +1,53 @@
+"""Test read-through caching of endpoint results."""
+
+import asyncio
+
+from app.cache import LocalCacheBackend, ResultCache
+
+
+def test_result_cache_invalidates_namespace():
+    """Serve repeated reads from cache until the namespace is invalidated."""
+    cache = ResultCache(backend=LocalCacheBackend(max_size=16, ttl=60), ttl=60)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return {"donations": len(calls)}
+
+    async def scenario():
+        first = await cache.get_or_set("donations", {"limit": 10}, loader)
+        second = await cache.get_or_set("donations", {"limit": 10}, loader)
+        await cache.get_or_set("donations", {"limit": 20}, loader)
+        await cache.invalidate("donations")
+        third = await cache.get_or_set("donations", {"limit": 10}, loader)
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+    assert first == second == {"donations": 1}
+    assert third == {"donations": 3}
+    assert cache.stats()["donations"] == {"hits": 1, "misses": 3, "hit_rate": 0.25}
+
+
+def test_result_cache_reads_generation_with_result():
+    """Read a namespace's generation & the cached result in a single backend round trip."""
+    backend = LocalCacheBackend(max_size=16, ttl=60)
+    reads = []
+    get_many = backend.get_many
+
+    async def counting_get_many(keys):
+        reads.append(keys)
+        return await get_many(keys)
+
+    backend.get_many = counting_get_many
+    cache = ResultCache(backend=backend, ttl=60)
+
+    async def loader():
+        return {"views": 1}
+
+    async def scenario():
+        await cache.get_or_set("analytics", {}, loader)
+        return await cache.get_or_set("analytics", {}, loader)
+
+    assert asyncio.run(scenario()) == {"views": 1}
+    assert len(reads) == 2
+    assert cache.stats()["analytics"]["hits"] == 1
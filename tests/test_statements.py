@@ -0,0 +1,68 @@
+"""Test parsing of maintenance `UPDATE` statements."""
+
+from glob import glob
+
+from config import settings
+from database.statements import (
+    chunk_boundary_sql,
+    chunk_update_sql,
+    parse_update,
+    summarize_plan,
+)
+
+
+def test_parse_maintenance_updates():
+    """Derive a `SELECT COUNT(*)` preview for every bundled maintenance `UPDATE`."""
+    files = glob(f"{settings.BASE_DIR}/database/queries/**/*.sql", recursive=True)
+    for sql_file in files:
+        with open(sql_file, "r", encoding="utf-8") as f:
+            sql = f.read()
+        statement = parse_update(sql)
+        if sql.lstrip().upper().startswith("UPDATE"):
+            assert statement is not None, sql_file
+            assert statement.count_sql().startswith(f"SELECT COUNT(*) FROM {statement.tables}")
+            assert statement.where, sql_file
+        else:
+            assert statement is None, sql_file
+
+
+def test_parse_update_ignores_keywords_in_literals():
+    """Only split clauses on keywords outside of strings & parentheses."""
+    statement = parse_update(
+        "UPDATE posts, posts_meta SET title = REPLACE(title, ' WHERE ', 'set') "
+        "WHERE posts.id = posts_meta.post_id AND title LIKE '%% WHERE %%';"
+    )
+    assert statement.tables == "posts, posts_meta"
+    assert statement.assignments == "title = REPLACE(title, ' WHERE ', 'set')"
+    assert statement.count_sql() == (
+        "SELECT COUNT(*) FROM posts, posts_meta WHERE posts.id = posts_meta.post_id AND title LIKE '%% WHERE %%'"
+    )
+
+
+def test_summarize_plan():
+    """Extract estimated cost & rows examined from `EXPLAIN FORMAT=JSON` output."""
+    summary = summarize_plan(
+        '{"query_block": {"select_id": 1, "cost_info": {"query_cost": "12.50"}, '
+        '"table": {"update": true, "table_name": "posts", "access_type": "ALL", "rows_examined_per_scan": 120}}}'
+    )
+    assert summary["estimated_cost"] == 12.5
+    assert summary["estimated_rows_examined"] == 120
+    assert summary["access"] == ["posts:ALL"]
+
+
+def test_chunk_single_table_updates():
+    """Split single-table `UPDATE` statements into primary key ranges, leaving joined updates whole."""
+    statement = parse_update("UPDATE posts SET feature_image = NULL WHERE feature_image LIKE 'http:%%';")
+    assert statement.table == "posts"
+    assert parse_update("UPDATE posts, posts_meta SET title = og_title WHERE posts.id = post_id").table is None
+    assert parse_update("UPDATE posts p JOIN users u ON p.author = u.id SET p.title = u.name").table is None
+    assert chunk_boundary_sql(statement, "id", False) == "SELECT `id` FROM posts ORDER BY `id` LIMIT 1 OFFSET :offset"
+    assert chunk_boundary_sql(statement, "id", True) == (
+        "SELECT `id` FROM posts WHERE `id` > :lower ORDER BY `id` LIMIT 1 OFFSET :offset"
+    )
+    assert chunk_update_sql(statement, "id", True, True) == (
+        "UPDATE posts SET feature_image = NULL WHERE (feature_image LIKE 'http:%%') AND `id` > :lower AND `id` <= :upper"
+    )
+    assert chunk_update_sql(statement, "id", False, False) == (
+        "UPDATE posts SET feature_image = NULL WHERE (feature_image LIKE 'http:%%')"
+    )